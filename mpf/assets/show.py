@@ -392,6 +392,11 @@ class Show(Asset):
                                                        __version__,
                                                        __show_version__))
 
+        # MPF only
+        config_cache = getattr(self.machine, "config_cache", None)
+        if config_cache:
+            return config_cache.load_file(self.file)
+
         return FileManager.load(self.file)
 
 
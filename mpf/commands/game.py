@@ -109,6 +109,14 @@ class Command(object):
                             help="Forces the virtual platform to be "
                                  "used for all devices")
 
+        parser.add_argument("--profile-startup",
+                            action="store", dest="profile_startup", nargs="?",
+                            const=os.path.join("logs", "startup_profile.json"),
+                            default=None, metavar='file_name',
+                            help="Time each phase of the MPF startup and write "
+                                 "the result as JSON to this file. Default is "
+                                 "logs/startup_profile.json")
+
         parser.add_argument("--syslog_address",
                             action="store", dest="syslog_address",
                             help="Log to the specified syslog address. This "
@@ -3,8 +3,14 @@ import abc
 
 import asyncio
 
+from typing import Set
+
 from mpf.core.mpf_controller import MpfController
 
+# optional protocol features which are negotiated in hello
+# device messages carry a list of all changes instead of one message per change
+DEVICE_CHANGES_LIST = "device_changes_list"
+
 
 class BaseBcpClient(MpfController, metaclass=abc.ABCMeta):
 
@@ -16,6 +22,7 @@ class BaseBcpClient(MpfController, metaclass=abc.ABCMeta):
         self.name = name
         self.bcp = bcp
         self.exit_on_close = False
+        self.features = set()   # type: Set[str]
 
     @asyncio.coroutine
     def connect(self, config):
@@ -35,6 +42,20 @@ class BaseBcpClient(MpfController, metaclass=abc.ABCMeta):
         """Send data to client."""
         raise NotImplementedError("implement")
 
+    def send_cached(self, bcp_command, kwargs, encoded_cache):
+        """Send data to client and reuse encoded data from other clients.
+
+        encoded_cache is shared by all clients which receive the same command.
+        Clients which encode their messages can store the result in it.
+        """
+        del encoded_cache
+        self.send(bcp_command, kwargs)
+
     def stop(self):
         """Stop client connection."""
         raise NotImplementedError("implement")
+
+    @property
+    def queue_depth(self):
+        """Return the number of messages waiting to be sent."""
+        return 0
@@ -1,6 +1,10 @@
 """RPC Interface for BCP clients."""
+import fnmatch
+import re
+from collections import OrderedDict
 from copy import deepcopy
 
+from mpf.core.bcp.bcp_client import DEVICE_CHANGES_LIST
 from mpf.core.events import PostedEvent
 from mpf.core.player import Player
 from mpf.core.utility_functions import Util
@@ -8,6 +12,38 @@ from mpf.core.mpf_controller import MpfController
 from mpf.core.switch_controller import MonitoredSwitchChange
 
 
+class EventMonitorFilter(object):
+
+    """Decides which posted events are sent to a client which monitors events.
+
+    Args:
+        include: Glob patterns of events to send. All events if empty.
+        exclude: Glob patterns of events to skip.
+        handlers: Send registered handlers of the event.
+    """
+
+    def __init__(self, include=None, exclude=None, handlers=True):
+        """Compile patterns."""
+        self.include = self._compile(include)
+        self.exclude = self._compile(exclude)
+        self.handlers = handlers
+
+    @staticmethod
+    def _compile(patterns):
+        patterns = Util.string_to_lowercase_list(patterns)
+        if not patterns:
+            return None
+
+        return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+    def match(self, event):
+        """Return true if the event should be sent."""
+        if self.include and not self.include.match(event):
+            return False
+
+        return not (self.exclude and self.exclude.match(event))
+
+
 class BcpInterface(MpfController):
 
     """Implements the BCP interface which can be used by all clients.
@@ -46,6 +82,12 @@ class BcpInterface(MpfController):
         self._client_reset_queue = None
         self._client_reset_complete_status = {}
 
+        self._event_monitor_filters = {}
+
+        # device changes are collected and sent once per loop iteration
+        self._device_changes = OrderedDict()
+        self._device_changes_scheduled = False
+
         self.bcp_receive_commands = dict(
             reset_complete=self._bcp_receive_reset_complete,
             error=self._bcp_receive_error,
@@ -80,6 +122,11 @@ class BcpInterface(MpfController):
         # register transport
         self.machine.bcp.transport.add_handler_to_transport(event, client)
 
+    def remove_client(self, client):
+        """Remove monitors of a disconnected client."""
+        if client in self._event_monitor_filters:
+            self._monitor_events_stop(client)
+
     def remove_registered_trigger_event_for_client(self, client, event):
         """Remove trigger for event."""
         # unregister transport
@@ -94,12 +141,16 @@ class BcpInterface(MpfController):
         del client
         self.machine.set_machine_var(name, value)
 
-    def _bcp_receive_monitor_start(self, client, category):
-        """Start monitoring the specified category."""
+    def _bcp_receive_monitor_start(self, client, category, **kwargs):
+        """Start monitoring the specified category.
+
+        The events category takes optional include and exclude glob patterns
+        and a handlers flag.
+        """
         category = str.lower(category)
 
         if category == "events":
-            self._monitor_events(client)
+            self._monitor_events(client, **kwargs)
         elif category == "devices":
             self._monitor_devices(client)
         elif category == "drivers":
@@ -154,30 +205,76 @@ class BcpInterface(MpfController):
         """Monitor all drivers."""
         self.machine.bcp.transport.remove_transport_from_handle("_monitor_drivers", client)
 
-    def _monitor_events(self, client):
-        """Monitor all events."""
+    def _monitor_events(self, client, include=None, exclude=None, handlers=True, **kwargs):
+        """Monitor all events or the events matching include and exclude."""
+        del kwargs
+        if not isinstance(handlers, bool):
+            handlers = str(handlers).lower() not in ("false", "0", "no")
+
+        self._event_monitor_filters[client] = EventMonitorFilter(include, exclude, handlers)
         self.machine.bcp.transport.add_handler_to_transport("_monitor_events", client)
-        self.machine.events.monitor_events = True
+        # resets cached decisions of the event manager
+        self.machine.events.set_event_monitor(self._is_event_monitored)
 
     def _monitor_events_stop(self, client):
         """Stop monitoring all events for the specified client."""
         self.machine.bcp.transport.remove_transport_from_handle("_monitor_events", client)
+        self._event_monitor_filters.pop(client, None)
 
         if not self.machine.bcp.transport.get_transports_for_handler("_monitor_events"):
-            self.machine.events.monitor_events = False
+            self.machine.events.set_event_monitor(None)
+        else:
+            self.machine.events.set_event_monitor(self._is_event_monitored)
+
+    def _is_event_monitored(self, event):
+        """Return true if any client monitors an event."""
+        for client in self.machine.bcp.transport.get_transports_for_handler("_monitor_events"):
+            event_filter = self._event_monitor_filters.get(client)
+            if not event_filter or event_filter.match(event):
+                return True
+
+        return False
 
     def monitor_posted_event(self, posted_event: PostedEvent):
         """Send monitored posted event to bcp clients."""
-        self.machine.bcp.transport.send_to_clients_with_handler(
-            handler="_monitor_events",
-            bcp_command="monitored_event",
-            event_name=posted_event.event,
-            event_type=posted_event.type,
-            event_callback=posted_event.callback,
-            event_kwargs=Util.convert_to_simply_type(posted_event.kwargs),
-            registered_handlers=Util.convert_to_simply_type(
-                self.machine.events.registered_handlers.get(posted_event.event, []))
-        )
+        with_handlers = []
+        without_handlers = []
+        for client in self.machine.bcp.transport.get_transports_for_handler("_monitor_events"):
+            event_filter = self._event_monitor_filters.get(client)
+            if not event_filter:
+                with_handlers.append(client)
+            elif event_filter.match(posted_event.event):
+                if event_filter.handlers:
+                    with_handlers.append(client)
+                else:
+                    without_handlers.append(client)
+
+        if not with_handlers and not without_handlers:
+            return
+
+        event_kwargs = Util.convert_to_simply_type(posted_event.kwargs)
+
+        if with_handlers:
+            self.machine.bcp.transport.send_to_clients(
+                with_handlers,
+                bcp_command="monitored_event",
+                event_name=posted_event.event,
+                event_type=posted_event.type,
+                event_callback=posted_event.callback,
+                event_kwargs=event_kwargs,
+                registered_handlers=Util.convert_to_simply_type(
+                    self.machine.events.registered_handlers.get(posted_event.event, []))
+            )
+
+        if without_handlers:
+            self.machine.bcp.transport.send_to_clients(
+                without_handlers,
+                bcp_command="monitored_event",
+                event_name=posted_event.event,
+                event_type=posted_event.type,
+                event_callback=posted_event.callback,
+                event_kwargs=event_kwargs
+            )
 
     def _monitor_devices(self, client):
         """Register client to get notified of device changes."""
@@ -201,17 +298,63 @@ class BcpInterface(MpfController):
         self.machine.bcp.transport.remove_transport_from_handle("_devices", client)
 
     def notify_device_changes(self, device, attribute_name, old_value, new_value):
-        """Notify all listeners about device change."""
+        """Notify all listeners about device change.
+
+        Changes are collected per device and sent at the end of the current
+        loop iteration.
+        """
         if not self.configured:
             return
 
-        self.machine.bcp.transport.send_to_clients_with_handler(
-            handler="_devices",
-            bcp_command='device',
-            type=device.class_label,
-            name=device.name,
-            changes=(attribute_name, Util.convert_to_simply_type(old_value), Util.convert_to_simply_type(new_value)),
-            state=device.get_monitorable_state())
+        # only collect changes when somebody listens
+        if not self.machine.bcp.transport.get_transports_for_handler("_devices"):
+            return
+
+        changes = self._device_changes.get(device)
+        if changes is None:
+            changes = OrderedDict()
+            self._device_changes[device] = changes
+
+        if attribute_name in changes:
+            changes[attribute_name][1] = new_value
+        else:
+            changes[attribute_name] = [old_value, new_value]
+
+        if not self._device_changes_scheduled:
+            self._device_changes_scheduled = True
+            self.machine.clock.loop.call_soon(self._send_device_changes)
+
+    def _send_device_changes(self):
+        """Send changed devices to clients.
+
+        Clients which negotiated device_changes_list get one message per device
+        and changes contains a list of (attribute, old, new). Other clients get
+        one message per changed attribute with a single (attribute, old, new).
+        """
+        self._device_changes_scheduled = False
+        device_changes = self._device_changes
+        self._device_changes = OrderedDict()
+
+        transport = self.machine.bcp.transport
+        clients = transport.get_transports_for_handler("_devices")
+        list_clients = [client for client in clients if DEVICE_CHANGES_LIST in client.features]
+        legacy_clients = [client for client in clients if DEVICE_CHANGES_LIST not in client.features]
+
+        for device, changes in device_changes.items():
+            diff = [(attribute, Util.convert_to_simply_type(old_value), Util.convert_to_simply_type(new_value))
+                    for attribute, (old_value, new_value) in changes.items() if old_value != new_value]
+            if not diff:
+                # changed back within the same loop iteration
+                continue
+
+            state = device.get_monitorable_state()
+            if list_clients:
+                transport.send_to_clients(list_clients, 'device', type=device.class_label, name=device.name,
+                                          changes=diff, state=state)
+            if legacy_clients:
+                for change in diff:
+                    transport.send_to_clients(legacy_clients, 'device', type=device.class_label, name=device.name,
+                                              changes=change, state=state)
 
     def _monitor_switches(self, client):
         """Register client to get notified of switch changes."""
@@ -405,14 +548,9 @@ class BcpInterface(MpfController):
             else:
                 self.debug_log("Processing command: %s %s", cmd, kwargs)
 
-        if cmd in self.bcp_receive_commands:
-            try:
-                callback = self.bcp_receive_commands[cmd]
-            except TypeError as e:
-                self.machine.bcp.transport.send_to_client(client, "error", cmd=cmd, error=str(e), kwargs=kwargs)
-            else:
-                callback(client=client, **kwargs)
-
+        callback = self.bcp_receive_commands.get(cmd)
+        if callback:
+            callback(client=client, **kwargs)
         else:
             self.warning_log("Received invalid BCP command: %s from client: %s", cmd, client.name)
 
@@ -1,11 +1,12 @@
 """BCP socket client."""
 import json
+from collections import deque
 from urllib.parse import urlsplit, parse_qs, quote, unquote, urlunparse
 
 import asyncio
 
 from mpf._version import __version__, __bcp_version__
-from mpf.core.bcp.bcp_client import BaseBcpClient
+from mpf.core.bcp.bcp_client import BaseBcpClient, DEVICE_CHANGES_LIST
 
 
 class MpfJSONEncoder(json.JSONEncoder):
@@ -18,6 +19,70 @@ class MpfJSONEncoder(json.JSONEncoder):
         return str(o)
 
 
+# name of the JSON lines codec announced in hello
+JSON_CODEC = "json"
+
+# optional features announced in hello. used if the other side announces them too
+SUPPORTED_FEATURES = {DEVICE_CHANGES_LIST}
+
+_json_encoder = MpfJSONEncoder(separators=(',', ':'), check_circular=False)
+_json_decoder = json.JSONDecoder()
+
+
+# default limits of the outgoing queue. can be changed in the bcp section
+DEFAULT_SEND_HIGH_WATERMARK = 65536
+DEFAULT_SEND_LOW_WATERMARK = 16384
+DEFAULT_SEND_MAX_MESSAGES = 1000
+
+# commands which only carry the latest state of something. while queued an
+# older message is replaced by a newer one with the same key
+COALESCED_COMMANDS = {
+    'device': lambda kwargs: (kwargs.get('type'), kwargs.get('name')),
+    'switch': lambda kwargs: kwargs.get('name'),
+    'player_variable': lambda kwargs: (kwargs.get('player_num'), kwargs.get('name')),
+    'machine_variable': lambda kwargs: kwargs.get('name'),
+}
+
+# monitoring commands which may be dropped when the queue is full. all other
+# commands (e.g. trigger or mode_start) are never dropped
+DROPPABLE_COMMANDS = {'monitored_event'}
+
+
+def decode_command_json(bcp_string):
+    """Decode a BCP command encoded as JSON line.
+
+    Args:
+        bcp_string: A JSON array with the command and a dictionary of kwargs.
+
+    Returns:
+        A tuple of the command string and a dictionary of kwarg pairs.
+
+    Example:
+        Input: ["trigger",{"name":"hello","foo":"Foo Bar"}]
+        Output: ('trigger', {'name': 'hello', 'foo': 'Foo Bar'})
+
+    """
+    bcp_command, kwargs = _json_decoder.decode(bcp_string)
+    return bcp_command.lower(), kwargs
+
+
+def encode_command_json(bcp_command, **kwargs):
+    """Encode a BCP command and kwargs into a JSON line.
+
+    Types are preserved by JSON. Values which cannot be represented in JSON
+    are sent as string (like in encode_command_string).
+
+    Returns:
+        A string without the trailing newline.
+
+    Example:
+        Input: encode_command_json('trigger', {'name': 'hello', 'foo': 'Bar'})
+        Output: ["trigger",{"name":"hello","foo":"Bar"}]
+
+    """
+    return _json_encoder.encode((bcp_command.lower(), kwargs))
+
+
 def decode_command_string(bcp_string):
     """Decode a BCP command string into separate command and paramter parts.
 
@@ -143,6 +208,19 @@ class BCPClientSocket(BaseBcpClient):
         self._receiver = None
         self._send_goodbye = True
         self._receive_buffer = b''
+        # use the JSON lines codec after the other side announced it in hello
+        self._encode = encode_command_string
+
+        bcp_config = self.machine.config.get('bcp') or {}
+        self._high_watermark = bcp_config.get('send_high_watermark', DEFAULT_SEND_HIGH_WATERMARK)
+        self._low_watermark = bcp_config.get('send_low_watermark', DEFAULT_SEND_LOW_WATERMARK)
+        self._max_messages = bcp_config.get('send_max_messages', DEFAULT_SEND_MAX_MESSAGES)
+        # messages which wait for the transport buffer to drain
+        self._send_queue = deque()
+        self._coalesce_index = {}
+        self._flush_task = None
+        self.coalesced_messages = 0
+        self.dropped_messages = 0
 
         self._bcp_client_socket_commands = {'hello': self._receive_hello,
                                             'goodbye': self._receive_goodbye}
@@ -181,6 +259,7 @@ class BCPClientSocket(BaseBcpClient):
 
         self.info_log("Connected BCP to '%s' %s:%s", self.name, client_host, client_port)
 
+        self._set_write_buffer_limits()
         self.send_hello()
         return True
 
@@ -189,6 +268,7 @@ class BCPClientSocket(BaseBcpClient):
         self._receiver = receiver
         self._sender = sender
 
+        self._set_write_buffer_limits()
         self.send_hello()
 
     def stop(self):
@@ -198,8 +278,111 @@ class BCPClientSocket(BaseBcpClient):
         if self._send_goodbye:
             self.send_goodbye()
 
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        # hand everything to the transport. it will be sent before closing
+        while self._send_queue:
+            self._sender.write(self._pop_queue())
+
         self._sender.close()
 
+    def _set_write_buffer_limits(self):
+        """Pause writing when the transport buffer reaches the high watermark."""
+        self._sender.transport.set_write_buffer_limits(high=self._high_watermark, low=self._low_watermark)
+
+    @property
+    def queue_depth(self):
+        """Return the number of messages waiting to be sent."""
+        return len(self._send_queue)
+
+    def _write(self, bcp_command, kwargs, data):
+        """Write data or queue it if the other side does not keep up."""
+        if not self._send_queue and self._sender.transport.get_write_buffer_size() <= self._high_watermark:
+            self._sender.write(data)
+            return
+
+        key_func = COALESCED_COMMANDS.get(bcp_command)
+        if key_func:
+            key = (bcp_command, key_func(kwargs))
+            entry = self._coalesce_index.get(key)
+            if entry:
+                # drop the outdated state. the new state is queued after all
+                # messages which were queued before it
+                self._send_queue.remove(entry)
+                self.coalesced_messages += 1
+        else:
+            key = None
+
+        entry = [bcp_command, key, data]
+        self._send_queue.append(entry)
+        if key:
+            self._coalesce_index[key] = entry
+
+        if len(self._send_queue) > self._max_messages:
+            self._drop_messages()
+
+        if not self._flush_task:
+            self._flush_task = self.machine.clock.loop.create_task(self._flush_queue())
+            self._flush_task.add_done_callback(self._flush_done)
+
+    def _pop_queue(self):
+        """Remove the oldest message from the queue and return its data."""
+        _, key, data = self._send_queue.popleft()
+        if key:
+            del self._coalesce_index[key]
+        return data
+
+    def _drop_messages(self):
+        """Drop the oldest droppable messages until the queue is small enough."""
+        excess = len(self._send_queue) - self._max_messages
+        kept = deque()
+        for entry in self._send_queue:
+            if excess > 0 and entry[0] in DROPPABLE_COMMANDS:
+                excess -= 1
+                self.dropped_messages += 1
+            else:
+                kept.append(entry)
+
+        self._send_queue = kept
+        self.debug_log("Send queue full. Dropped %s messages so far", self.dropped_messages)
+
+    @asyncio.coroutine
+    def _flush_queue(self):
+        """Write queued messages whenever the transport buffer drained."""
+        try:
+            while self._send_queue:
+                # waits until the buffer is below the low watermark
+                yield from self._sender.drain()
+                while self._send_queue and self._sender.transport.get_write_buffer_size() <= self._high_watermark:
+                    self._sender.write(self._pop_queue())
+        finally:
+            self._flush_task = None
+
+    @staticmethod
+    def _flush_done(future):
+        """Evaluate result of the flush task."""
+        try:
+            future.result()
+        except (asyncio.CancelledError, IOError):
+            # the receive loop will notice the broken connection
+            pass
+
+    def _encode_message(self, bcp_command, bcp_command_args):
+        """Encode a command to bytes which can be written to the socket."""
+        try:
+            bcp_string = self._encode(bcp_command, **bcp_command_args)
+        # pylint: disable-msg=broad-except
+        except Exception as e:
+            self.warning_log("Failed to encode bcp_command %s with args %s. %s", bcp_command, bcp_command_args, e)
+            return None
+
+        if self.debug_log:
+            self.debug_log('Sending "%s"', bcp_string)
+
+        return (bcp_string + '\n').encode()
+
     def send(self, bcp_command, bcp_command_args):
         """Send a message to the BCP host.
 
@@ -207,16 +390,20 @@ class BCPClientSocket(BaseBcpClient):
             bcp_command: command to send
             bcp_command_args: parameters to command
         """
+        data = self._encode_message(bcp_command, bcp_command_args)
+        if data:
+            self._write(bcp_command, bcp_command_args, data)
+
+    def send_cached(self, bcp_command, kwargs, encoded_cache):
+        """Send a message and share the encoded bytes with clients using the same codec."""
         try:
-            bcp_string = encode_command_string(bcp_command, **bcp_command_args)
-        # pylint: disable-msg=broad-except
-        except Exception as e:
-            self.warning_log("Failed to encode bcp_command %s with args %s. %s", bcp_command, bcp_command_args, e)
-            return
+            data = encoded_cache[self._encode]
+        except KeyError:
+            data = self._encode_message(bcp_command, kwargs)
+            encoded_cache[self._encode] = data
 
-        if self.debug_log:
-            self.debug_log('Sending "%s"', bcp_string)
-        self._sender.write((bcp_string + '\n').encode())
+        if data:
+            self._write(bcp_command, kwargs, data)
 
     @asyncio.coroutine
     def read_message(self):
@@ -231,30 +418,36 @@ class BCPClientSocket(BaseBcpClient):
             # strip newline
             message = message[0:-1]
 
-            if b'&bytes=' in message:
-                message, bytes_needed = message.split(b'&bytes=')
-                bytes_needed = int(bytes_needed)
+            if self.debug_log:
+                self.debug_log('Received "%s"', message)
 
-                rawbytes = yield from self._receiver.readexactly(bytes_needed)
+            if message[:1] == b'[':
+                # JSON lines codec. raw bytes follow the line
+                try:
+                    cmd, kwargs = decode_command_json(message.decode())
+                    bytes_needed = kwargs.pop('bytes', None)
+                except (ValueError, TypeError, AttributeError):
+                    self.warning_log('Skipping malformed message "%s"', message)
+                    continue
+            elif b'&bytes=' in message:
+                message, bytes_needed = message.split(b'&bytes=')
+                cmd, kwargs = decode_command_string(message.decode())
+            else:  # no bytes in the message
+                cmd, kwargs = decode_command_string(message.decode())
+                bytes_needed = None
 
-                message_obj = self._process_command(message, rawbytes)
+            if bytes_needed:
+                kwargs['rawbytes'] = yield from self._receiver.readexactly(int(bytes_needed))
 
-            else:  # no bytes in the message
-                message_obj = self._process_command(message)
+            message_obj = self._process_command(cmd, kwargs)
 
             if message_obj:
                 return message_obj
 
-    def _process_command(self, message, rawbytes=None):
-        if self.debug_log:
-            self.debug_log('Received "%s"', message)
-
-        cmd, kwargs = decode_command_string(message.decode())
-        if rawbytes:
-            kwargs['rawbytes'] = rawbytes
-
-        if cmd in self._bcp_client_socket_commands:
-            self._bcp_client_socket_commands[cmd](**kwargs)
+    def _process_command(self, cmd, kwargs):
+        handler = self._bcp_client_socket_commands.get(cmd)
+        if handler:
+            handler(**kwargs)
         else:
             return cmd, kwargs
 
@@ -262,6 +455,13 @@ class BCPClientSocket(BaseBcpClient):
         """Process incoming BCP 'hello' command."""
         self.debug_log('Received BCP Hello from host with kwargs: %s', kwargs)
 
+        codecs = str(kwargs.get('codecs', '')).split(',')
+        if JSON_CODEC in codecs and self._encode is not encode_command_json:
+            self.debug_log('Switching to JSON lines codec')
+            self._encode = encode_command_json
+
+        self.features = set(str(kwargs.get('features', '')).split(',')) & SUPPORTED_FEATURES
+
     def _receive_goodbye(self):
         """Process incoming BCP 'goodbye' command."""
         self._send_goodbye = False
@@ -271,7 +471,9 @@ class BCPClientSocket(BaseBcpClient):
         """Send BCP 'hello' command."""
         self.send('hello', {"version": __bcp_version__,
                             "controller_name": 'Mission Pinball Framework',
-                            "controller_version": __version__})
+                            "controller_version": __version__,
+                            "codecs": JSON_CODEC,
+                            "features": ",".join(sorted(SUPPORTED_FEATURES))})
 
     def send_goodbye(self):
         """Send BCP 'goodbye' command."""
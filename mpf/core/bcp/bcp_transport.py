@@ -77,6 +77,8 @@ class BcpTransportManager:
             if transport in self._handlers[handler]:
                 self._handlers[handler].remove(transport)
 
+        self._machine.bcp.interface.remove_client(transport)
+
         if transport in self._readers:
             self._readers[transport].cancel()
             del self._readers[transport]
@@ -88,6 +90,10 @@ class BcpTransportManager:
         """Get a list of all clients."""
         return self._transports
 
+    def get_queue_depths(self):
+        """Return the number of messages waiting to be sent for every client."""
+        return {client: client.queue_depth for client in self._transports}
+
     def get_named_client(self, client_name) -> Union[BaseBcpClient, bool]:
         """Get a client by name."""
         for client in self._transports:
@@ -96,9 +102,14 @@ class BcpTransportManager:
         return False
 
     def send_to_clients(self, clients, bcp_command, **kwargs):
-        """Send command to a list of clients."""
+        """Send command to a list of clients.
+
+        The command is encoded only once per codec and the same buffer is
+        written to all clients.
+        """
+        encoded_cache = {}
         for client in set(clients):
-            self.send_to_client(client, bcp_command, **kwargs)
+            self._send_cached(client, bcp_command, kwargs, encoded_cache)
 
     def send_to_clients_with_handler(self, handler, bcp_command, **kwargs):
         """Send command to clients which registered for a specific handler."""
@@ -113,10 +124,17 @@ class BcpTransportManager:
             client.stop()
             self.unregister_transport(client)
 
+    def _send_cached(self, client: BaseBcpClient, bcp_command, kwargs, encoded_cache):
+        """Send command to a client and share the encoded command with other clients."""
+        try:
+            client.send_cached(bcp_command, kwargs, encoded_cache)
+        except IOError:
+            client.stop()
+            self.unregister_transport(client)
+
     def send_to_all_clients(self, bcp_command, **kwargs):
         """Send command to all bcp clients."""
-        for client in self._transports:
-            self.send_to_client(client, bcp_command, **kwargs)
+        self.send_to_clients(self._transports, bcp_command, **kwargs)
 
     def shutdown(self, **kwargs):
         """Prepare the BCP clients for MPF shutdown."""
@@ -0,0 +1,172 @@
+"""Contains the ConfigCache which caches parsed config and show files."""
+import copy
+import hashlib
+import logging
+import os
+import pickle
+import threading
+
+from typing import Any, Dict, Tuple
+
+from mpf._version import __version__
+from mpf.core.file_manager import FileManager
+
+# increase this when the layout of the cache file changes
+CACHE_FORMAT = 1
+
+
+class ConfigCache(object):
+
+    """Caches parsed machine, mode and show files between runs.
+
+    Every file loaded through the cache is recorded in a manifest together
+    with its size, mtime and a hash of its content. A cached file is used when
+    size and mtime of the file on disk still match. If only the mtime changed
+    the file is hashed and the cached content is used when the hash matches.
+
+    Only the files in the manifest are checked. There is no need to walk the
+    config folders and files outside of them (e.g. in mode or show folders)
+    are covered as well.
+
+    This class is thread safe because shows are loaded by the asset loader
+    thread.
+    """
+
+    def __init__(self, filename: str, load: bool=True) -> None:
+        """Initialise config cache.
+
+        Args:
+            filename: Full path of the cache file.
+            load: Read existing entries from the cache file. If False the
+                cache starts empty.
+        """
+        self.filename = filename
+        self.log = logging.getLogger("ConfigCache")
+        self.hits = 0
+        self.misses = 0
+        self._entries = dict()      # type: Dict[str, Dict[str, Any]]
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if load:
+            self._read()
+
+    @staticmethod
+    def _hash_file(filename: str) -> str:
+        """Return hash of the content of a file."""
+        with open(filename, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    @property
+    def manifest(self) -> Dict[str, Tuple[int, int, str]]:
+        """Return (size, mtime, hash) for all files in the cache."""
+        with self._lock:
+            return {entry["file"]: (entry["size"], entry["mtime"], entry["hash"])
+                    for entry in self._entries.values()}
+
+    def _read(self) -> None:
+        """Read entries from the cache file."""
+        try:
+            with open(self.filename, 'rb') as f:
+                data = pickle.load(f)
+
+        except FileNotFoundError:
+            return
+
+        # unfortunately pickle can raise all kinds of exceptions and we dont want to crash on corrupted cache
+        # pylint: disable-msg=broad-except
+        except Exception:   # pragma: no cover
+            self.log.warning("Could not load config cache %s", self.filename)
+            return
+
+        if not isinstance(data, dict) or data.get("_format") != CACHE_FORMAT:
+            self.log.info("Ignoring config cache in old format.")
+            return
+
+        if data.get("_mpf_version") != __version__:
+            self.log.info("Config cache is from a different version of MPF.")
+            return
+
+        self._entries = data["files"]
+        self.log.info("Loaded config cache %s with %s files", self.filename, len(self._entries))
+
+    def write(self) -> None:
+        """Write the cache file if entries changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            data = {"_format": CACHE_FORMAT,
+                    "_mpf_version": __version__,
+                    "files": self._entries}
+
+            # write to temp file and move afterwards. prevents broken caches
+            temp_file = self.filename + ".tmp"
+            with open(temp_file, 'wb') as f:
+                pickle.dump(data, f, protocol=4)
+            os.replace(temp_file, self.filename)
+            self._dirty = False
+
+        self.log.info('Config cache written: %s', self.filename)
+
+    def _is_valid(self, entry: Dict[str, Any]) -> bool:
+        """Return true if the file of an entry did not change."""
+        try:
+            stat = os.stat(entry["file"])
+        except OSError:
+            return False
+
+        if stat.st_size != entry["size"]:
+            return False
+
+        if stat.st_mtime_ns == entry["mtime"]:
+            return True
+
+        # the file has been touched. check if the content changed
+        try:
+            if self._hash_file(entry["file"]) != entry["hash"]:
+                return False
+        except OSError:
+            return False
+
+        entry["mtime"] = stat.st_mtime_ns
+        self._dirty = True
+        return True
+
+    def load_file(self, filename: str, verify_version: bool=False, halt_on_error: bool=True) -> Any:
+        """Load a file from the cache or from disk.
+
+        Takes the same arguments as FileManager.load(). The returned data may
+        be modified by the caller.
+        """
+        key = os.path.abspath(filename)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and (entry["verified"] or not verify_version) and self._is_valid(entry):
+                self.hits += 1
+                return copy.deepcopy(entry["data"])
+            self.misses += 1
+
+        try:
+            file = os.path.abspath(FileManager.locate_file(filename))
+            # stat before loading. if the file changes while we load it the
+            # entry will be invalid on the next run
+            stat = os.stat(file)
+            file_hash = self._hash_file(file)
+        except OSError:
+            # let the file manager handle (and report) missing files
+            return FileManager.load(filename, verify_version, halt_on_error)
+
+        data = FileManager.load(file, verify_version, halt_on_error)
+
+        if data:
+            with self._lock:
+                self._entries[key] = {"file": file,
+                                      "size": stat.st_size,
+                                      "mtime": stat.st_mtime_ns,
+                                      "hash": file_hash,
+                                      "verified": verify_version,
+                                      "data": copy.deepcopy(data)}
+                self._dirty = True
+
+        return data
@@ -88,6 +88,7 @@ auditor:
     events: list|str|None
     player: list|str|None
     num_player_top_records: single|int|1
+    flush_interval: single|secs|1s
 autofire_coils:
     __valid_in__: machine
     coil: single|machine(coils)|
@@ -181,6 +182,9 @@ ball_saves:
 bcp:
     __valid_in__: machine
     debug: False
+    send_high_watermark: single|int|65536
+    send_low_watermark: single|int|16384
+    send_max_messages: single|int|1000
     connections:
         host: single|str|None
         port: single|int|5050
@@ -472,6 +476,9 @@ fast:
     net_buffer: single|int|10
     rgb_buffer: single|int|3
     dmd_buffer: single|int|3
+    serial_read_size: single|int|4096
+    serial_capture: single|str|None
+    cache_inventory: single|bool|True
     console_log: single|enum(none,basic,full)|none
     file_log: single|enum(none,basic,full)|basic
 file_shows:
@@ -620,11 +627,14 @@ lisy:
     port: single|str|None
     baud: single|int|None
     poll_hz: single|int|1000
+    max_poll_latency: single|ms|10ms
     console_log: single|enum(none,basic,full)|none
     file_log: single|enum(none,basic,full)|basic
     connection: single|enum(network,serial)|network
     network_port: single|int|None
     network_host: single|str|None
+    serial_read_size: single|int|4096
+    serial_capture: single|str|None
 logic_blocks_common:
     enable_events: dict|str:ms|None
     disable_events: dict|str:ms|None
@@ -718,6 +728,9 @@ mpf:
     save_machine_vars_to_disk: single|bool|true
     default_show_sync_ms: single|int|0
     default_platform_hz: single|float|1000
+    coalesce_outputs: single|bool|False
+    lazy_load_modules: single|bool|true
+    data_write_window: single|secs|1s
 mpf-mc:
     __valid_in__: machine                           # todo add to validator
 multiballs:
@@ -759,6 +772,10 @@ opp:
     console_log: single|enum(none,basic,full)|none
     file_log: single|enum(none,basic,full)|basic
     poll_hz: single|int|100
+    min_poll_hz: single|int|100
+    serial_read_size: single|int|4096
+    serial_capture: single|str|None
+    cache_inventory: single|bool|True
 open_pixel_control:
     __valid_in__: machine
     connection_required: single|bool|False
@@ -773,6 +790,7 @@ p_roc:
     lamp_matrix_strobe_time: single|ms|100ms
     watchdog_time: single|ms|1s
     use_watchdog: single|bool|True
+    use_io_thread: single|bool|False
     dmd_timing_cycles: list|int|None
     dmd_update_interval: single|ms|33ms
     debug: single|bool|False
@@ -783,6 +801,7 @@ p3_roc:
     lamp_matrix_strobe_time: single|ms|100ms
     watchdog_time: single|ms|1s
     use_watchdog: single|bool|True
+    use_io_thread: single|bool|False
     debug: single|bool|False
     console_log: single|enum(none,basic,full)|none
     file_log: single|enum(none,basic,full)|basic
@@ -1122,6 +1141,8 @@ spike:
     console_log: single|enum(none,basic,full)|none
     file_log: single|enum(none,basic,full)|basic
     wait_times: dict|int:int|None
+    serial_read_size: single|int|4096
+    serial_capture: single|str|None
 steppers:
     __valid_in__: machine
     mode: single|enum(position,velocity)|position
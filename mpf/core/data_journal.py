@@ -0,0 +1,193 @@
+"""Contains the DataJournal which stores key value data in a snapshot and an append-only log."""
+import copy
+import logging
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+from typing import Any, Dict, List, Tuple
+
+from mpf.core.file_manager import FileManager
+
+# length and crc32 of a record in the log
+RECORD_HEADER = struct.Struct(">II")
+
+
+class DataJournal(object):
+
+    """Stores the data of a DataManager in a snapshot and an append-only log.
+
+    Every change is appended as a small record to ``<filename>.journal``.
+    When the log grows larger than ``compact_size`` bytes it is compacted.
+    Compacting writes all data to ``<filename>.snapshot``, exports it as YAML
+    to ``<filename>`` for humans and truncates the log.
+
+    Files are replaced atomically and synced to disk. Records are
+    idempotent, so a crash between writing the snapshot and truncating the
+    log only replays some records twice. A torn record at the end of the log
+    is dropped when loading.
+
+    Records are created on the caller's thread. All file operations happen
+    in write(), which is called by the writing thread of the DataManager.
+    """
+
+    def __init__(self, filename: str, compact_size: int=65536) -> None:
+        """Initialise journal.
+
+        Args:
+            filename: Full path of the YAML export. Snapshot and log are
+                stored next to it.
+            compact_size: Compact the log when it grows larger than this
+                many bytes.
+        """
+        self.filename = filename
+        self.snapshot_filename = filename + ".snapshot"
+        self.log_filename = filename + ".journal"
+        self.compact_size = compact_size
+        self.log = logging.getLogger("DataJournal")
+
+        self._pending = []          # type: List[bytes]
+        self._lock = threading.Lock()
+        self._state = dict()        # type: Dict[str, Any]
+        self._log_size = 0
+
+    @staticmethod
+    def _apply(data: dict, record: Tuple) -> dict:
+        """Apply a record to data and return the result."""
+        if record[0] == "set":
+            data[record[1]] = record[2]
+        elif record[0] == "del":
+            data.pop(record[1], None)
+        elif record[0] == "all":
+            data = record[1]
+        else:
+            raise AssertionError("Invalid journal record {}".format(record[0]))
+
+        return data
+
+    @staticmethod
+    def _fsync_dir(path: str) -> None:
+        """Sync a directory to disk so renames in it are durable."""
+        if not hasattr(os, "O_DIRECTORY"):     # pragma: no cover
+            # not supported on windows
+            return
+
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def load(self) -> dict:
+        """Load snapshot and replay the log.
+
+        Falls back to the YAML export if there is no snapshot yet. This way a
+        data file can be switched from the yaml backend to the journal.
+        """
+        data = dict()   # type: Dict[str, Any]
+        if os.path.isfile(self.snapshot_filename):
+            with open(self.snapshot_filename, 'rb') as f:
+                data = pickle.load(f)
+        elif os.path.isfile(self.filename):
+            data = FileManager.load(self.filename, halt_on_error=False)
+
+        if not isinstance(data, dict):
+            data = dict()
+
+        records = 0
+        valid_size = 0
+        if os.path.isfile(self.log_filename):
+            with open(self.log_filename, 'rb') as f:
+                content = f.read()
+
+            while valid_size + RECORD_HEADER.size <= len(content):
+                length, crc = RECORD_HEADER.unpack_from(content, valid_size)
+                start = valid_size + RECORD_HEADER.size
+                record = content[start:start + length]
+                if len(record) != length or zlib.crc32(record) != crc:
+                    break
+
+                data = self._apply(data, pickle.loads(record))
+                valid_size = start + length
+                records += 1
+
+            if valid_size != len(content):
+                self.log.warning("Dropping %s bytes of incomplete records at the end of %s",
+                                 len(content) - valid_size, self.log_filename)
+                with open(self.log_filename, 'r+b') as f:
+                    f.truncate(valid_size)
+                    os.fsync(f.fileno())
+
+        self.log.debug("Loaded %s with %s records from log", self.filename, records)
+        self._state = copy.deepcopy(data)
+        self._log_size = valid_size
+        return data
+
+    def add_record(self, *record) -> None:
+        """Add a record. It will be written on the next call to write().
+
+        The record is serialised immediately so later changes to the value
+        are not written.
+        """
+        data = pickle.dumps(record, protocol=4)
+        with self._lock:
+            self._pending.append(data)
+
+    def write(self) -> int:
+        """Append pending records to the log and compact it if needed.
+
+        Returns the number of bytes written.
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+
+        if not pending:
+            return 0
+
+        buffer = bytearray()
+        for record in pending:
+            buffer += RECORD_HEADER.pack(len(record), zlib.crc32(record))
+            buffer += record
+
+        with open(self.log_filename, 'ab') as f:
+            f.write(buffer)
+            f.flush()
+            os.fsync(f.fileno())
+
+        for record in pending:
+            self._state = self._apply(self._state, pickle.loads(record))
+        self._log_size += len(buffer)
+        written = len(buffer)
+
+        if self._log_size > self.compact_size:
+            written += self.compact()
+
+        return written
+
+    def compact(self) -> int:
+        """Write snapshot and YAML export and truncate the log.
+
+        Returns the number of bytes written.
+        """
+        self.log.debug("Compacting %s", self.log_filename)
+        temp_file = self.snapshot_filename + ".tmp"
+        with open(temp_file, 'wb') as f:
+            pickle.dump(self._state, f, protocol=4)
+            f.flush()
+            os.fsync(f.fileno())
+            written = f.tell()
+        os.replace(temp_file, self.snapshot_filename)
+        self._fsync_dir(os.path.dirname(self.snapshot_filename))
+
+        # the log is only truncated after the snapshot is durable
+        with open(self.log_filename, 'wb') as f:
+            os.fsync(f.fileno())
+        self._log_size = 0
+
+        FileManager.save(self.filename, self._state)
+        written += os.path.getsize(self.filename)
+
+        return written
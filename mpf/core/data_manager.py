@@ -5,9 +5,12 @@ import os
 import errno
 import _thread
 import threading
+import time
 
+from mpf.core.data_journal import DataJournal
 from mpf.core.file_manager import FileManager
 from mpf.core.mpf_controller import MpfController
+from mpf.core.utility_functions import Util
 
 
 class DataManager(MpfController):
@@ -26,26 +29,58 @@ class DataManager(MpfController):
                 is for. This name is used to lookup the configuration option
                 in the machine config in the mpf:paths:<name> location. That's
                 how you specify the file name this DataManager will use.
+
+        The entry in mpf:paths can either be a file name or a dict with
+        ``file``, ``backend`` and ``write_window``. Backend can be ``yaml``
+        (default) which rewrites the YAML file on every save or ``journal``
+        which appends changes to a log and only writes the YAML file when
+        compacting it. All changes within ``write_window`` (default is
+        mpf:data_write_window) are written together.
         """
         super().__init__(machine)
         self.name = name
         config_path = self.machine.config['mpf']['paths'][name]
+        backend = "yaml"
+        write_window = self.machine.config['mpf'].get('data_write_window', 0)
+        if isinstance(config_path, dict):
+            backend = config_path.get("backend", "yaml")
+            write_window = config_path.get("write_window", write_window)
+            config_path = config_path.get("file", False)
+
+        if backend not in ("yaml", "journal"):
+            raise AssertionError("Invalid backend {} for {}".format(backend, name))
+
         if config_path is False:
             self.filename = False
         elif isinstance(config_path, str) and config_path.startswith("/"):
             self.filename = config_path
         elif isinstance(config_path, str):
-            self.filename = os.path.join(self.machine.machine_path,
-                                         self.machine.config['mpf']['paths'][name])
+            self.filename = os.path.join(self.machine.machine_path, config_path)
         else:
             raise AssertionError("Invalid path {} for {}".format(config_path, name))
 
         self.data = dict()
+        self.stats = {"writes": 0, "bytes": 0, "last_latency": 0.0, "max_latency": 0.0}
         self._dirty = threading.Event()
+        self._journal = None    # type: DataJournal
+        self._write_window = Util.string_to_secs(write_window)
+        self._flush_handle = None
+        # keys changed since the last snapshot. None means all keys
+        self._dirty_keys = set()
+        self._first_change = None
+        # last snapshot handed to the writer. never modified
+        self._snapshot = None
+        self._pending_snapshot = None
+        self._pending_since = None
+        self._lock = threading.Lock()
+
+        if self.filename and backend == "journal":
+            self._journal = DataJournal(self.filename)
 
         if self.filename:
             self._setup_file()
 
+            self.machine.events.add_handler('shutdown', self._flush)
             _thread.start_new_thread(self._writing_thread, ())
 
     def _setup_file(self):
@@ -63,7 +98,10 @@ class DataManager(MpfController):
 
     def _load(self):
         self.debug_log("Loading %s from %s", self.name, self.filename)
-        if os.path.isfile(self.filename):
+        if self._journal:
+            self.data = self._journal.load()
+
+        elif os.path.isfile(self.filename):
             self.data = FileManager.load(self.filename, halt_on_error=False)
 
         else:
@@ -110,13 +148,75 @@ class DataManager(MpfController):
         if data:
             self.data = data
 
+        if self._journal:
+            self._journal.add_record("all", self.data)
+
+        self._dirty_keys = None
+        self._save(delay_secs)
+
+    def _save(self, delay_secs):
         if delay_secs:
             self.machine.delay.add(callback=self._delayed_save_callback,
                                    ms=delay_secs * 1000)
         else:
-            self._dirty.set()
+            self._schedule_flush()
 
     def _delayed_save_callback(self):
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Write all changes together after the write window."""
+        if not self.filename:
+            return
+
+        if self._first_change is None:
+            self._first_change = time.perf_counter()
+
+        if self._flush_handle:
+            return
+
+        if self._write_window:
+            self._flush_handle = self.machine.clock.schedule_once(self._flush, self._write_window)
+        else:
+            self._flush()
+
+    def _flush(self, **kwargs):
+        """Hand a snapshot of all changes to the writing thread.
+
+        The snapshot is created in the loop thread. Only keys which changed
+        since the last snapshot are copied. All other values are shared with
+        the previous snapshot which is never modified.
+        """
+        del kwargs
+        if self._flush_handle:
+            self.machine.clock.unschedule(self._flush_handle)
+            self._flush_handle = None
+
+        if self._first_change is None:
+            return
+
+        if not self._journal:
+            if self._dirty_keys is None or self._snapshot is None:
+                snapshot = copy.deepcopy(self.data)
+            else:
+                snapshot = dict(self._snapshot)
+                for key in self._dirty_keys:
+                    if key in self.data:
+                        snapshot[key] = copy.deepcopy(self.data[key])
+                    else:
+                        snapshot.pop(key, None)
+
+            self._snapshot = snapshot
+        else:
+            snapshot = None
+
+        with self._lock:
+            self._pending_snapshot = snapshot
+            if self._pending_since is None:
+                self._pending_since = self._first_change
+
+        self._dirty_keys = set()
+        self._first_change = None
         self._dirty.set()
 
     def save_key(self, key, value, delay_secs=0):
@@ -135,24 +235,82 @@ class DataManager(MpfController):
             # todo should we reload from disk here?
             self.data = dict()
             self.data[key] = value
+            self._dirty_keys = None
+
+        if self._journal:
+            self._journal.add_record("set", key, value)
+
+        if self._dirty_keys is not None:
+            self._dirty_keys.add(key)
 
-        self.save_all(delay_secs=delay_secs)
+        self._save(delay_secs)
 
     def remove_key(self, key):
         """Remove key by name."""
         try:
             del self.data[key]
-            self.save_all()
         except KeyError:
-            pass
+            return
+
+        if self._journal:
+            self._journal.add_record("del", key)
+
+        if self._dirty_keys is not None:
+            self._dirty_keys.add(key)
+
+        self._save(0)
+
+    def _write(self):
+        """Write pending changes to disk."""
+        with self._lock:
+            snapshot = self._pending_snapshot
+            pending_since = self._pending_since
+            self._pending_snapshot = None
+            self._pending_since = None
+
+        if pending_since is None:
+            return
+
+        start = time.perf_counter()
+        if self._journal:
+            self.debug_log("Appending %s to: %s", self.name, self._journal.log_filename)
+            written = self._journal.write()
+        else:
+            self.debug_log("Writing %s to: %s", self.name, self.filename)
+            FileManager.save(self.filename, snapshot)
+            written = os.path.getsize(self.filename)
+
+        end = time.perf_counter()
+        latency = end - pending_since
+        if not self.machine.thread_stopper.is_set():
+            self.machine.clock.loop.call_soon_threadsafe(self._post_written_event, written, latency)
+
+        self.stats["writes"] += 1
+        self.stats["bytes"] += written
+        self.stats["last_latency"] = latency
+        self.stats["max_latency"] = max(self.stats["max_latency"], latency)
+        self.debug_log("Wrote %s bytes of %s in %.1fms. Latency since first change: %.1fms", written,
+                       self.name, (end - start) * 1000, latency * 1000)
+
+    def _post_written_event(self, written, latency):
+        self.machine.events.post('data_manager_written', name=self.name, bytes=written,
+                                 latency=latency)
+        '''event: data_manager_written
+        desc: A DataManager wrote changes to disk. Use this to monitor disk
+        writes of audits, machine vars, high scores and earnings.
+
+        args:
+        name: Name of the data file (e.g. machine_vars).
+        bytes: Number of bytes written.
+        latency: Seconds between the first change and the end of the write.
+        '''
 
     def _writing_thread(self):  # pragma: no cover
         while not self.machine.thread_stopper.is_set():
             if not self._dirty.wait(1):
                 continue
             self._dirty.clear()
+            self._write()
 
-            data = copy.deepcopy(self.data)
-            self.debug_log("Writing %s to: %s", self.name, self.filename)
-            # save data
-            FileManager.save(self.filename, data)
+        # changes are flushed on shutdown. do not lose them
+        self._write()
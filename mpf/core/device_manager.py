@@ -22,6 +22,7 @@ class DeviceManager(MpfController):
 
         self.collections = OrderedDict()
         self.device_classes = OrderedDict()  # collection_name: device_class
+        self._lazy_device_types = dict()     # collection_name: device_type
 
         # this has to happen before mode load (which is priority 10)
         self.machine.events.add_handler('init_phase_1',
@@ -65,9 +66,33 @@ class DeviceManager(MpfController):
         """
         self.machine.bcp.interface.notify_device_changes(device, notify, old, value)
 
+    def _get_device_module_index(self, device_type):
+        """Return (collection, config_section) of an indexed device module or None."""
+        if not self.machine.config['mpf'].get('lazy_load_modules', False):
+            return None
+
+        # keys in the index are lower case like all config keys
+        entry = self.machine.config['mpf'].get('device_module_index', {}).get(device_type.lower())
+        if not entry:
+            return None
+
+        return tuple(Util.string_to_list(entry))
+
+    def _get_used_config_sections(self):
+        """Return all config sections used in the machine config or any mode config."""
+        sections = set(self.machine.config.keys())
+        for mode in self.machine.modes:
+            sections.update(mode.config.keys())
+
+        return sections
+
     def _load_device_config_spec(self, **kwargs):
         del kwargs
         for device_type in self.machine.config['mpf']['device_modules']:
+            if self._get_device_module_index(device_type):
+                # indexed device modules use the config spec in config_spec.py
+                continue
+
             device_cls = Util.string_to_class(device_type)      # type: Device
 
             if device_cls.get_config_spec():
@@ -77,56 +102,93 @@ class DeviceManager(MpfController):
 
     def _load_device_modules(self, **kwargs):
         del kwargs
+        profiler = self.machine.startup_profiler
         # step 1: create devices in machine collection
         self.debug_log("Creating devices...")
-        for device_type in self.machine.config['mpf']['device_modules']:
-            device_cls = Util.string_to_class(device_type)      # type: Device
+        used_sections = self._get_used_config_sections()
+        with profiler.section("create_devices"):
+            for device_type in self.machine.config['mpf']['device_modules']:
+                index = self._get_device_module_index(device_type)
+                with profiler.section(device_type):
+                    if index and index[1] not in used_sections:
+                        self._create_lazy_collection(device_type, *index)
+                    else:
+                        self._create_collection(device_type)
 
-            collection_name, config = device_cls.get_config_info()
+            self.machine.mode_controller.create_mode_devices()
 
-            self.device_classes[collection_name] = device_cls
+        # step 2: load config and validate devices
+        with profiler.section("load_devices_config"):
+            self.load_devices_config(validate=True)
+            self.machine.mode_controller.load_mode_devices()
 
-            # create the collection
-            collection = DeviceCollection(self.machine, collection_name,
-                                          device_cls.config_section)
+        # step 3: initialise devices (mode devices will be initialised when mode is started)
+        with profiler.section("initialize_devices"):
+            self.initialize_devices()
 
-            self.collections[collection_name] = collection
-            setattr(self.machine, collection_name, collection)
+    def _create_collection(self, device_type):
+        """Create the collection and machine-wide devices for a device class."""
+        device_cls = Util.string_to_class(device_type)      # type: Device
 
-            # Get the config section for these devices
-            config = self.machine.config.get(config, None)
+        collection_name, config = device_cls.get_config_info()
 
-            # create the devices
-            if config:
-                self.create_devices(collection_name, config)
+        self.device_classes[collection_name] = device_cls
 
-            # create the default control events
-            try:
-                self._create_default_control_events(collection)
-            except KeyError:
-                pass
+        # create the collection
+        collection = DeviceCollection(self.machine, collection_name,
+                                      device_cls.config_section)
 
-        self.machine.mode_controller.create_mode_devices()
+        self.collections[collection_name] = collection
+        setattr(self.machine, collection_name, collection)
 
-        # step 2: load config and validate devices
-        self.load_devices_config(validate=True)
-        self.machine.mode_controller.load_mode_devices()
+        # Get the config section for these devices
+        config = self.machine.config.get(config, None)
 
-        # step 3: initialise devices (mode devices will be initialised when mode is started)
-        self.initialize_devices()
+        # create the devices
+        if config:
+            self.create_devices(collection_name, config)
+
+        # create the default control events
+        try:
+            self._create_default_control_events(collection)
+        except KeyError:
+            pass
+
+    def _create_lazy_collection(self, device_type, collection_name, config_section):
+        """Create an empty collection for a device class which is not used in any config.
+
+        The device class will only be imported when a device is added to the
+        collection.
+        """
+        self.debug_log("Not loading unused device module %s", device_type)
+        self._lazy_device_types[collection_name] = device_type
+
+        collection = DeviceCollection(self.machine, collection_name, config_section)
+        self.collections[collection_name] = collection
+        setattr(self.machine, collection_name, collection)
+
+    def get_device_class(self, collection_name):
+        """Return the device class of a collection and import it if it has not been loaded yet."""
+        try:
+            return self.device_classes[collection_name]
+        except KeyError:
+            if collection_name not in self._lazy_device_types:
+                raise
+
+        device_cls = Util.string_to_class(self._lazy_device_types.pop(collection_name))
+        self.device_classes[collection_name] = device_cls
+        return device_cls
 
     def stop_devices(self):
         """Stop all devices in the machine."""
-        for device_type in self.machine.config['mpf']['device_modules']:
-            device_cls = Util.string_to_class(device_type)
-            collection_name, config = device_cls.get_config_info()
-            for device in getattr(self.machine, collection_name):
+        for collection in self.collections.values():
+            for device in collection:
                 if hasattr(device, "stop_device"):
                     device.stop_device()
 
     def create_devices(self, collection_name, config):
         """Create devices for a collection."""
-        cls = self.device_classes[collection_name]
+        cls = self.get_device_class(collection_name)
 
         collection = getattr(self.machine, collection_name)
 
@@ -151,11 +213,9 @@ class DeviceManager(MpfController):
     def load_devices_config(self, validate=True):
         """Load all devices."""
         if validate:
-            for device_type in self.machine.config['mpf']['device_modules']:
-
-                device_cls = Util.string_to_class(device_type)
+            for collection_name, device_cls in self.device_classes.items():
 
-                collection_name, config_name = device_cls.get_config_info()
+                config_name = device_cls.config_section
 
                 if config_name not in self.machine.config:
                     continue
@@ -165,15 +225,15 @@ class DeviceManager(MpfController):
                 config = self.machine.config[config_name]
 
                 # validate config
-                for device_name in config:
-                    config[device_name] = collection[device_name].prepare_config(config[device_name], False)
-                    config[device_name] = collection[device_name].validate_and_parse_config(config[device_name], False)
-
-        for device_type in self.machine.config['mpf']['device_modules']:
+                with self.machine.startup_profiler.section("validate " + collection_name):
+                    for device_name in config:
+                        config[device_name] = collection[device_name].prepare_config(config[device_name], False)
+                        config[device_name] = collection[device_name].validate_and_parse_config(
+                            config[device_name], False)
 
-            device_cls = Util.string_to_class(device_type)
+        for collection_name, device_cls in self.device_classes.items():
 
-            collection_name, config_name = device_cls.get_config_info()
+            config_name = device_cls.config_section
 
             if config_name not in self.machine.config:
                 continue
@@ -183,16 +243,15 @@ class DeviceManager(MpfController):
             config = self.machine.config[config_name]
 
             # load config
-            for device_name in config:
-                collection[device_name].load_config(config[device_name])
+            with self.machine.startup_profiler.section("load " + collection_name):
+                for device_name in config:
+                    collection[device_name].load_config(config[device_name])
 
     def initialize_devices(self):
         """Initialise devices."""
-        for device_type in self.machine.config['mpf']['device_modules']:
+        for collection_name, device_cls in self.device_classes.items():
 
-            device_cls = Util.string_to_class(device_type)
-
-            collection_name, config_name = device_cls.get_config_info()
+            config_name = device_cls.config_section
 
             if config_name not in self.machine.config:
                 continue
@@ -202,8 +261,9 @@ class DeviceManager(MpfController):
             config = self.machine.config[config_name]
 
             # add machine wide
-            for device_name in config:
-                collection[device_name].device_added_system_wide()
+            with self.machine.startup_profiler.section(collection_name):
+                for device_name in config:
+                    collection[device_name].device_added_system_wide()
 
     def get_device_control_events(self, config):
         """Scan a config dictionary for control_events.
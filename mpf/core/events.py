@@ -33,8 +33,34 @@ class EventManager(MpfController):
         self.event_queue = deque([])        # type: Deque[PostedEvent]
         self.callback_queue = deque([])     # type: Deque[Tuple[Any, dict]]
         self.monitor_events = False
+        self._event_monitor = None          # type: Optional[Callable[[str], bool]]
+        self._monitored_events = dict()     # type: Dict[str, bool]
         self._queue_tasks = []              # type: List[asyncio.Task]
 
+    def set_event_monitor(self, matcher: Optional[Callable[[str], bool]]) -> None:
+        """Enable monitoring of posted events.
+
+        Args:
+            matcher: Returns True for event names which are monitored. The
+                result is cached per event until the next call. Pass None to
+                disable event monitoring.
+        """
+        self._event_monitor = matcher
+        self._monitored_events = dict()
+        self.monitor_events = matcher is not None
+
+    def is_event_monitored(self, event: str) -> bool:
+        """Return true if a posted event is sent to the event monitor."""
+        if not self.monitor_events:
+            return False
+
+        try:
+            return self._monitored_events[event]
+        except KeyError:
+            monitored = self._event_monitor(event) if self._event_monitor else True
+            self._monitored_events[event] = monitored
+            return monitored
+
     def get_event_and_condition_from_string(self, event_string: str) -> Tuple[str, Optional["BaseTemplate"]]:
         """Parse an event string to divide the event name from a possible placeholder / conditional in braces.
 
@@ -504,8 +530,10 @@ class EventManager(MpfController):
         else:
             self.info_log("Event: ======'%s'====== Args=%s", event, kwargs)
 
+        monitored = self.monitor_events and self.is_event_monitored(event)
+
         # fast path for events without handler
-        if not callback and not self.monitor_events and event not in self.registered_handlers:
+        if not callback and not monitored and event not in self.registered_handlers:
             return
 
         if not self.event_queue and hasattr(self.machine.clock, "loop"):
@@ -513,7 +541,7 @@ class EventManager(MpfController):
 
         posted_event = PostedEvent(event, ev_type, callback, kwargs)
 
-        if self.monitor_events:
+        if monitored:
             self.machine.bcp.interface.monitor_posted_event(posted_event)
 
         self.event_queue.append(posted_event)
@@ -562,7 +590,13 @@ class EventManager(MpfController):
             except KeyError:
                 queue = QueuedEvent(self.debug_log)
 
-            handler.callback(queue=queue, **merged_kwargs)
+            if self.machine.startup_profiler.enabled:
+                # time init_phase handlers during boot
+                with self.machine.startup_profiler.section(
+                        getattr(handler.callback, '__qualname__', str(handler.callback))):
+                    handler.callback(queue=queue, **merged_kwargs)
+            else:
+                handler.callback(queue=queue, **merged_kwargs)
 
             if queue.waiter:
                 queue.event = asyncio.Event(loop=self.machine.clock.loop)
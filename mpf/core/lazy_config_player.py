@@ -0,0 +1,81 @@
+"""Contains the LazyConfigPlayer which defers importing unused config players."""
+from mpf.core.utility_functions import Util
+
+
+class LazyConfigPlayer(object):
+
+    """Stand-in for a config player which is not used in the machine config.
+
+    It registers for the same mode config section and show section as the real
+    player would. The player class is only imported and instantiated when a
+    mode config or a show actually uses it.
+    """
+
+    def __init__(self, machine, name, class_path, config_file_section, show_section):
+        """Initialise lazy config player.
+
+        Args:
+            machine: The machine controller.
+            name: Name of the player in mpf:config_players.
+            class_path: Full class path of the real player.
+            config_file_section: Config section of the real player.
+            show_section: Show section of the real player.
+        """
+        self.machine = machine
+        self.name = name
+        self.class_path = class_path
+        self.config_file_section = config_file_section
+        self.show_section = show_section
+        self._player = None
+
+        if self.show_section and hasattr(self.machine, "show_controller"):
+            self.machine.show_controller.show_players[self.show_section] = self
+
+        self.machine.events.add_handler('init_phase_1', self._initialize_in_mode, priority=20)
+
+    def __repr__(self):
+        """Return string representation."""
+        return 'LazyConfigPlayer.{}'.format(self.show_section)
+
+    def _initialize_in_mode(self, **kwargs):
+        del kwargs
+        self.machine.mode_controller.register_load_method(
+            self.process_mode_config, self.config_file_section)
+
+        self.machine.mode_controller.register_start_method(
+            self.mode_start, self.config_file_section)
+
+    @property
+    def player(self):
+        """Return the real player and create it on first use."""
+        if not self._player:
+            self.machine.log.debug("Loading config player %s on first use", self.class_path)
+            # the player replaces this stand-in in show_players
+            self._player = Util.string_to_class(self.class_path)(self.machine)
+            setattr(self.machine, '{}_player'.format(self.name), self._player)
+            # we are past init_phase_1 when the player is first used. the
+            # machine config has no section for this player so this only
+            # resolves the device collection.
+            self._player._initialise_system_wide()     # pylint: disable-msg=protected-access
+
+        return self._player
+
+    def process_mode_config(self, **kwargs):
+        """Forward mode config to the real player."""
+        return self.player.process_mode_config(**kwargs)
+
+    def mode_start(self, **kwargs):
+        """Forward mode start to the real player."""
+        return self.player.mode_start(**kwargs)
+
+    def validate_config_entry(self, settings, name):
+        """Forward show step validation to the real player."""
+        return self.player.validate_config_entry(settings, name)
+
+    def show_play_callback(self, settings, priority, calling_context, show_tokens, context):
+        """Forward show step to the real player."""
+        return self.player.show_play_callback(settings, priority, calling_context, show_tokens, context)
+
+    def show_stop_callback(self, context):
+        """Forward show stop to the real player."""
+        return self.player.show_stop_callback(context)
@@ -1,13 +1,12 @@
 """Contains the MachineController base class."""
-import errno
 import hashlib
 import logging
 import os
-import pickle
 import tempfile
 
 import sys
 import threading
+import time
 from platform import platform, python_version, system, release, version, system_alias, machine
 
 import copy
@@ -18,15 +17,18 @@ from pkg_resources import iter_entry_points
 from typing import Any, TYPE_CHECKING, Callable, Dict, List, Set, Generator
 
 from mpf._version import __version__, version as mpf_version, extended_version as mpf_extended_version
-from mpf.core.case_insensitive_dict import CaseInsensitiveDict
 from mpf.core.clock import ClockBase
+from mpf.core.config_cache import ConfigCache
 from mpf.core.config_processor import ConfigProcessor
 from mpf.core.config_validator import ConfigValidator
 from mpf.core.data_manager import DataManager
 from mpf.core.delays import DelayManager, DelayManagerRegistry
 from mpf.core.device_manager import DeviceCollection, DeviceCollectionType
+from mpf.core.lazy_config_player import LazyConfigPlayer
+from mpf.core.startup_profiler import StartupProfiler
 from mpf.core.utility_functions import Util
 from mpf.core.logging import LogMixin
+from mpf.core.machine_variables import MachineVariables
 
 if TYPE_CHECKING:   # pragma: no cover
     from mpf.modes.game.code.game import Game
@@ -100,12 +102,15 @@ class MachineController(LogMixin):
         self.scriptlets = list()    # type: List[Scriptlet]
         self.modes = DeviceCollection(self, 'modes', None)          # type: Dict[str, Mode]
         self.game = None            # type: Game
-        self.machine_vars = CaseInsensitiveDict()
+        self.variables = MachineVariables(self)
+        self.machine_vars = self.variables.machine_vars
         self.machine_var_monitor = False
         self.machine_var_data_manager = None    # type: DataManager
+        self.hardware_inventory = None          # type: DataManager
         self.thread_stopper = threading.Event()
 
         self.config = None      # type: Any
+        self.startup_profiler = StartupProfiler(bool(self.options.get('profile_startup')))
 
         # add some type hints
         if TYPE_CHECKING:   # pragma: no cover
@@ -142,8 +147,10 @@ class MachineController(LogMixin):
         self._set_machine_path()
 
         self.config_validator = ConfigValidator(self)
+        self.config_cache = None    # type: ConfigCache
 
-        self._load_config()
+        with self.startup_profiler.section("load_config"):
+            self._load_config()
         self.machine_config = self.config       # type: Any
         self.configure_logging(
             'Machine',
@@ -165,9 +172,11 @@ class MachineController(LogMixin):
         self.is_init_done = asyncio.Event(loop=self.clock.loop)
         self.register_boot_hold('init')
 
-        self._load_hardware_platforms()
+        with self.startup_profiler.section("load_hardware_platforms"):
+            self._load_hardware_platforms()
 
-        self._load_core_modules()
+        with self.startup_profiler.section("load_core_modules"):
+            self._load_core_modules()
         # order is specified in mpfconfig.yaml
 
         self._initialize_credit_string()
@@ -175,19 +184,42 @@ class MachineController(LogMixin):
         # This is called so hw platforms have a chance to register for events,
         # and/or anything else they need to do with core modules since
         # they're not set up yet when the hw platforms are constructed.
-        yield from self._initialize_platforms()
+        with self.startup_profiler.section("initialize_platforms"):
+            yield from self._initialize_platforms()
 
-        self._validate_config()
+        with self.startup_profiler.section("validate_config"):
+            self._validate_config()
 
-        self._register_config_players()
+        with self.startup_profiler.section("register_config_players"):
+            self._register_config_players()
         self._register_system_events()
-        self._load_machine_vars()
+        with self.startup_profiler.section("load_machine_vars"):
+            self._load_machine_vars()
         yield from self._run_init_phases()
         self._init_phases_complete()
 
         # wait until all boot holds were released
-        yield from self.is_init_done.wait()
-        yield from self.init_done()
+        with self.startup_profiler.section("wait_for_boot_holds"):
+            yield from self.is_init_done.wait()
+        with self.startup_profiler.section("init_done"):
+            yield from self.init_done()
+
+        self._write_config_cache()
+        self._write_startup_profile()
+
+    def _write_startup_profile(self) -> None:
+        """Stop the startup profiler and write its report if requested."""
+        if not self.startup_profiler.enabled:
+            return
+
+        self.startup_profiler.finish()
+        filename = self.options['profile_startup']
+        if not os.path.isabs(filename):
+            filename = os.path.join(self.machine_path, filename)
+
+        self.startup_profiler.write_report(filename)
+        self.info_log("Startup took %.3fs. Wrote startup profile to %s",
+                      self.startup_profiler.get_report()['total'], filename)
 
     def _exception_handler(self, loop, context):    # pragma: no cover
         """Handle asyncio loop exceptions."""
@@ -211,31 +243,38 @@ class MachineController(LogMixin):
     @asyncio.coroutine
     def _run_init_phases(self) -> Generator[int, None, None]:
         """Run init phases."""
-        yield from self.events.post_queue_async("init_phase_1")
+        with self.startup_profiler.section("init_phase_1"):
+            yield from self.events.post_queue_async("init_phase_1")
         '''event: init_phase_1
 
         desc: Posted during the initial boot up of MPF.
         '''
-        yield from self.events.post_queue_async("init_phase_2")
+        with self.startup_profiler.section("init_phase_2"):
+            yield from self.events.post_queue_async("init_phase_2")
         '''event: init_phase_2
 
         desc: Posted during the initial boot up of MPF.
         '''
-        self._load_plugins()
-        yield from self.events.post_queue_async("init_phase_3")
+        with self.startup_profiler.section("load_plugins"):
+            self._load_plugins()
+        with self.startup_profiler.section("init_phase_3"):
+            yield from self.events.post_queue_async("init_phase_3")
         '''event: init_phase_3
 
         desc: Posted during the initial boot up of MPF.
         '''
-        self._load_scriptlets()
+        with self.startup_profiler.section("load_scriptlets"):
+            self._load_scriptlets()
 
-        yield from self.events.post_queue_async("init_phase_4")
+        with self.startup_profiler.section("init_phase_4"):
+            yield from self.events.post_queue_async("init_phase_4")
         '''event: init_phase_4
 
         desc: Posted during the initial boot up of MPF.
         '''
 
-        yield from self.events.post_queue_async("init_phase_5")
+        with self.startup_profiler.section("init_phase_5"):
+            yield from self.events.post_queue_async("init_phase_5")
         '''event: init_phase_5
 
         desc: Posted during the initial boot up of MPF.
@@ -250,11 +289,56 @@ class MachineController(LogMixin):
 
     @asyncio.coroutine
     def _initialize_platforms(self) -> Generator[int, None, None]:
-        """Initialise all used hardware platforms."""
-        for hardware_platform in list(self.hardware_platforms.values()):
-            yield from hardware_platform.initialize()
-            if not hardware_platform.features['tickless']:
-                self.clock.schedule_interval(hardware_platform.tick, 1 / self.config['mpf']['default_platform_hz'])
+        """Initialise all used hardware platforms.
+
+        Platforms are initialised concurrently. A platform waits for all
+        platforms returned by its get_init_dependencies().
+        """
+        dependencies = {}
+        for hardware_platform in self.hardware_platforms.values():
+            dependencies[hardware_platform] = [dependency for dependency in hardware_platform.get_init_dependencies()
+                                               if dependency is not hardware_platform]
+        self._check_platform_dependencies(dependencies)
+
+        tasks = {}
+        for name, hardware_platform in self.hardware_platforms.items():
+            # tasks start after all of them have been created
+            tasks[hardware_platform] = self.clock.loop.create_task(
+                self._initialize_platform(name, hardware_platform, tasks, dependencies[hardware_platform]))
+
+        yield from asyncio.gather(*tasks.values(), loop=self.clock.loop)
+
+    def _check_platform_dependencies(self, dependencies) -> None:
+        """Raise if platforms depend on each other."""
+        done = set()
+
+        def _visit(hardware_platform, path):
+            if hardware_platform in path:
+                raise AssertionError("Circular platform dependency: {}".format(
+                    " -> ".join(str(p) for p in path + [hardware_platform])))
+            if hardware_platform in done:
+                return
+            for dependency in dependencies.get(hardware_platform, []):
+                _visit(dependency, path + [hardware_platform])
+            done.add(hardware_platform)
+
+        for hardware_platform in dependencies:
+            _visit(hardware_platform, [])
+
+    @asyncio.coroutine
+    def _initialize_platform(self, name, hardware_platform, tasks, dependencies) -> Generator[int, None, None]:
+        """Initialise one platform after its dependencies."""
+        if dependencies:
+            yield from asyncio.wait([tasks[dependency] for dependency in dependencies], loop=self.clock.loop)
+
+        start = time.perf_counter()
+        yield from hardware_platform.initialize()
+        duration = time.perf_counter() - start
+        self.startup_profiler.add_section(name, start, duration)
+        self.info_log("Initialised platform %s in %.3fs", name, duration)
+
+        if not hardware_platform.features['tickless']:
+            self.clock.schedule_interval(hardware_platform.tick, 1 / self.config['mpf']['default_platform_hz'])
 
     def _initialize_credit_string(self):
         """Set default credit string."""
@@ -302,12 +386,32 @@ class MachineController(LogMixin):
         """Register config players."""
         # todo move this to config_player module
         for name, module_class in self.config['mpf']['config_players'].items():
-            config_player_class = Util.string_to_class(module_class)
-            setattr(self, '{}_player'.format(name),
-                    config_player_class(self))
+            with self.startup_profiler.section(name):
+                index = self._get_config_player_index(name)
+                if index and index[0] not in self.config:
+                    # mode configs are not loaded yet. the stand-in will
+                    # import the player once a mode or show uses it
+                    setattr(self, '{}_player'.format(name),
+                            LazyConfigPlayer(self, name, module_class, *index))
+                    continue
+
+                config_player_class = Util.string_to_class(module_class)
+                setattr(self, '{}_player'.format(name),
+                        config_player_class(self))
 
         self._register_plugin_config_players()
 
+    def _get_config_player_index(self, name: str):
+        """Return (config_file_section, show_section) of an indexed config player or None."""
+        if not self.config['mpf'].get('lazy_load_modules', False):
+            return None
+
+        entry = self.config['mpf'].get('config_player_index', {}).get(name)
+        if not entry:
+            return None
+
+        return tuple(Util.string_to_list(entry))
+
     def _register_plugin_config_players(self):
         """Register plugin config players."""
         self.debug_log("Registering Plugin Config Players")
@@ -324,24 +428,20 @@ class MachineController(LogMixin):
         """
         return DataManager(self, config_name)
 
+    def get_hardware_inventory(self) -> DataManager:
+        """Return the DataManager which stores hardware discovered by platforms.
+
+        It is created when a platform needs it first.
+        """
+        if not self.hardware_inventory:
+            self.hardware_inventory = self.create_data_manager('hardware_inventory')
+        return self.hardware_inventory
+
     def _load_machine_vars(self) -> None:
         """Load machine vars from data manager."""
         self.machine_var_data_manager = self.create_data_manager('machine_vars')
 
-        current_time = self.clock.get_time()
-
-        for name, settings in (
-                iter(self.machine_var_data_manager.get_data().items())):
-
-            if not isinstance(settings, dict) or "value" not in settings:
-                continue
-
-            if ('expire' in settings and settings['expire'] and
-                    settings['expire'] < current_time):
-
-                settings['value'] = 0
-
-            self.set_machine_var(name=name, value=settings['value'])
+        self.variables.load(self.machine_var_data_manager)
 
         self._load_initial_machine_vars()
 
@@ -382,33 +482,14 @@ class MachineController(LogMixin):
         return result
 
     def _load_config(self) -> None:     # pragma: no cover
-        if self.options['no_load_cache']:
-            load_from_cache = False
-        else:
-            try:
-                if self._get_latest_config_mod_time() > os.path.getmtime(self._get_mpfcache_file_name()):
-                    load_from_cache = False  # config is newer
-                else:
-                    load_from_cache = True  # cache is newer
-
-            except OSError as exception:
-                if exception.errno != errno.ENOENT:
-                    raise  # some unknown error?
-                else:
-                    load_from_cache = False  # cache file doesn't exist
-
-        config_loaded = False
-        if load_from_cache:
-            config_loaded = self._load_config_from_cache()
-
-        if not config_loaded:
-            self._load_config_from_files()
+        self.config_cache = ConfigCache(self._get_mpfcache_file_name(),
+                                        load=not self.options['no_load_cache'])
+        self._load_config_from_files()
 
     def _load_config_from_files(self) -> None:
-        self.log.info("Loading config from original files")
+        self.log.info("Loading config files")
 
         self.config = self._get_mpf_config()
-        self.config['_mpf_version'] = __version__
 
         for num, config_file in enumerate(self.options['configfile']):
 
@@ -422,61 +503,26 @@ class MachineController(LogMixin):
             self.config = Util.dict_merge(self.config,
                                           ConfigProcessor.load_config_file(
                                               config_file,
-                                              config_type='machine'))
+                                              config_type='machine',
+                                              config_cache=self.config_cache))
 
-        if self.options['create_config_cache']:
-            self._cache_config()
+        self.log.info("Config files loaded. Cache hits: %s. Cache misses: %s",
+                      self.config_cache.hits, self.config_cache.misses)
 
     def _get_mpf_config(self) -> dict:
         """Return mpf config dict."""
         return ConfigProcessor.load_config_file(self.options['mpfconfigfile'],
-                                                config_type='machine')
+                                                config_type='machine',
+                                                config_cache=self.config_cache)
 
-    def _load_config_from_cache(self) -> bool:
-        """Return true if config was loaded from cache."""
-        self.log.info("Loading cached config: %s", self._get_mpfcache_file_name())
+    def _write_config_cache(self) -> None:
+        """Write config cache if enabled.
 
-        with open(self._get_mpfcache_file_name(), 'rb') as f:
-
-            try:
-                self.config = pickle.load(f)
-
-            # unfortunately pickle can raise all kinds of exceptions and we dont want to crash on corrupted cache
-            # pylint: disable-msg=broad-except
-            except Exception:   # pragma: no cover
-                self.log.warning("Could not load config from cache")
-                return False
-
-            if self.config.get('_mpf_version') != __version__:
-                self.log.info(
-                    "Cached config is from a different version of MPF.")
-                return False
-
-            return True
-
-    def _get_latest_config_mod_time(self) -> float:
-        """Return last modification time of the config file."""
-        latest_time = os.path.getmtime(self.options['mpfconfigfile'])
-
-        for root, dirs, files in os.walk(
-                os.path.join(self.machine_path, 'config')):
-            for name in files:
-                if not name.startswith('.'):
-                    if os.path.getmtime(os.path.join(root, name)) > latest_time:
-                        latest_time = os.path.getmtime(os.path.join(root, name))
-
-            for name in dirs:
-                if not name.startswith('.'):
-                    if os.path.getmtime(os.path.join(root, name)) > latest_time:
-                        latest_time = os.path.getmtime(os.path.join(root, name))
-
-        return latest_time
-
-    def _cache_config(self):    # pragma: no cover
-        """Dump config to cache."""
-        with open(self._get_mpfcache_file_name(), 'wb') as f:
-            pickle.dump(self.config, f, protocol=4)
-            self.log.info('Config file cache created: %s', self._get_mpfcache_file_name())
+        This is called after init and on shutdown to include mode configs and
+        shows which are loaded later.
+        """
+        if self.config_cache and self.options['create_config_cache']:
+            self.config_cache.write()
 
     def verify_system_info(self):
         """Dump information about the Python installation to the log.
@@ -508,7 +554,8 @@ class MachineController(LogMixin):
         self.debug_log("Loading core modules...")
         for name, module_class in self.config['mpf']['core_modules'].items():
             self.debug_log("Loading '%s' core module", module_class)
-            m = Util.string_to_class(module_class)(self)
+            with self.startup_profiler.section(name):
+                m = Util.string_to_class(module_class)(self)
             setattr(self, name, m)
 
     def _load_hardware_platforms(self) -> None:
@@ -543,7 +590,8 @@ class MachineController(LogMixin):
 
             self.debug_log("Loading '%s' plugin", plugin)
 
-            plugin_obj = Util.string_to_class(plugin)(self)
+            with self.startup_profiler.section(plugin):
+                plugin_obj = Util.string_to_class(plugin)(self)
             self.plugins.append(plugin_obj)
 
     def _load_scriptlets(self) -> None:
@@ -557,9 +605,10 @@ class MachineController(LogMixin):
 
                 self.debug_log("Loading '%s' scriptlet", scriptlet)
 
-                scriptlet_obj = Util.string_to_class(self.config['mpf']['paths']['scriptlets'] + "." + scriptlet)(
-                    machine=self,
-                    name=scriptlet.split('.')[1])
+                with self.startup_profiler.section(scriptlet):
+                    scriptlet_obj = Util.string_to_class(self.config['mpf']['paths']['scriptlets'] + "." + scriptlet)(
+                        machine=self,
+                        name=scriptlet.split('.')[1])
 
                 self.scriptlets.append(scriptlet_obj)
 
@@ -704,6 +753,8 @@ class MachineController(LogMixin):
             return
 
         self.log.info("Shutting down...")
+        # write pending machine vars before the data managers flush
+        self.variables.flush()
         self.events.post('shutdown')
         '''event: shutdown
         desc: Posted when the machine is shutting down to give all modules a
@@ -714,6 +765,7 @@ class MachineController(LogMixin):
         self.thread_stopper.set()
         self.device_manager.stop_devices()
         self._platform_stop()
+        self._write_config_cache()
 
         self.clock.loop.stop()
 
@@ -745,19 +797,11 @@ class MachineController(LogMixin):
     def _platform_stop(self) -> None:
         """Stop all platforms."""
         for hardware_platform in list(self.hardware_platforms.values()):
+            # send outputs staged in the last loop iteration
+            if hardware_platform.output_stage:
+                hardware_platform.output_stage.flush()
             hardware_platform.stop()
 
-    def _write_machine_var_to_disk(self, name: str) -> None:
-        """Write value to disk."""
-        if self.machine_vars[name]['persist'] and self.config['mpf']['save_machine_vars_to_disk']:
-            disk_var = CaseInsensitiveDict()
-            disk_var['value'] = self.machine_vars[name]['value']
-
-            if self.machine_vars[name]['expire_secs']:
-                disk_var['expire'] = self.clock.get_time() + self.machine_vars[name]['expire_secs']
-
-            self.machine_var_data_manager.save_key(name, disk_var)
-
     def get_machine_var(self, name: str) -> Any:
         """Return the value of a machine variable.
 
@@ -769,14 +813,11 @@ class MachineController(LogMixin):
             does not exist.
 
         """
-        try:
-            return self.machine_vars[name]['value']
-        except KeyError:
-            return None
+        return self.variables.get(name)
 
     def is_machine_var(self, name: str) -> bool:
         """Return true if machine variable exists."""
-        return name in self.machine_vars
+        return name in self.variables
 
     def configure_machine_var(self, name: str, persist: bool, expire_secs: int=None) -> None:
         """Create a new machine variable.
@@ -786,22 +827,13 @@ class MachineController(LogMixin):
             persist: Boolean as to whether this variable should be saved to
                 disk so it's available the next time MPF boots.
             expire_secs: Optional number of seconds you'd like this variable
-                to persist on disk for. When MPF boots, if the expiration time
-                of the variable is in the past, it will be loaded with a value
-                of 0. For example, this lets you write the number of credits on
+                to persist for. If the expiration time of the variable passes
+                (at runtime or while MPF is not running), it will be set to 0.
+                For example, this lets you write the number of credits on
                 the machine to disk to persist even during power off, but you
                 could set it so that those only stay persisted for an hour.
         """
-        if name not in self.machine_vars:
-            var = CaseInsensitiveDict()
-
-            var['value'] = None
-            var['persist'] = persist
-            var['expire_secs'] = expire_secs
-            self.machine_vars[name] = var
-        else:
-            self.machine_vars[name]['persist'] = persist
-            self.machine_vars[name]['expire_sec'] = expire_secs
+        self.variables.configure(name, persist, expire_secs)
 
     def set_machine_var(self, name: str, value: Any) -> None:
         """Set the value of a machine variable.
@@ -810,53 +842,23 @@ class MachineController(LogMixin):
             name: String name of the variable you're setting the value for.
             value: The value you're setting. This can be any Type.
         """
-        if name not in self.machine_vars:
-            self.configure_machine_var(name=name, persist=False)
-            prev_value = None
-            change = True
-        else:
-            prev_value = self.machine_vars[name]['value']
-            try:
-                change = value - prev_value
-            except TypeError:
-                change = prev_value != value
-
-        # set value
-        self.machine_vars[name]['value'] = value
-
-        if change:
-            self._write_machine_var_to_disk(name)
-
-            self.debug_log("Setting machine_var '%s' to: %s, (prior: %s, "
-                           "change: %s)", name, value, prev_value,
-                           change)
-            self.events.post('machine_var_' + name,
-                             value=value,
-                             prev_value=prev_value,
-                             change=change)
-            '''event: machine_var_(name)
+        self.variables.set(name, value)
 
-            desc: Posted when a machine variable is added or changes value.
-            (Machine variables are like player variables, except they're
-            maintained machine-wide instead of per-player or per-game.)
+    def subscribe_machine_var(self, name: str, callback: Callable[..., None]) -> None:
+        """Call a callback when a machine variable changes.
 
-            args:
+        This is cheaper than a handler for machine_var_(name) because the
+        event is not posted when nobody listens to it.
 
-            value: The new value of this machine variable.
-
-            prev_value: The previous value of this machine variable, e.g. what
-            it was before the current value.
-
-            change: If the machine variable just changed, this will be the
-            amount of the change. If it's not possible to determine a numeric
-            change (for example, if this machine variable is a list), then this
-            *change* value will be set to the boolean *True*.
-            '''
+        Args:
+            name: String name of the variable.
+            callback: Called with name, value, prev_value and change.
+        """
+        self.variables.subscribe(name, callback)
 
-            if self.machine_var_monitor:
-                for callback in self.monitors['machine_vars']:
-                    callback(name=name, value=value,
-                             prev_value=prev_value, change=change)
+    def unsubscribe_machine_var(self, name: str, callback: Callable[..., None]) -> None:
+        """Remove a callback added with subscribe_machine_var."""
+        self.variables.unsubscribe(name, callback)
 
     def remove_machine_var(self, name: str) -> None:
         """Remove a machine variable by name.
@@ -866,11 +868,7 @@ class MachineController(LogMixin):
         Args:
             name: String name of the variable you want to remove.
         """
-        try:
-            del self.machine_vars[name]
-            self.machine_var_data_manager.remove_key(name)
-        except KeyError:
-            pass
+        self.variables.remove(name)
 
     def remove_machine_var_search(self, startswith: str='', endswith: str='') -> None:
         """Remove a machine variable by matching parts of its name.
@@ -882,10 +880,7 @@ class MachineController(LogMixin):
         For example, if you pass startswit='player' and endswith='score', this
         method will match and remove player1_score, player2_score, etc.
         """
-        for var in list(self.machine_vars.keys()):
-            if var.startswith(startswith) and var.endswith(endswith):
-                del self.machine_vars[var]
-                self.machine_var_data_manager.remove_key(var)
+        self.variables.remove_search(startswith, endswith)
 
     def get_platform_sections(self, platform_section: str, overwrite: str) -> "SmartVirtualHardwarePlatform":
         """Return platform section."""
@@ -0,0 +1,267 @@
+"""Contains the MachineVariables store."""
+import heapq
+
+from typing import Any, Callable, Dict, List, Set, Tuple, TYPE_CHECKING
+
+from mpf.core.case_insensitive_dict import CaseInsensitiveDict
+
+if TYPE_CHECKING:   # pragma: no cover
+    from mpf.core.machine import MachineController
+    from mpf.core.data_manager import DataManager
+
+
+class MachineVariables(object):
+
+    """Stores machine variables and notifies subscribers about changes.
+
+    The machine_var_(name) event is only posted when a handler is registered
+    for it (or events are monitored). Callbacks which are only interested in
+    one variable can subscribe to it and will not be called for others.
+
+    Persisted variables are written to the data manager in batches once per
+    loop iteration. Variables with expire_secs are kept in a min-heap by
+    expiration time and are reset to 0 when they expire at runtime.
+    """
+
+    def __init__(self, machine: "MachineController") -> None:
+        """Initialise machine variables."""
+        self.machine = machine
+        self.machine_vars = CaseInsensitiveDict()
+        self.data_manager = None    # type: DataManager
+        self._subscribers = dict()  # type: Dict[str, List[Callable[..., None]]]
+        self._dirty = set()         # type: Set[str]
+        self._flush_scheduled = False
+        self._expire_heap = []      # type: List[Tuple[float, str]]
+        self._queued_expires = dict()   # type: Dict[str, float]
+        self._expire_handle = None
+
+    def load(self, data_manager: "DataManager") -> None:
+        """Load persisted variables from a data manager."""
+        self.data_manager = data_manager
+        current_time = self.machine.clock.get_time()
+
+        for name, settings in iter(data_manager.get_data().items()):
+            if not isinstance(settings, dict) or "value" not in settings:
+                continue
+
+            expire = settings.get('expire')
+            if expire and expire < current_time:
+                settings['value'] = 0
+                expire = None
+
+            self.set(name, settings['value'])
+            if expire:
+                self.machine_vars[name]['expire'] = expire
+                self._add_expiration(name, expire)
+
+    def subscribe(self, name: str, callback: Callable[..., None]) -> None:
+        """Call callback when a variable changes.
+
+        The callback is called with name, value, prev_value and change.
+        """
+        self._subscribers.setdefault(name.lower(), []).append(callback)
+
+    def unsubscribe(self, name: str, callback: Callable[..., None]) -> None:
+        """Remove a subscription."""
+        try:
+            self._subscribers[name.lower()].remove(callback)
+        except (KeyError, ValueError):
+            return
+
+        if not self._subscribers[name.lower()]:
+            del self._subscribers[name.lower()]
+
+    def configure(self, name: str, persist: bool, expire_secs: int=None) -> None:
+        """Create or reconfigure a variable."""
+        if name not in self.machine_vars:
+            var = CaseInsensitiveDict()
+
+            var['value'] = None
+            var['persist'] = persist
+            var['expire_secs'] = expire_secs
+            var['expire'] = None
+            self.machine_vars[name] = var
+        else:
+            self.machine_vars[name]['persist'] = persist
+            self.machine_vars[name]['expire_secs'] = expire_secs
+
+    def get(self, name: str) -> Any:
+        """Return the value of a variable or None if it does not exist."""
+        try:
+            return self.machine_vars[name]['value']
+        except KeyError:
+            return None
+
+    def __contains__(self, name: str) -> bool:
+        """Return true if variable exists."""
+        return name in self.machine_vars
+
+    @staticmethod
+    def _get_change(value, prev_value):
+        try:
+            return value - prev_value
+        except TypeError:
+            return prev_value != value
+
+    def set(self, name: str, value: Any) -> None:
+        """Set the value of a variable."""
+        var = self.machine_vars.get(name)
+        if var is None:
+            self.configure(name=name, persist=False)
+            var = self.machine_vars[name]
+        elif var['value'] == value:
+            var['value'] = value
+            return
+
+        prev_value = var['value']
+        var['value'] = value
+
+        if var['expire_secs']:
+            var['expire'] = self.machine.clock.get_time() + var['expire_secs']
+            self._add_expiration(name, var['expire'])
+
+        if var['persist'] and self.machine.config['mpf']['save_machine_vars_to_disk']:
+            self._mark_dirty(name)
+
+        event = 'machine_var_' + name
+        subscribers = self._subscribers.get(name.lower())
+        post_event = (self.machine.events.is_event_monitored(event.lower()) or
+                      self.machine.events.does_event_exist(event))
+        if not (post_event or subscribers or self.machine.machine_var_monitor):
+            return
+
+        change = True if prev_value is None else self._get_change(value, prev_value)
+        self.machine.debug_log("Setting machine_var '%s' to: %s, (prior: %s, "
+                               "change: %s)", name, value, prev_value,
+                               change)
+
+        if post_event:
+            self.machine.events.post(event,
+                                     value=value,
+                                     prev_value=prev_value,
+                                     change=change)
+            '''event: machine_var_(name)
+
+            desc: Posted when a machine variable is added or changes value.
+            (Machine variables are like player variables, except they're
+            maintained machine-wide instead of per-player or per-game.)
+
+            args:
+
+            value: The new value of this machine variable.
+
+            prev_value: The previous value of this machine variable, e.g. what
+            it was before the current value.
+
+            change: If the machine variable just changed, this will be the
+            amount of the change. If it's not possible to determine a numeric
+            change (for example, if this machine variable is a list), then this
+            *change* value will be set to the boolean *True*.
+            '''
+
+        if subscribers:
+            for callback in subscribers[:]:
+                callback(name=name, value=value, prev_value=prev_value, change=change)
+
+        if self.machine.machine_var_monitor:
+            for callback in self.machine.monitors['machine_vars']:
+                callback(name=name, value=value,
+                         prev_value=prev_value, change=change)
+
+    def remove(self, name: str) -> None:
+        """Remove a variable and its persisted value."""
+        try:
+            del self.machine_vars[name]
+        except KeyError:
+            return
+
+        self._dirty.discard(name.lower())
+        if self.data_manager:
+            self.data_manager.remove_key(name)
+
+    def remove_search(self, startswith: str='', endswith: str='') -> None:
+        """Remove all variables which match start and end of the name."""
+        for var in list(self.machine_vars.keys()):
+            if var.startswith(startswith) and var.endswith(endswith):
+                self.remove(var)
+
+    def _mark_dirty(self, name: str) -> None:
+        """Write variable to disk in the next batch."""
+        self._dirty.add(name.lower())
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.machine.clock.loop.call_soon(self.flush)
+
+    def flush(self) -> None:
+        """Write all changed persisted variables to the data manager."""
+        self._flush_scheduled = False
+        if not self.data_manager:
+            return
+
+        for name in self._dirty:
+            var = self.machine_vars.get(name)
+            if not var or not var['persist']:
+                continue
+
+            disk_var = CaseInsensitiveDict()
+            disk_var['value'] = var['value']
+
+            if var['expire_secs']:
+                disk_var['expire'] = var['expire']
+
+            self.data_manager.save_key(name, disk_var)
+
+        self._dirty = set()
+
+    def _add_expiration(self, name: str, expire: float) -> None:
+        """Add expiration time to the heap and reschedule the timer if it expires first.
+
+        Every variable has one entry in the heap. A later expiration is pushed
+        when the earlier entry is popped.
+        """
+        name = name.lower()
+        queued = self._queued_expires.get(name)
+        if queued is not None and queued <= expire:
+            return
+
+        self._queued_expires[name] = expire
+        heapq.heappush(self._expire_heap, (expire, name))
+        if self._expire_heap[0] != (expire, name):
+            return
+
+        if self._expire_handle:
+            self.machine.clock.unschedule(self._expire_handle)
+        self._expire_handle = self.machine.clock.schedule_once(
+            self._expire_vars, max(0, expire - self.machine.clock.get_time()))
+
+    def _expire_vars(self) -> None:
+        """Reset all variables which expired."""
+        self._expire_handle = None
+        current_time = self.machine.clock.get_time()
+
+        while self._expire_heap and self._expire_heap[0][0] <= current_time:
+            expire, name = heapq.heappop(self._expire_heap)
+            if self._queued_expires.get(name) != expire:
+                # replaced by an earlier expiration
+                continue
+            del self._queued_expires[name]
+
+            var = self.machine_vars.get(name)
+            if not var or not var['expire']:
+                continue
+
+            if var['expire'] > current_time:
+                # var has been set again. queue its current expiration
+                self._queued_expires[name] = var['expire']
+                heapq.heappush(self._expire_heap, (var['expire'], name))
+                continue
+
+            var['expire'] = None
+            self.set(name, 0)
+
+        if self._expire_handle:
+            self.machine.clock.unschedule(self._expire_handle)
+            self._expire_handle = None
+        if self._expire_heap:
+            self._expire_handle = self.machine.clock.schedule_once(
+                self._expire_vars, max(0, self._expire_heap[0][0] - current_time))
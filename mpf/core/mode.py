@@ -118,7 +118,7 @@ class Mode(LogMixin):
     def _get_merged_settings(self, section_name: str) -> dict:
         """Return a dict of a config section from the machine-wide config with the mode-specific config merged in."""
         if section_name in self.machine.config:
-            return_dict = copy.deepcopy(self.machine.config[section_name])
+            return_dict = self.machine.config[section_name]
         else:
             return_dict = CaseInsensitiveDict()
 
@@ -127,7 +127,9 @@ class Mode(LogMixin):
                                           self.config[section_name],
                                           combine_lists=False)
 
-        return return_dict
+        # the result shares values with the machine and mode config but
+        # callers validate it in place. copy it once.
+        return copy.deepcopy(return_dict)
 
     @property
     def is_game_mode(self) -> bool:
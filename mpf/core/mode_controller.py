@@ -131,7 +131,8 @@ class ModeController(MpfController):
 
             if os.path.isfile(mpf_mode_config):
                 config = ConfigProcessor.load_config_file(mpf_mode_config,
-                                                          config_type='mode')
+                                                          config_type='mode',
+                                                          config_cache=self.machine.config_cache)
 
             self.debug_log("Loading config from %s", mpf_mode_config)
 
@@ -151,7 +152,8 @@ class ModeController(MpfController):
             if os.path.isfile(mode_config_file):
                 config = Util.dict_merge(config,
                                          ConfigProcessor.load_config_file(
-                                             mode_config_file, 'mode'))
+                                             mode_config_file, 'mode',
+                                             config_cache=self.machine.config_cache))
 
             self.debug_log("Loading config from %s", mode_config_file)
 
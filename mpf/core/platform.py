@@ -1,9 +1,9 @@
 """Contains the parent class for all platforms."""
 import abc
 import asyncio
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING, Callable, Any, Hashable, List
 
 if TYPE_CHECKING:   # pragma: no cover
     from mpf.devices.switch import Switch
@@ -17,6 +17,55 @@ if TYPE_CHECKING:   # pragma: no cover
     from mpf.platforms.interfaces.stepper_platform_interface import StepperPlatformInterface
 
 
+class OutputStage(object):
+
+    """Collects commands to outputs during one loop iteration.
+
+    Only the last command staged for an output is run. All staged commands are
+    run in one batch in the next loop iteration in the order they were last
+    staged.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, batch_done: Callable[[], None]=None) -> None:
+        """Initialise stage."""
+        self._loop = loop
+        self._batch_done = batch_done
+        self._staged = OrderedDict()
+        self._scheduled = False
+        self.stats = {"staged": 0, "coalesced": 0, "batches": 0}
+
+    def stage(self, key: Hashable, callback: Callable[..., Any], *args) -> None:
+        """Stage a command for output key and replace the previous one."""
+        self.stats["staged"] += 1
+        if key in self._staged:
+            self.stats["coalesced"] += 1
+            del self._staged[key]
+        self._staged[key] = (callback, args)
+
+        if not self._scheduled:
+            self._scheduled = True
+            self._loop.call_soon(self.flush)
+
+    def flush_key(self, key: Hashable) -> None:
+        """Run the staged command of an output now."""
+        if key in self._staged:
+            callback, args = self._staged.pop(key)
+            callback(*args)
+
+    def flush(self) -> None:
+        """Run all staged commands."""
+        self._scheduled = False
+        if not self._staged:
+            return
+        self.stats["batches"] += 1
+        while self._staged:
+            callback, args = self._staged.popitem(last=False)[1]
+            callback(*args)
+
+        if self._batch_done:
+            self._batch_done()
+
+
 class BasePlatform(metaclass=abc.ABCMeta):
 
     """Base class for all hardware platforms in MPF."""
@@ -31,6 +80,7 @@ class BasePlatform(metaclass=abc.ABCMeta):
         self.features = {}
         self.log = None         # type: Logger
         self.debug = False
+        self.output_stage = None    # type: OutputStage
 
         # Set default platform features. Each platform interface can change
         # these to notify the framework of the specific features it supports.
@@ -61,6 +111,61 @@ class BasePlatform(metaclass=abc.ABCMeta):
         """
         pass
 
+    def get_init_dependencies(self) -> List["BasePlatform"]:
+        """Return platforms which have to be initialised before this platform.
+
+        All other platforms are initialised concurrently.
+        """
+        return []
+
+    def get_cached_inventory(self, section: str, port: str) -> Optional[dict]:
+        """Return hardware found on a port during a previous boot.
+
+        Platforms should verify the inventory with a cheap check and fall
+        back to full discovery if it does not match.
+        """
+        return self.machine.get_hardware_inventory().get_data(section).get(port)
+
+    def save_inventory(self, section: str, port: str, inventory: dict) -> None:
+        """Store hardware found on a port for the next boot."""
+        data_manager = self.machine.get_hardware_inventory()
+        data = data_manager.get_data(section)
+        if data.get(port) == inventory:
+            return
+        data[port] = inventory
+        data_manager.save_key(section, data)
+
+    def stage_output(self, key: Hashable, callback: Callable[..., Any], *args) -> None:
+        """Run a command to an output.
+
+        When mpf:coalesce_outputs is enabled only the last command per output
+        key and loop iteration is run. Otherwise, callback is called
+        immediately. Use this for state changes such as enable, disable or
+        brightness. Pulses have to be sent immediately after flush_output.
+        """
+        if not self.machine.config['mpf'].get('coalesce_outputs', False):
+            callback(*args)
+            return
+
+        if not self.output_stage:
+            self.output_stage = OutputStage(self.machine.clock.loop, self.outputs_flushed)
+        self.output_stage.stage(key, callback, *args)
+
+    def flush_output(self, key: Hashable) -> None:
+        """Run the staged command of an output now.
+
+        Call this before ordering-sensitive commands to an output.
+        """
+        if self.output_stage:
+            self.output_stage.flush_key(key)
+
+    def outputs_flushed(self):
+        """Called after a batch of staged outputs has been sent.
+
+        Can be used to flush buffered hardware commands at once.
+        """
+        pass
+
     def tick(self):
         """Called once per machine loop.
 
@@ -30,6 +30,8 @@ class PlatformController(MpfController):
         if driver.platform != switch.platform:
             raise AssertionError("Switch and Coil have to use the same platform")
 
+        # rules have to be applied after pending commands to the driver
+        driver.platform.flush_output(driver.hw_driver)
         return driver.platform
 
     def _setup_switch_callback_for_psu(self, switch: Switch, driver: Driver, switch_settings: SwitchSettings,
@@ -256,6 +258,7 @@ class PlatformController(MpfController):
         Args:
             rule: Hardware rule to clean.
         """
+        rule.platform.flush_output(rule.driver_settings.hw_driver)
         for switch_settings in rule.switch_settings:
             rule.platform.clear_hw_rule(switch_settings, rule.driver_settings)
 
@@ -0,0 +1,203 @@
+"""Shared memory ring buffer for DMD frames."""
+import mmap
+import os
+import re
+import struct
+import tempfile
+
+from typing import Optional
+
+# magic, version, slot_count, slot_size, latest sequence number
+BUFFER_HEADER = struct.Struct("<4sIIIQ8x")
+LATEST_SEQ = struct.Struct("<Q")
+LATEST_SEQ_OFFSET = 16
+# sequence number and length of the frame in a slot
+SLOT_HEADER = struct.Struct("<QI4x")
+MAGIC = b'MPFB'
+VERSION = 1
+
+_VALID_NAME = re.compile(r'^[A-Za-z0-9_.-]+$')
+
+
+def get_shared_memory_path(name: str) -> str:
+    """Return the path of a named buffer.
+
+    Buffers are stored in /dev/shm if it exists and in the temp dir otherwise.
+    """
+    if not _VALID_NAME.match(name):
+        raise AssertionError("Invalid shared memory name {}".format(name))
+
+    if os.path.isdir("/dev/shm"):
+        return os.path.join("/dev/shm", name)
+
+    return os.path.join(tempfile.gettempdir(), name)
+
+
+class SharedFrameBuffer(object):
+
+    """A ring buffer of frames in a memory mapped file.
+
+    A producer (e.g. the media controller) writes frames into slots and
+    notifies MPF with a small BCP command. MPF only reads the latest complete
+    frame, so frames are dropped when the DMD is slower than the producer.
+
+    Every slot starts with the sequence number of its frame. The number is
+    cleared before the frame is written and set afterwards. A reader checks it
+    before and after copying the frame and ignores frames which have been
+    overwritten while reading.
+
+    The layout uses the struct module only (no multiprocessing.shared_memory)
+    so it works on every supported Python version and can be implemented by
+    producers in other languages.
+    """
+
+    def __init__(self, name: str, slot_count: int=0, slot_size: int=0) -> None:
+        """Open a buffer or create it if slot_count and slot_size are set.
+
+        Args:
+            name: Name of the buffer. See get_shared_memory_path().
+            slot_count: Number of frames in the ring. Only used to create the
+                buffer.
+            slot_size: Maximum size of one frame. Only used to create the
+                buffer.
+        """
+        self.name = name
+        self.path = get_shared_memory_path(name)
+        self._last_seq = 0
+
+        if slot_count and slot_size:
+            size = BUFFER_HEADER.size + slot_count * (SLOT_HEADER.size + slot_size)
+            # never resize a file which might be mapped by a reader. create a new one
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+            try:
+                os.ftruncate(fd, size)
+                self._map = mmap.mmap(fd, size)
+                self._file_id = self._get_file_id(os.fstat(fd))
+            finally:
+                os.close(fd)
+            BUFFER_HEADER.pack_into(self._map, 0, MAGIC, VERSION, slot_count, slot_size, 0)
+        else:
+            fd = os.open(self.path, os.O_RDONLY)
+            try:
+                self._map = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+                self._file_id = self._get_file_id(os.fstat(fd))
+            finally:
+                os.close(fd)
+
+        magic, version, self.slot_count, self.slot_size, _ = BUFFER_HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or not self.slot_count:
+            self._map.close()
+            raise AssertionError("{} is not a valid frame buffer".format(self.path))
+
+    @staticmethod
+    def _get_file_id(stat_result):
+        return stat_result.st_dev, stat_result.st_ino
+
+    def is_replaced(self) -> bool:
+        """Return true if the producer created a new buffer with the same name.
+
+        The mapping still points to the old (unlinked) file in that case.
+        """
+        try:
+            return self._get_file_id(os.stat(self.path)) != self._file_id
+        except FileNotFoundError:
+            # producer stopped. keep the old buffer until a new one exists
+            return False
+
+    def _slot_offset(self, seq: int) -> int:
+        return BUFFER_HEADER.size + (seq % self.slot_count) * (SLOT_HEADER.size + self.slot_size)
+
+    def write_frame(self, data: bytes) -> int:
+        """Write a frame to the next slot and return its sequence number."""
+        if len(data) > self.slot_size:
+            raise AssertionError("Frame with {} bytes does not fit into slots of {} bytes".format(
+                len(data), self.slot_size))
+
+        seq = LATEST_SEQ.unpack_from(self._map, LATEST_SEQ_OFFSET)[0] + 1
+        offset = self._slot_offset(seq)
+        SLOT_HEADER.pack_into(self._map, offset, 0, 0)
+        start = offset + SLOT_HEADER.size
+        self._map[start:start + len(data)] = data
+        SLOT_HEADER.pack_into(self._map, offset, seq, len(data))
+        LATEST_SEQ.pack_into(self._map, LATEST_SEQ_OFFSET, seq)
+        return seq
+
+    def read_latest(self) -> Optional[bytes]:
+        """Return the latest frame or None if there is no new complete frame."""
+        seq = LATEST_SEQ.unpack_from(self._map, LATEST_SEQ_OFFSET)[0]
+        if seq == self._last_seq:
+            return None
+
+        offset = self._slot_offset(seq)
+        slot_seq, length = SLOT_HEADER.unpack_from(self._map, offset)
+        if slot_seq != seq or length > self.slot_size:
+            # slot is being overwritten
+            return None
+
+        start = offset + SLOT_HEADER.size
+        data = self._map[start:start + length]
+
+        if SLOT_HEADER.unpack_from(self._map, offset)[0] != seq:
+            # overwritten while we copied it
+            return None
+
+        self._last_seq = seq
+        return data
+
+    def close(self) -> None:
+        """Unmap the buffer."""
+        self._map.close()
+
+    def unlink(self) -> None:
+        """Close the buffer and remove it."""
+        self.close()
+        os.unlink(self.path)
+
+
+class SharedFrameReader(object):
+
+    """Reads frames from a shared buffer after BCP notifications.
+
+    Notifications are coalesced. Only the latest frame is passed to the
+    callback once per loop iteration.
+    """
+
+    def __init__(self, loop, callback) -> None:
+        """Initialise reader."""
+        self._loop = loop
+        self._callback = callback
+        self._buffer = None     # type: SharedFrameBuffer
+        self._scheduled = False
+        self.dropped_frames = 0
+
+    def notify(self, name: str) -> None:
+        """Handle notification about a new frame in buffer name.
+
+        The buffer is reopened when the name changes or when the producer
+        restarted and recreated the buffer.
+        """
+        if not self._buffer or self._buffer.name != name or self._buffer.is_replaced():
+            if self._buffer:
+                self._buffer.close()
+            self._buffer = SharedFrameBuffer(name)
+
+        if self._scheduled:
+            self.dropped_frames += 1
+            return
+
+        self._scheduled = True
+        self._loop.call_soon(self._read)
+
+    def _read(self) -> None:
+        self._scheduled = False
+        frame = self._buffer.read_latest()
+        if frame is not None:
+            self._callback(frame)
+
+    def close(self) -> None:
+        """Close the buffer."""
+        if self._buffer:
+            self._buffer.close()
+            self._buffer = None
@@ -0,0 +1,115 @@
+"""Contains the StartupProfiler which times the boot phases of MPF."""
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from typing import Any, Dict, List
+
+from mpf._version import __version__
+
+
+class StartupProfiler(object):
+
+    """Records how long each phase of the MPF boot takes.
+
+    Timings are collected as a tree of named sections. Sections which are
+    opened while another section is open become children of that section.
+    This way a report shows init phases, the event handlers which ran in each
+    phase and the device collections, platforms or plugins created by those
+    handlers.
+
+    When the profiler is disabled all sections are no-ops.
+    """
+
+    def __init__(self, enabled: bool=False) -> None:
+        """Initialise startup profiler.
+
+        Args:
+            enabled: Whether timings should be recorded.
+        """
+        self.enabled = enabled
+        self._start_time = time.perf_counter()
+        self._end_time = None   # type: float
+        self._root = {"name": "startup", "children": []}    # type: Dict[str, Any]
+        self._stack = [self._root]                          # type: List[Dict[str, Any]]
+
+    @contextmanager
+    def section(self, name: str):
+        """Time a section of the boot process.
+
+        Args:
+            name: Name of the section in the report.
+
+        Example:
+
+        .. code::
+
+            with self.machine.startup_profiler.section("load_plugins"):
+                self._load_plugins()
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        entry = {"name": name,
+                 "start": start - self._start_time,
+                 "duration": None,
+                 "children": []}
+        self._stack[-1]["children"].append(entry)
+        self._stack.append(entry)
+        try:
+            yield
+        finally:
+            entry["duration"] = time.perf_counter() - start
+            # sections in coroutines may not be closed in LIFO order
+            self._stack.remove(entry)
+
+    def add_section(self, name: str, start: float, duration: float) -> None:
+        """Add a finished section to the currently open section.
+
+        Use this for work which runs concurrently and cannot be timed with
+        nested sections.
+
+        Args:
+            name: Name of the section in the report.
+            start: Start time from time.perf_counter().
+            duration: Duration in seconds.
+        """
+        if not self.enabled:
+            return
+
+        self._stack[-1]["children"].append({"name": name,
+                                            "start": start - self._start_time,
+                                            "duration": duration,
+                                            "children": []})
+
+    def finish(self) -> None:
+        """Mark the end of the boot process and stop recording."""
+        if self._end_time is None:
+            self._end_time = time.perf_counter()
+        self.enabled = False
+
+    def get_report(self) -> Dict[str, Any]:
+        """Return the recorded timings as a dict of simple types."""
+        end_time = self._end_time if self._end_time is not None else time.perf_counter()
+        return {
+            "mpf_version": __version__,
+            "created": time.time(),
+            "total": end_time - self._start_time,
+            "phases": self._root["children"],
+        }
+
+    def write_report(self, filename: str) -> None:
+        """Write the recorded timings to a JSON file.
+
+        Args:
+            filename: Full path of the file to write.
+        """
+        directory = os.path.dirname(filename)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(filename, 'w', encoding='utf8') as output_file:
+            json.dump(self.get_report(), output_file, indent=2, sort_keys=True)
@@ -1,5 +1,5 @@
 """Contains the Util class which includes many utility functions."""
-from copy import deepcopy
+from copy import copy
 import re
 from functools import reduce
 
@@ -200,6 +200,11 @@ class Util(object):
         This code was based on this:
         https://www.xormedia.com/recursively-merge-dictionaries-in-python/
 
+        Neither dictionary is modified. Only dicts along the paths which are
+        changed by `b` are copied. All other values are shared between the
+        result and `a` or `b`. Callers which modify nested values of the result
+        in place have to own `a` and `b` or copy the result.
+
         Args:
             a (dict): The first dictionary
             b (dict): The second dictionary
@@ -211,14 +216,12 @@ class Util(object):
             The merged dictionaries.
 
         """
-        # log.info("Dict Merge incoming A %s", a)
-        # log.info("Dict Merge incoming B %s", b)
         if not isinstance(b, dict):
             return b
-        result = deepcopy(a)
+        result = copy(a)
         for k, v in b.items():
             if isinstance(v, dict) and '_overwrite' in v:
-                result[k] = v
+                result[k] = copy(v)
                 del result[k]['_overwrite']
             elif isinstance(v, dict) and '_delete' in v:
                 if k in result:
@@ -229,12 +232,13 @@ class Util(object):
                 if v[0] == dict(_overwrite=True):
                     result[k] = v[1:]
                 elif combine_lists:
+                    # do not extend the list in place. it may be shared
+                    result[k] = list(result[k])
                     result[k].extend(v)
                 else:
-                    result[k] = deepcopy(v)
+                    result[k] = v
             else:
-                result[k] = deepcopy(v)
-        # log.info("Dict Merge result: %s", result)
+                result[k] = v
         return result
 
     @staticmethod
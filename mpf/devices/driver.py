@@ -183,8 +183,8 @@ class Driver(SystemWideDevice):
         self.time_when_done = -1
         self.time_last_changed = self.machine.clock.get_time()
         self.debug_log("Enabling Driver")
-        self.hw_driver.enable(PulseSettings(power=pulse_power, duration=pulse_ms),
-                              HoldSettings(power=hold_power))
+        self.platform.stage_output(self.hw_driver, self.hw_driver.enable,
+                                   PulseSettings(power=pulse_power, duration=pulse_ms), HoldSettings(power=hold_power))
         # inform bcp clients
         self.machine.bcp.interface.send_driver_event(action="enable", name=self.name, number=self.config['number'],
                                                      pulse_ms=pulse_ms, pulse_power=pulse_power, hold_power=hold_power)
@@ -197,7 +197,7 @@ class Driver(SystemWideDevice):
         self.time_last_changed = self.machine.clock.get_time()
         self.time_when_done = self.time_last_changed
         self.machine.delay.remove(name='{}_timed_enable'.format(self.name))
-        self.hw_driver.disable()
+        self.platform.stage_output(self.hw_driver, self.hw_driver.disable)
         # inform bcp clients
         self.machine.bcp.interface.send_driver_event(action="disable", name=self.name, number=self.config['number'])
 
@@ -211,6 +211,8 @@ class Driver(SystemWideDevice):
 
     def _pulse_now(self, pulse_ms: int, pulse_power: float) -> None:
         """Pulse this driver now."""
+        # pulses are not coalesced. send pending enable/disable first
+        self.platform.flush_output(self.hw_driver)
         if 0 < pulse_ms <= self.platform.features['max_pulse']:
             self.debug_log("Pulsing Driver. %sms (%s pulse_power)", pulse_ms, pulse_power)
             self.hw_driver.pulse(PulseSettings(power=pulse_power, duration=pulse_ms))
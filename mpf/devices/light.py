@@ -3,6 +3,7 @@ import asyncio
 from functools import partial
 from operator import itemgetter
 
+from typing import Dict
 from typing import Set
 from typing import Tuple
 
@@ -44,6 +45,7 @@ class Light(SystemWideDevice):
         """Initialise light."""
         self.hw_drivers = {}
         self.platforms = set()      # type: Set[LightsPlatform]
+        self.hw_driver_platforms = {}   # type: Dict[str, LightsPlatform]
         super().__init__(machine, name)
         self.machine.light_controller.initialise_light_subsystem()
 
@@ -162,9 +164,9 @@ class Light(SystemWideDevice):
 
         for color, channel in channels.items():
             channel = self.machine.config_validator.validate_config("light_channels", channel)
-            self.hw_drivers[color] = self._load_hw_driver(channel)
+            self.hw_drivers[color] = self._load_hw_driver(color, channel)
 
-    def _load_hw_driver(self, channel):
+    def _load_hw_driver(self, color, channel):
         """Load one channel."""
         if channel['platform'] == "drivers":
             return DriverLight(self.machine.coils[channel['number'].strip()], self.machine.clock.loop,
@@ -172,6 +174,7 @@ class Light(SystemWideDevice):
         else:
             platform = self.machine.get_platform_sections('lights', channel['platform'])
             self.platforms.add(platform)
+            self.hw_driver_platforms[color] = platform
             return platform.configure_light(channel['number'], channel['subtype'], channel['platform_settings'])
 
     def _initialize(self):
@@ -333,10 +336,15 @@ class Light(SystemWideDevice):
 
     def _schedule_update(self):
         for color, hw_driver in self.hw_drivers.items():
-            hw_driver.set_fade(partial(self._get_brightness_and_fade, color=color))
+            callback = partial(self._get_brightness_and_fade, color=color)
+            if color in self.hw_driver_platforms:
+                self.hw_driver_platforms[color].stage_output(hw_driver, hw_driver.set_fade, callback)
+            else:
+                # lights on drivers are staged by the driver
+                hw_driver.set_fade(callback)
 
         for platform in self.platforms:
-            platform.light_sync()
+            platform.stage_output("light_sync", platform.light_sync)
 
     def clear_stack(self):
         """Remove all entries from the stack and resets this light to 'off'."""
@@ -1,6 +1,7 @@
 """Support for physical RGB DMDs."""
 from mpf.core.machine import MachineController
 from mpf.core.platform import RgbDmdPlatform
+from mpf.core.shared_frame_buffer import SharedFrameReader
 
 from mpf.core.system_wide_device import SystemWideDevice
 
@@ -27,23 +28,52 @@ class RgbDmd(SystemWideDevice):
     def __init__(self, machine, name):
         """Initialise DMD."""
         self.hw_device = None
+        self.frame_reader = None    # type: SharedFrameReader
         self.platform = None        # type: RgbDmdPlatform
         super().__init__(machine, name)
 
     def _initialize(self):
         self.platform = self.machine.get_platform_sections("rgb_dmd", self.config['platform'])
         self.hw_device = self.platform.configure_rgb_dmd(self.name)
+        self.machine.events.add_handler('shutdown', self._close_frame_reader)
+
+    def _close_frame_reader(self, **kwargs):
+        """Unmap the shared frame buffer."""
+        del kwargs
+        if self.frame_reader:
+            self.frame_reader.close()
+            self.frame_reader = None
 
     @classmethod
-    def _bcp_receive_dmd_frame(cls, client, name, rawbytes, **kwargs):
-        """Update dmd from BCP."""
+    def _bcp_receive_dmd_frame(cls, client, name, rawbytes=None, shm_name=None, **kwargs):
+        """Update dmd from BCP.
+
+        The frame is either sent as rawbytes or written to the shared frame
+        buffer shm_name by a local client.
+        """
         del client
         del kwargs
 
         if name not in cls.machine.rgb_dmds:
             raise TypeError("rgb dmd {} not known".format(name))
 
-        cls.machine.rgb_dmds[name].update(rawbytes)
+        if shm_name:
+            cls.machine.rgb_dmds[name].update_from_shared_memory(shm_name)
+        elif rawbytes is not None:
+            cls.machine.rgb_dmds[name].update(rawbytes)
+        else:
+            raise TypeError("Frame for dmd {} has neither rawbytes nor shm_name".format(name))
+
+    def update_from_shared_memory(self, shm_name: str):
+        """Show the latest frame from a shared frame buffer.
+
+        Args:
+            shm_name: Name of the SharedFrameBuffer
+        """
+        if not self.frame_reader:
+            self.frame_reader = SharedFrameReader(self.machine.clock.loop, self.update)
+
+        self.frame_reader.notify(shm_name)
 
     def update(self, data: bytes):
         """Update data on the dmd.
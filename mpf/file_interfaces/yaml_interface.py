@@ -15,11 +15,14 @@ from ruamel.yaml.scanner import Scanner
 from ruamel.yaml.parser_ import Parser
 from ruamel.yaml.composer import Composer
 from ruamel.yaml.constructor import Constructor, ConstructorError
+try:
+    from ruamel.yaml.cyaml import CParser
+except ImportError:     # pragma: no cover
+    CParser = None
 from typing import Any, Iterable
 from typing import Dict
 
 from mpf.core.file_manager import FileInterface, FileManager
-from mpf.core.utility_functions import Util
 from mpf._version import __version__, __config_version__
 
 log = logging.getLogger('YAML Interface')
@@ -108,11 +111,38 @@ MpfResolver.add_implicit_resolver(
 
 class MpfConstructor(Constructor):
 
-    """Constructor with fix."""
+    """Constructor with fix.
+
+    If lower_keys is set the constructor produces the same result as
+    Util.keys_to_lower() on the output of the default constructor without
+    walking the tree a second time. Like keys_to_lower() only mappings which
+    can be reached from the root through other mappings (or through lists at
+    the root) are lowercased.
+    """
+
+    lower_keys = False
 
     def __init__(self):
         """Initialise."""
         super().__init__()
+        # mapping and sequence nodes which get their keys lowercased
+        self.lower_key_nodes = set()
+
+    def construct_document(self, node):
+        """Construct document and lowercase keys starting from the root."""
+        if self.lower_keys:
+            self.lower_key_nodes.add(node)
+        data = super().construct_document(node)
+        self.lower_key_nodes = set()
+        return data
+
+    def construct_sequence(self, node, deep=False):
+        """Construct sequence and mark child nodes for lowercasing if this is a list at the root."""
+        if node in self.lower_key_nodes:
+            for child_node in node.value:
+                if isinstance(child_node, (yaml.MappingNode, yaml.SequenceNode)):
+                    self.lower_key_nodes.add(child_node)
+        return super().construct_sequence(node, deep=deep)
 
     def construct_mapping(self, node, deep=False):
         """Construct mapping but raise error when a section is defined twice.
@@ -122,7 +152,9 @@ class MpfConstructor(Constructor):
         if not isinstance(node, yaml.MappingNode):  # pragma: no cover
             raise ConstructorError(problem="expected a mapping node, but found %s" % node.id,
                                    problem_mark=node.start_mark)
+        lower_keys = node in self.lower_key_nodes
         mapping = {}
+        keys = set()
         for key_node, value_node in node.value:
             # keys can be list -> deep
             key = self.construct_object(key_node, deep=True)
@@ -135,11 +167,17 @@ class MpfConstructor(Constructor):
                     "while constructing a mapping", node.start_mark,
                     "found unhashable key", key_node.start_mark)
 
+            if lower_keys and isinstance(value_node, yaml.MappingNode):
+                self.lower_key_nodes.add(value_node)
+
             value = self.construct_object(value_node, deep=deep)
             # next two lines differ from original
-            if key in mapping:
+            if key in keys:
                 raise KeyError("Key \"{}\" was defined multiple times in config {}".
                                format(key, key_node.start_mark))
+            keys.add(key)
+            if lower_keys:
+                key = str(key).lower()
             mapping[key] = value
         return mapping
 
@@ -158,6 +196,35 @@ class MpfLoader(Reader, Scanner, Parser, Composer, MpfConstructor, MpfResolver):
         MpfResolver.__init__(self)
 
 
+class MpfLowerCaseLoader(MpfLoader):
+
+    """Config loader which lowercases keys during construction."""
+
+    lower_keys = True
+
+
+if CParser:
+    class MpfCLoader(CParser, MpfConstructor, MpfResolver):
+
+        """Config loader which uses the libyaml parser and lowercases keys during construction.
+
+        libyaml scans and parses the file. Scalars are still resolved by
+        MpfResolver so the result is the same as with MpfLowerCaseLoader.
+        """
+
+        lower_keys = True
+
+        def __init__(self, stream):
+            """Initialise loader."""
+            CParser.__init__(self, stream)
+            MpfConstructor.__init__(self)
+            MpfResolver.__init__(self)
+
+    MpfFastLoader = MpfCLoader
+else:   # pragma: no cover
+    MpfFastLoader = MpfLowerCaseLoader
+
+
 for ch in list(u'yYnNoO'):
     del Resolver.yaml_implicit_resolvers[ch]
 
@@ -288,8 +355,28 @@ class YamlInterface(FileInterface):
 
     @staticmethod
     def process(data_string: Iterable[str]) -> dict:
-        """Parse yaml from a string."""
-        return Util.keys_to_lower(yaml.load(data_string, Loader=MpfLoader))
+        """Parse yaml from a string.
+
+        Uses the libyaml parser if available. The result is the same as
+        Util.keys_to_lower(yaml.load(data_string, Loader=MpfLoader)).
+        """
+        return YamlInterface._process_root(yaml.load(data_string, Loader=MpfFastLoader))
+
+    @staticmethod
+    def _process_root(data):
+        """Apply the rules of Util.keys_to_lower() to the root of a document.
+
+        Keys of mappings have already been lowercased during construction.
+        """
+        if not data:
+            return dict()
+        elif isinstance(data, dict):
+            return data
+        elif isinstance(data, list):
+            for num, item in enumerate(data):
+                data[num] = YamlInterface._process_root(item)
+            return data
+        return None
 
     def save(self, filename: str, data: dict) -> None:   # pragma: no cover
         """Save config to yaml file."""
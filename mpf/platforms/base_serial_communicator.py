@@ -1,6 +1,9 @@
 """Base class for serial communicator."""
 import asyncio
 
+from mpf.platforms.serial_capture import capture_streams
+from mpf.platforms.serial_framing import BufferedSerialReader, DEFAULT_READ_SIZE
+
 
 class BaseSerialCommunicator(object):
 
@@ -21,8 +24,9 @@ class BaseSerialCommunicator(object):
         self.debug = self.platform.config['debug']
         self.port = port
         self.baud = baud
-        self.reader = None  # type: asyncio.StreamReader
+        self.reader = None  # type: BufferedSerialReader
         self.writer = None  # type: asyncio.StreamWriter
+        self.read_size = self.platform.config.get('serial_read_size', DEFAULT_READ_SIZE)
 
     @asyncio.coroutine
     def connect(self):
@@ -35,7 +39,11 @@ class BaseSerialCommunicator(object):
 
         connector = self.machine.clock.open_serial_connection(
             url=port, baudrate=baud, limit=0)
-        self.reader, self.writer = yield from connector
+        reader, self.writer = yield from connector
+        if self.platform.config.get('serial_capture'):
+            reader, self.writer = capture_streams(self.machine, self.platform.config['serial_capture'], port,
+                                                  reader, self.writer)
+        self.reader = BufferedSerialReader(reader, self.read_size)
 
         # read everything which is sitting in the serial
         self.writer.transport.serial.reset_input_buffer()
@@ -61,13 +69,7 @@ class BaseSerialCommunicator(object):
             separator: Read until this separator byte.
             min_chars: Minimum message length before separator
         """
-        # asyncio StreamReader only supports this from python 3.5.2 on
-        buffer = b''
-        while True:
-            char = yield from self.reader.readexactly(1)
-            buffer += char
-            if char == separator and len(buffer) > min_chars:
-                return buffer
+        return (yield from self.reader.readuntil(separator, min_chars))
 
     @asyncio.coroutine
     def _identify_connection(self):
@@ -103,7 +105,7 @@ class BaseSerialCommunicator(object):
     def _socket_reader(self):
         while True:
             try:
-                resp = yield from self.reader.read(100)
+                resp = yield from self.reader.read(self.read_size)
             # pylint: disable-msg=broad-except
             except asyncio.CancelledError:
                 raise
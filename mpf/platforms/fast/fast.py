@@ -159,11 +159,11 @@ class FastHardwarePlatform(ServoPlatform, LightsPlatform, DmdPlatform,
         This process will cause the connection threads to figure out which processor they've connected to
         and to register themselves.
         """
-        for port in self.config['ports']:
-            comm = FastSerialCommunicator(platform=self, port=port,
-                                          baud=self.config['baud'])
-            yield from comm.connect()
-            self.serial_connections.add(comm)
+        connections = [FastSerialCommunicator(platform=self, port=port, baud=self.config['baud'])
+                       for port in self.config['ports']]
+        # identify all ports at the same time
+        yield from asyncio.gather(*[comm.connect() for comm in connections], loop=self.machine.clock.loop)
+        self.serial_connections.update(connections)
 
     def register_processor_connection(self, name: str, communicator):
         """Register processor.
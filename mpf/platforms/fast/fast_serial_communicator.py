@@ -1,8 +1,10 @@
 """Fast serial communicator."""
 import asyncio
+from collections import Counter, deque
 from distutils.version import StrictVersion
 
 from mpf.platforms.base_serial_communicator import BaseSerialCommunicator
+from mpf.platforms.serial_framing import FrameBuffer
 
 # Minimum firmware versions needed for this module
 from mpf.platforms.fast.fast_io_board import FastIoBoard
@@ -17,6 +19,13 @@ IO_MIN_FW = '0.87'
 # RGB_LATEST_FW = '0.88'
 # IO_LATEST_FW = '0.89'
 
+# a queued command is replaced by a later command to the same address
+SUPERSEDED_COMMANDS = ('L1:', 'GI:')
+
+# responses which do not start with the prefix of their command
+RESPONSE_PREFIXES = {'RS': 'RX',
+                     'RE': '!S'}
+
 
 class FastSerialCommunicator(BaseSerialCommunicator):
 
@@ -55,21 +64,29 @@ class FastSerialCommunicator(BaseSerialCommunicator):
         self.remote_firmware = 0.0
         self.max_messages_in_flight = 10
         self.messages_in_flight = 0
-        self.ignored_messages_in_flight = {b'-N', b'/N', b'/L', b'-L'}
+        # response prefixes of commands in flight. responses with other
+        # prefixes (e.g. switch changes) do not free the window
+        self._in_flight = Counter()     # type: Counter
+        self._in_flight_order = deque()
+        self._blocked_handle = None
 
-        self.send_ready = asyncio.Event(loop=platform.machine.clock.loop)
-        self.send_ready.set()
-        self.write_task = None
+        self.received_msg = FrameBuffer()
 
-        self.received_msg = b''
-
-        self.send_queue = asyncio.Queue(loop=platform.machine.clock.loop)
+        # (address, msg). msg of superseded commands is in _pending_commands
+        self.send_queue = deque()
+        self._pending_commands = {}
+        self._send_scheduled = False
+        self._send_enabled = False
+        self.superseded_messages = 0
 
         super().__init__(platform, port, baud)
 
     def stop(self):
         """Stop and shut down this serial connection."""
-        self.write_task.cancel()
+        self._send_enabled = False
+        if self._blocked_handle:
+            self.machine.clock.unschedule(self._blocked_handle)
+            self._blocked_handle = None
         super().stop()
 
     @asyncio.coroutine
@@ -167,47 +184,76 @@ class FastSerialCommunicator(BaseSerialCommunicator):
                                  format(self.remote_processor, min_version, self.remote_firmware))
 
         if self.remote_processor == 'NET' and self.platform.machine_type == 'fast':
-            yield from self.query_fast_io_boards()
+            yield from self.query_fast_io_boards(msg)
 
         self.platform.register_processor_connection(self.remote_processor, self)
 
-        self.write_task = self.machine.clock.loop.create_task(self._socket_writer())
-        self.write_task.add_done_callback(self._done)
+        self._send_enabled = True
+        self._schedule_send()
+
+    @asyncio.coroutine
+    def _read_response(self, prefix):
+        """Wait for a response with prefix."""
+        msg = ''
+        while not msg.startswith(prefix):
+            msg = (yield from self.readuntil(b'\r')).decode()
+            if not msg.startswith(prefix):
+                self.platform.debug_log("Got unexpected message from FAST: {}".format(msg))
+        return msg
 
     @asyncio.coroutine
-    def query_fast_io_boards(self):
+    def query_fast_io_boards(self, id_msg=None):
         """Query the NET processor to see if any FAST IO boards are connected.
 
         If so, queries the IO boards to log them and make sure they're the  proper firmware version.
+
+        Boards found during the last boot are queried at once. If the boards
+        do not match the cache the query continues board by board.
         """
         self.writer.write('SA:\r'.encode())
-        msg = ''
-        while not msg.startswith('SA:'):
-            msg = (yield from self.readuntil(b'\r')).decode()
-            if not msg.startswith('SA:'):
-                self.platform.debug_log("Got unexpected message from FAST: {}".format(msg))
-
+        msg = yield from self._read_response('SA:')
         self.platform.process_received_message(msg)
         self.platform.debug_log('Querying FAST IO boards...')
 
+        cached_boards = []
+        if self.platform.config['cache_inventory'] and id_msg:
+            inventory = self.platform.get_cached_inventory("fast", self.port)
+            if inventory and inventory.get("id") == id_msg:
+                cached_boards = inventory["io_boards"]
+
+        board_msgs = []
+        board_id = 0
+        done = False
+        while not done and board_id < 128:
+            if board_msgs == cached_boards[:board_id]:
+                # query the remaining cached boards and the first missing board in one batch
+                batch_size = max(1, min(len(cached_boards) + 1 - board_id, self.max_messages_in_flight))
+            else:
+                batch_size = 1
+            batch = range(board_id, min(board_id + batch_size, 128))
+            self.writer.write("".join('NN:{0}\r'.format(node) for node in batch).encode())
+            for _ in batch:
+                msg = yield from self._read_response('NN:')
+                # Iterate as many boards as possible
+                if not len(msg.split(',')[1].strip('\x00')):
+                    done = True
+                elif not done:
+                    board_msgs.append(msg)
+            board_id += len(batch)
+
+        if self.platform.config['cache_inventory'] and id_msg:
+            if cached_boards and cached_boards != board_msgs:
+                self.platform.log.info("FAST IO boards changed since the last boot.")
+            self.platform.save_inventory("fast", self.port, {"id": id_msg, "io_boards": board_msgs})
+
         firmware_ok = True
 
-        for board_id in range(128):
-            self.writer.write('NN:{0}\r'.format(board_id).encode())
-            msg = ''
-            while not msg.startswith('NN:'):
-                msg = (yield from self.readuntil(b'\r')).decode()
-                if not msg.startswith('NN:'):
-                    self.platform.debug_log("Got unexpected message from FAST: {}".format(msg))
+        for msg in board_msgs:
             node_id, model, fw, dr, sw, _, _, _, _, _, _ = msg.split(',')
             node_id = node_id[3:]
 
             model = model.strip('\x00')
 
-            # Iterate as many boards as possible
-            if not len(model):
-                break
-
             self.platform.register_io_board(FastIoBoard(int(node_id, 16), model, fw, int(sw, 16), int(dr, 16)))
 
             self.platform.debug_log('Fast IO Board {0}: Model: {1}, '
@@ -229,74 +275,120 @@ class FastSerialCommunicator(BaseSerialCommunicator):
     def send(self, msg):
         """Send a message to the remote processor over the serial connection.
 
+        Messages are queued and all queued messages are written together once
+        per loop iteration as long as the window of messages in flight allows
+        it. Light commands replace queued commands to the same address.
+
         Args:
             msg: String of the message you want to send. THe <CR> character will
                 be added automatically.
 
         """
-        self.send_queue.put_nowait(msg)
+        address = None
+        if not self.dmd and msg[:3] in SUPERSEDED_COMMANDS:
+            address = msg[:msg.find(',')]
+            if address in self._pending_commands:
+                self._pending_commands[address] = msg
+                self.superseded_messages += 1
+                return
+            self._pending_commands[address] = msg
+
+        self.send_queue.append((address, msg))
+        self._schedule_send()
+
+    def _schedule_send(self):
+        if self._send_scheduled or not self._send_enabled:
+            return
+        self._send_scheduled = True
+        self.machine.clock.loop.call_soon(self._send_queued)
+
+    def _send_queued(self):
+        """Write as many queued messages as the window allows."""
+        self._send_scheduled = False
+        if not self._send_enabled:
+            return
 
-    def _send(self, msg):
-        debug = self.platform.config['debug']
         if self.dmd:
-            self.writer.write(b'BM:' + msg)
-            if debug:
-                self.platform.log.debug("Send: %s", "".join(" 0x%02x" % b for b in msg))
+            while self.send_queue:
+                self._send(self.send_queue.popleft()[1])
+            return
 
-        else:
+        debug = self.platform.config['debug']
+        messages = []
+        while self.send_queue and self.messages_in_flight < self.max_messages_in_flight:
+            address, msg = self.send_queue.popleft()
+            if address is not None:
+                msg = self._pending_commands.pop(address)
+
+            prefix = RESPONSE_PREFIXES.get(msg[:2], msg[:2])
+            self._in_flight[prefix] += 1
+            self._in_flight_order.append(prefix)
             self.messages_in_flight += 1
-            if self.messages_in_flight > self.max_messages_in_flight:
-                self.send_ready.clear()
-
-                self.log.debug("Enabling Flow Control for %s connection. "
-                               "Messages in flight: %s, Max setting: %s",
-                               self.remote_processor,
-                               self.messages_in_flight,
-                               self.max_messages_in_flight)
-
-            self.writer.write(msg.encode() + b'\r')
+            messages.append(msg)
             if debug and msg[0:2] != "WD":
                 self.platform.log.debug("Send: %s", msg)
 
-    @asyncio.coroutine
-    def _socket_writer(self):
-        while True:
-            msg = yield from self.send_queue.get()
-            try:
-                yield from asyncio.wait_for(self.send_ready.wait(), 1.0, loop=self.machine.clock.loop)
-            except asyncio.TimeoutError:
-                self.log.warning("Port %s was blocked for more than 1s. Reseting send queue! If this happens "
-                                 "frequently report a bug!", self.port)
-                self.messages_in_flight = 0
+        if messages:
+            messages.append('')
+            self.writer.write('\r'.join(messages).encode())
+
+        if self.send_queue and not self._blocked_handle:
+            self.log.debug("Enabling Flow Control for %s connection. "
+                           "Messages in flight: %s, Max setting: %s",
+                           self.remote_processor,
+                           self.messages_in_flight,
+                           self.max_messages_in_flight)
+            self._blocked_handle = self.machine.clock.schedule_once(self._window_blocked, 1.0)
+
+    def _window_blocked(self):
+        self._blocked_handle = None
+        self.log.warning("Port %s was blocked for more than 1s. Reseting send queue! If this happens "
+                         "frequently report a bug!", self.port)
+        self._in_flight.clear()
+        self._in_flight_order.clear()
+        self.messages_in_flight = 0
+        self._schedule_send()
+
+    def _send(self, msg):
+        self.writer.write(b'BM:' + msg)
+        if self.platform.config['debug']:
+            self.platform.log.debug("Send: %s", "".join(" 0x%02x" % b for b in msg))
+
+    def _response_received(self, prefix):
+        """Free the window for the command of a response."""
+        if self._in_flight[prefix]:
+            self._in_flight[prefix] -= 1
+            self._in_flight_order.remove(prefix)
+        elif prefix == 'XX' and self._in_flight_order:
+            # error response for the oldest command
+            self._in_flight[self._in_flight_order.popleft()] -= 1
+        else:
+            # not a response to one of our commands
+            return
 
-            self._send(msg)
+        self.messages_in_flight -= 1
+        if self._blocked_handle:
+            self.machine.clock.unschedule(self._blocked_handle)
+            self._blocked_handle = None
+        if self.send_queue:
+            self._schedule_send()
 
     def _parse_msg(self, msg):
-        self.received_msg += msg
+        self.received_msg.feed(msg)
 
         while True:
-            pos = self.received_msg.find(b'\r')
+            msg = self.received_msg.next_delimited(b'\r')
 
             # no more complete messages
-            if pos == -1:
+            if msg is None:
                 break
 
-            msg = self.received_msg[:pos]
-            self.received_msg = self.received_msg[pos + 1:]
-
-            if msg[:2] not in self.ignored_messages_in_flight:
-
-                self.messages_in_flight -= 1
-                if self.messages_in_flight <= self.max_messages_in_flight:
-                    self.send_ready.set()
-                if self.messages_in_flight < 0:
-                    self.log.warning("Port %s received more messages than "
-                                     "were sent! Resetting!",
-                                     self.remote_processor)
-                    self.messages_in_flight = 0
+            msg = msg[:-1].decode()
 
             if not msg:
                 continue
 
-            if msg.decode() not in self.ignored_messages:
-                self.platform.process_received_message(msg.decode())
+            self._response_received(msg[:2])
+
+            if msg not in self.ignored_messages:
+                self.platform.process_received_message(msg)
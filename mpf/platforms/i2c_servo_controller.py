@@ -25,6 +25,10 @@ class I2CServoControllerHardwarePlatform(ServoPlatform):
         """Return string representation."""
         return '<Platform.I2C_Servo_Controller_Platform>'
 
+    def get_init_dependencies(self):
+        """Initialise the i2c platform first."""
+        return [self.machine.get_platform_sections("i2c", self.config.get('platform'))]
+
     @asyncio.coroutine
     def initialize(self):
         """Method is called after all hardware platforms were instantiated."""
@@ -1,6 +1,6 @@
 """LISY platform for System 1 and System 80."""
 import asyncio
-from typing import Generator, Dict
+from typing import Generator, Dict, Any
 
 from mpf.platforms.interfaces.driver_platform_interface import DriverPlatformInterface, PulseSettings, HoldSettings
 from mpf.platforms.interfaces.hardware_sound_platform_interface import HardwareSoundPlatformInterface
@@ -11,12 +11,17 @@ from mpf.platforms.interfaces.switch_platform_interface import SwitchPlatformInt
 from mpf.core.logging import LogMixin
 
 from mpf.platforms.lisy.defines import LisyDefines
+from mpf.platforms.serial_capture import capture_streams
+from mpf.platforms.serial_framing import BufferedSerialReader
 
 from mpf.platforms.interfaces.light_platform_interface import LightPlatformSoftwareFade
 
 from mpf.core.platform import SwitchPlatform, LightsPlatform, DriverPlatform, SwitchSettings, DriverSettings, \
     DriverConfig, SwitchConfig, SegmentDisplayPlatform, HardwareSoundPlatform
 
+# factor to increase the poll interval while no switch changes
+POLL_BACKOFF = 2
+
 
 class LisySwitch(SwitchPlatformInterface):
 
@@ -123,7 +128,7 @@ class LisyHardwarePlatform(SwitchPlatform, LightsPlatform, DriverPlatform, Segme
         super().__init__(machine)
         self.config = None
         self._writer = None                 # type: asyncio.StreamWriter
-        self._reader = None                 # type: asyncio.StreamReader
+        self._reader = None                 # type: BufferedSerialReader
         self._poll_task = None
         self._watchdog_task = None
         self._number_of_lamps = None
@@ -131,6 +136,7 @@ class LisyHardwarePlatform(SwitchPlatform, LightsPlatform, DriverPlatform, Segme
         self._number_of_displays = None
         self._inputs = dict()               # type: Dict[str, bool]
         self._system_type = None
+        self.poll_stats = {}                # type: Dict[str, Any]
         self.features['max_pulse'] = 255
 
     @asyncio.coroutine
@@ -148,7 +154,13 @@ class LisyHardwarePlatform(SwitchPlatform, LightsPlatform, DriverPlatform, Segme
             self.log.info("Connecting to %s:%s", self.config['network_host'], self.config['network_port'])
             connector = self.machine.clock.open_connection(self.config['network_host'], self.config['network_port'])
 
-        self._reader, self._writer = yield from connector
+        reader, self._writer = yield from connector
+        if self.config['serial_capture']:
+            port = self.config['port'] if self.config['connection'] == "serial" else \
+                "{}:{}".format(self.config['network_host'], self.config['network_port'])
+            reader, self._writer = capture_streams(self.machine, self.config['serial_capture'], port,
+                                                   reader, self._writer)
+        self._reader = BufferedSerialReader(reader, self.config['serial_read_size'])
 
         # reset platform
         self.debug_log("Sending reset.")
@@ -247,13 +259,38 @@ class LisyHardwarePlatform(SwitchPlatform, LightsPlatform, DriverPlatform, Segme
 
     @asyncio.coroutine
     def _poll(self):
+        """Poll changed switches.
+
+        All pending changes are read without delay. While no switch changes
+        the poll interval doubles up to max_poll_latency and it is reset to
+        poll_hz on the next change.
+        """
+        min_interval = 1 / self.config['poll_hz']
+        max_interval = max(min_interval, self.config['max_poll_latency'] / 1000)
+        interval = min_interval
+        self.poll_stats = {"polls": 0, "changes": 0, "poll_hz": self.config['poll_hz'], "achieved_poll_hz": 0.0}
+        window_start = self.machine.clock.get_time()
+        window_polls = 0
         while True:
             self.send_byte(LisyDefines.SwitchesGetChangedSwitches)
             status = yield from self.read_byte()
+            self.poll_stats['polls'] += 1
+            window_polls += 1
+            now = self.machine.clock.get_time()
+            if now - window_start >= 1:
+                self.poll_stats['achieved_poll_hz'] = window_polls / (now - window_start)
+                window_start = now
+                window_polls = 0
+
             if status == 127:
-                # no changes. sleep 1ms
-                yield from asyncio.sleep(.001, loop=self.machine.clock.loop)
+                # no changes. back off
+                yield from asyncio.sleep(interval, loop=self.machine.clock.loop)
+                interval = min(interval * POLL_BACKOFF, max_interval)
+                self.poll_stats['poll_hz'] = 1 / interval
             else:
+                interval = min_interval
+                self.poll_stats['poll_hz'] = self.config['poll_hz']
+                self.poll_stats['changes'] += 1
                 # bit 7 is state
                 switch_state = 1 if status & 0b10000000 else 0
                 # bits 0-6 are the switch number
@@ -389,13 +426,7 @@ class LisyHardwarePlatform(SwitchPlatform, LightsPlatform, DriverPlatform, Segme
             separator: Read until this separator byte.
             min_chars: Minimum message length before separator
         """
-        # asyncio StreamReader only supports this from python 3.5.2 on
-        buffer = b''
-        while True:
-            char = yield from self._reader.readexactly(1)
-            buffer += char
-            if char == separator and len(buffer) > min_chars:
-                return buffer
+        return (yield from self._reader.readuntil(separator, min_chars))
 
     @asyncio.coroutine
     def read_string(self) -> Generator[int, None, bytes]:
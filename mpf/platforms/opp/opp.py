@@ -6,9 +6,11 @@ boards.
 """
 import logging
 import asyncio
+from binascii import hexlify, unhexlify
 
 from typing import TYPE_CHECKING
 from mpf.platforms.base_serial_communicator import BaseSerialCommunicator
+from mpf.platforms.serial_framing import FrameBuffer
 
 from mpf.platforms.opp.opp_coil import OPPSolenoidCard
 from mpf.platforms.opp.opp_incand import OPPIncandCard
@@ -19,7 +21,7 @@ from mpf.core.platform import SwitchPlatform, DriverPlatform, LightsPlatform, Sw
     DriverConfig, SwitchConfig
 
 if TYPE_CHECKING:   # pragma: no cover
-    from typing import Dict, List, Set
+    from typing import Any, Dict, List, Set
     from mpf.platforms.opp.opp_coil import OPPSolenoid
     from mpf.platforms.opp.opp_incand import OPPIncand
     from mpf.platforms.opp.opp_neopixel import OPPNeopixel
@@ -29,6 +31,11 @@ if TYPE_CHECKING:   # pragma: no cover
 MIN_FW = 0x00000100
 BAD_FW_VERSION = 0x01020304
 
+# seconds to wait for all input responses of a poll
+POLL_TIMEOUT = .1
+# factor by which the poll interval grows after a poll without changes
+POLL_BACKOFF = 1.1
+
 
 # pylint: disable-msg=too-many-instance-attributes
 class OppHardwarePlatform(LightsPlatform, SwitchPlatform, DriverPlatform):
@@ -69,7 +76,10 @@ class OppHardwarePlatform(LightsPlatform, SwitchPlatform, DriverPlatform):
         self.gen2AddrArr = {}               # type: Dict[str, List[int]]
         self.badCRC = 0
         self.minVersion = 0xffffffff
-        self._poll_task = None              # type: asyncio.Task
+        self._poll_tasks = {}               # type: Dict[str, asyncio.Task]
+        self._poll_pending = {}             # type: Dict[str, int]
+        self._poll_done = {}                # type: Dict[str, asyncio.Event]
+        self.poll_stats = {}                # type: Dict[str, Dict[str, Any]]
 
         self.features['tickless'] = True
 
@@ -100,13 +110,21 @@ class OppHardwarePlatform(LightsPlatform, SwitchPlatform, DriverPlatform):
         """Initialise connections to OPP hardware."""
         yield from self._connect_to_hardware()
         self.opp_commands[ord(OppRs232Intf.READ_GEN2_INP_CMD)] = self.read_gen2_inp_resp
-        self._poll_task = self.machine.clock.loop.create_task(self._poll_sender())
-        self._poll_task.add_done_callback(self._done)
+        for chain_serial in self.read_input_msg:
+            cards = len([x for x in self.opp_inputs if x.chain_serial == chain_serial])
+            if not cards:
+                # nothing to poll
+                continue
+            self._poll_done[chain_serial] = asyncio.Event(loop=self.machine.clock.loop)
+            self._poll_tasks[chain_serial] = self.machine.clock.loop.create_task(
+                self._poll_sender(chain_serial, cards))
+            self._poll_tasks[chain_serial].add_done_callback(self._done)
 
     def stop(self):
         """Stop hardware and close connections."""
-        if self._poll_task:
-            self._poll_task.cancel()
+        for task in self._poll_tasks.values():
+            task.cancel()
+        self._poll_tasks = {}
 
         for connections in self.serial_connections:
             connections.stop()
@@ -155,10 +173,11 @@ class OppHardwarePlatform(LightsPlatform, SwitchPlatform, DriverPlatform):
         This process will cause the OPPSerialCommunicator to figure out which chains they've connected to
         and to register themselves.
         """
-        for port in self.config['ports']:
-            comm = OPPSerialCommunicator(platform=self, port=port, baud=self.config['baud'])
-            yield from comm.connect()
-            self.serial_connections.add(comm)
+        connections = [OPPSerialCommunicator(platform=self, port=port, baud=self.config['baud'])
+                       for port in self.config['ports']]
+        # identify all ports at the same time
+        yield from asyncio.gather(*[comm.connect() for comm in connections], loop=self.machine.clock.loop)
+        self.serial_connections.update(connections)
 
     def register_processor_connection(self, serial_number, communicator):
         """Register the processors to the platform.
@@ -399,6 +418,7 @@ class OppHardwarePlatform(LightsPlatform, SwitchPlatform, DriverPlatform):
         crc8 = OppRs232Intf.calc_crc8_part_msg(msg, 0, 6)
         if msg[6] != ord(crc8):
             self.badCRC += 1
+            self._get_poll_stats(chain_serial)['bad_crc'] += 1
             self.log.warning("Msg contains bad CRC:%s.", "".join(" 0x%02x" % b for b in msg))
         else:
             opp_inp = self.inpAddrDict[chain_serial + '-' + str(msg[0])]
@@ -418,6 +438,8 @@ class OppHardwarePlatform(LightsPlatform, SwitchPlatform, DriverPlatform):
         """
         # Single read gen2 input response.  Receive function breaks them down
 
+        self._input_response_received(chain_serial)
+
         # Verify the CRC8 is correct
         if len(msg) < 6:
             self.log.warning("Msg too shortC: %s.", "".join(" 0x%02x" % b for b in msg))
@@ -427,6 +449,7 @@ class OppHardwarePlatform(LightsPlatform, SwitchPlatform, DriverPlatform):
         crc8 = OppRs232Intf.calc_crc8_part_msg(msg, 0, 6)
         if msg[6] != ord(crc8):
             self.badCRC += 1
+            self._get_poll_stats(chain_serial)['bad_crc'] += 1
             self.log.warning("Msg contains bad CRC:%s.", "".join(" 0x%02x" % b for b in msg))
         else:
             opp_inp = self.inpAddrDict[chain_serial + '-' + str(msg[0])]
@@ -438,6 +461,7 @@ class OppHardwarePlatform(LightsPlatform, SwitchPlatform, DriverPlatform):
             # Update the state which holds inputs that are active
             changes = opp_inp.oldState ^ new_state
             if changes != 0:
+                self._get_poll_stats(chain_serial)['changes'] += 1
                 curr_bit = 1
                 for index in range(0, 32):
                     if (curr_bit & changes) != 0:
@@ -593,15 +617,63 @@ class OppHardwarePlatform(LightsPlatform, SwitchPlatform, DriverPlatform):
         """
         future.result()
 
+    def _get_poll_stats(self, chain_serial):
+        """Return poll statistics of a chain."""
+        if chain_serial not in self.poll_stats:
+            self.poll_stats[chain_serial] = {"polls": 0, "timeouts": 0, "changes": 0, "bad_crc": 0,
+                                             "round_trip": 0.0, "max_round_trip": 0.0,
+                                             "poll_hz": self.config['poll_hz']}
+        return self.poll_stats[chain_serial]
+
+    def _input_response_received(self, chain_serial):
+        """Count input responses and finish the poll when all cards answered."""
+        pending = self._poll_pending.get(chain_serial, 0)
+        if pending <= 0:
+            return
+        self._poll_pending[chain_serial] = pending - 1
+        if pending == 1:
+            self._poll_done[chain_serial].set()
+
     @asyncio.coroutine
-    def _poll_sender(self):
-        """Poll switches."""
+    def _poll_sender(self, chain_serial, cards):
+        """Poll switches of one chain.
+
+        Every chain is polled by its own task. The chain is polled at poll_hz
+        while inputs change and the rate backs off to min_poll_hz while they
+        are idle.
+        """
+        stats = self._get_poll_stats(chain_serial)
+        min_interval = 1 / self.config['poll_hz']
+        max_interval = 1 / min(self.config['min_poll_hz'], self.config['poll_hz'])
+        interval = min_interval
+        done = self._poll_done[chain_serial]
         while True:
-            for chain_serial in self.read_input_msg:
-                self.send_to_processor(chain_serial, self.read_input_msg[chain_serial])
-                yield from self.opp_connection[chain_serial].writer.drain()
-                # the line above saturates the link and seems to overhelm the hardware. limit it to 100Hz
-                yield from asyncio.sleep(1 / self.config['poll_hz'], loop=self.machine.clock.loop)
+            done.clear()
+            self._poll_pending[chain_serial] = cards
+            changes = stats['changes']
+            start = self.machine.clock.get_time()
+            self.send_to_processor(chain_serial, self.read_input_msg[chain_serial])
+            yield from self.opp_connection[chain_serial].writer.drain()
+            try:
+                yield from asyncio.wait_for(done.wait(), POLL_TIMEOUT, loop=self.machine.clock.loop)
+            except asyncio.TimeoutError:
+                stats['timeouts'] += 1
+                self._poll_pending[chain_serial] = 0
+            else:
+                round_trip = self.machine.clock.get_time() - start
+                stats['round_trip'] = round_trip
+                stats['max_round_trip'] = max(stats['max_round_trip'], round_trip)
+            stats['polls'] += 1
+
+            if stats['changes'] != changes:
+                interval = min_interval
+            else:
+                interval = min(interval * POLL_BACKOFF, max_interval)
+            stats['poll_hz'] = 1 / interval
+
+            # the hardware gets overwhelmed when polled without limit
+            yield from asyncio.sleep(max(0, interval - (self.machine.clock.get_time() - start)),
+                                     loop=self.machine.clock.loop)
 
     def _verify_coil_and_switch_fit(self, switch, coil):
         chain_serial, card, solenoid = coil.hw_driver.number.split('-')
@@ -737,7 +809,7 @@ class OPPSerialCommunicator(BaseSerialCommunicator):
     # pylint: disable=too-many-arguments
     def __init__(self, platform: OppHardwarePlatform, port, baud) -> None:
         """Initialise Serial Connection to OPP Hardware."""
-        self.partMsg = b""
+        self.partMsg = FrameBuffer()
         self.chain_serial = None    # type: str
         self._lost_synch = False
 
@@ -775,26 +847,50 @@ class OPPSerialCommunicator(BaseSerialCommunicator):
         msg.extend(OppRs232Intf.EOM_CMD)
         cmd = bytes(msg)
 
+        inventory = None
+        if self.platform.config['cache_inventory']:
+            inventory = self.platform.get_cached_inventory("opp", self.port)
+
+        if inventory:
+            # verify the cards of the last boot and query their config and versions in one round trip
+            cards = list(unhexlify(inventory["cards"]))
+            cmd += self._create_cmd_for_cards(OppRs232Intf.GET_GEN2_CFG, cards) + \
+                self._create_cmd_for_cards(OppRs232Intf.GET_GET_VERS_CMD, cards)
+
         self.log.debug("Sending inventory command: %s", "".join(" 0x%02x" % b for b in cmd))
         self.writer.write(cmd)
 
-        resp = yield from self.readuntil(b'\xff')
+        inv_resp = yield from self.readuntil(b'\xff')
 
         # resp will contain the inventory response.
-        self.platform.process_received_message(self.chain_serial, resp)
+        self.platform.process_received_message(self.chain_serial, inv_resp)
+        cards = self.platform.gen2AddrArr[self.chain_serial]
+
+        if inventory and inventory["cards"] == hexlify(bytes(cards)).decode():
+            cfg_resp = yield from self.readuntil(b'\xff', 6)
+            vers_resp = yield from self.readuntil(b'\xff', 6)
+        else:
+            if inventory:
+                # cards changed. drop responses for the cached cards
+                self.log.info("OPP cards on %s changed. Querying all cards.", self.port)
+                yield from asyncio.sleep(.1, loop=self.machine.clock.loop)
+                self.reader.clear()
+
+            # Now send get gen2 configuration message to find populated wing boards
+            self.send_get_gen2_cfg_cmd()
+            cfg_resp = yield from self.readuntil(b'\xff', 6)
 
-        # Now send get gen2 configuration message to find populated wing boards
-        self.send_get_gen2_cfg_cmd()
-        resp = yield from self.readuntil(b'\xff', 6)
+            # get the version of the firmware
+            self.send_vers_cmd()
+            vers_resp = yield from self.readuntil(b'\xff', 6)
 
         # resp will contain the gen2 cfg reponses.  That will end up creating all the
         # correct objects.
-        self.platform.process_received_message(self.chain_serial, resp)
+        self.platform.process_received_message(self.chain_serial, cfg_resp)
+        self.platform.process_received_message(self.chain_serial, vers_resp)
 
-        # get the version of the firmware
-        self.send_vers_cmd()
-        resp = yield from self.readuntil(b'\xff', 6)
-        self.platform.process_received_message(self.chain_serial, resp)
+        if self.platform.config['cache_inventory']:
+            self.platform.save_inventory("opp", self.port, {"cards": hexlify(bytes(cards)).decode()})
 
         # see if version of firmware is new enough
         if self.platform.minVersion < MIN_FW:
@@ -814,13 +910,14 @@ class OPPSerialCommunicator(BaseSerialCommunicator):
 
         self.platform.register_processor_connection(self.chain_serial, self)
 
-    def send_get_gen2_cfg_cmd(self):
-        """Send get gen2 configuration message to find populated wing boards."""
+    @staticmethod
+    def _create_cmd_for_cards(cmd, cards):
+        """Return cmd for all cards followed by EOM."""
         whole_msg = bytearray()
-        for card_addr in self.platform.gen2AddrArr[self.chain_serial]:
+        for card_addr in cards:
             msg = bytearray()
             msg.append(card_addr)
-            msg.extend(OppRs232Intf.GET_GEN2_CFG)
+            msg.extend(cmd)
             msg.append(0)
             msg.append(0)
             msg.append(0)
@@ -829,26 +926,17 @@ class OPPSerialCommunicator(BaseSerialCommunicator):
             whole_msg.extend(msg)
 
         whole_msg.extend(OppRs232Intf.EOM_CMD)
-        cmd = bytes(whole_msg)
+        return bytes(whole_msg)
+
+    def send_get_gen2_cfg_cmd(self):
+        """Send get gen2 configuration message to find populated wing boards."""
+        cmd = self._create_cmd_for_cards(OppRs232Intf.GET_GEN2_CFG, self.platform.gen2AddrArr[self.chain_serial])
         self.log.debug("Sending get Gen2 Cfg command: %s", "".join(" 0x%02x" % b for b in cmd))
         self.writer.write(cmd)
 
     def send_vers_cmd(self):
         """Send get firmware version message."""
-        whole_msg = bytearray()
-        for card_addr in self.platform.gen2AddrArr[self.chain_serial]:
-            msg = bytearray()
-            msg.append(card_addr)
-            msg.extend(OppRs232Intf.GET_GET_VERS_CMD)
-            msg.append(0)
-            msg.append(0)
-            msg.append(0)
-            msg.append(0)
-            msg.extend(OppRs232Intf.calc_crc8_whole_msg(msg))
-            whole_msg.extend(msg)
-
-        whole_msg.extend(OppRs232Intf.EOM_CMD)
-        cmd = bytes(whole_msg)
+        cmd = self._create_cmd_for_cards(OppRs232Intf.GET_GET_VERS_CMD, self.platform.gen2AddrArr[self.chain_serial])
         self.log.debug("Sending get version command: %s", "".join(" 0x%02x" % b for b in cmd))
         self.writer.write(cmd)
 
@@ -863,43 +951,36 @@ class OPPSerialCommunicator(BaseSerialCommunicator):
         self._lost_synch = True
 
     def _parse_msg(self, msg):
-        self.partMsg += msg
-        strlen = len(self.partMsg)
+        self.partMsg.feed(msg)
         messaged_found = 0
         # Split into individual responses
-        while strlen >= 7:
+        while len(self.partMsg) >= 7:
             if self._lost_synch:
-                while strlen > 0:
+                while len(self.partMsg) > 0:
                     # wait for next gen2 card message
-                    if (self.partMsg[0] & 0xe0) == 0x20:
+                    if (self.partMsg.peek() & 0xe0) == 0x20:
                         self._lost_synch = False
                         break
-                    self.partMsg = self.partMsg[1:]
-                    strlen -= 1
+                    self.partMsg.skip(1)
                 # continue because we could have less then 7 bytes in the buffer
                 continue
 
             # Check if this is a gen2 card address
-            if (self.partMsg[0] & 0xe0) == 0x20:
+            if (self.partMsg.peek() & 0xe0) == 0x20:
                 # Only command expect to receive back is
-                if self.partMsg[1] == ord(OppRs232Intf.READ_GEN2_INP_CMD):
-                    self.platform.process_received_message(self.chain_serial, self.partMsg[:7])
+                if self.partMsg.peek(1) == ord(OppRs232Intf.READ_GEN2_INP_CMD):
+                    self.platform.process_received_message(self.chain_serial, self.partMsg.next_fixed(7))
                     messaged_found += 1
-                    self.partMsg = self.partMsg[7:]
-                    strlen -= 7
                 else:
                     # Lost synch
-                    self.partMsg = self.partMsg[2:]
-                    strlen -= 2
+                    self.partMsg.skip(2)
                     self._lost_synch = True
 
-            elif self.partMsg[0] == ord(OppRs232Intf.EOM_CMD):
-                self.partMsg = self.partMsg[1:]
-                strlen -= 1
+            elif self.partMsg.peek() == ord(OppRs232Intf.EOM_CMD):
+                self.partMsg.skip(1)
             else:
                 # Lost synch
-                self.partMsg = self.partMsg[1:]
-                strlen -= 1
+                self.partMsg.skip(1)
                 self._lost_synch = True
 
         return messaged_found
@@ -4,7 +4,10 @@ import asyncio
 import logging
 import platform
 import sys
+import threading
 import time
+from collections import deque
+from functools import partial
 from typing import Any, List, Union, Callable, Tuple
 
 from mpf.platforms.p_roc_devices import PROCSwitch, PROCMatrixLight
@@ -66,10 +69,11 @@ class PROCBasePlatform(LightsPlatform, SwitchPlatform, DriverPlatform, metaclass
 
         self.machine_type = pinproc.normalize_machine_type(
             self.machine.config['hardware']['driverboards'])
+        self._io_thread = None      # type: PROCIoThread
 
     @asyncio.coroutine
     def initialize(self):
-        """Set machine vars."""
+        """Set machine vars and start the I/O thread."""
         self.machine.set_machine_var("p_roc_version", self.version)
         '''machine_var: p_roc_version
 
@@ -84,10 +88,44 @@ class PROCBasePlatform(LightsPlatform, SwitchPlatform, DriverPlatform, metaclass
         that's attached to MPF.
         '''
 
+        if self.machine.config['p_roc']['use_io_thread']:
+            self._io_thread = PROCIoThread(self.proc, self.machine.clock.loop, self.process_events,
+                                           1 / self.machine.config['mpf']['default_platform_hz'])
+            self._io_thread.start()
+            # all devices talk to the P-ROC through the thread from now on
+            self.proc = self._io_thread
+            self.features['tickless'] = True
+
     def stop(self):
         """Stop proc."""
+        if self._io_thread:
+            self._io_thread.stop()
+            self.proc = self._io_thread.proc
+            self._io_thread = None
         self.proc.reset(1)
 
+    def tick(self):
+        """Check the P-ROC/P3-ROC for any events (e.g. switch state changes).
+
+        Also tickles the watchdog and flushes any queued commands to the P-ROC/P3-ROC.
+        """
+        self.process_events(self.proc.get_events())
+        self.proc.watchdog_tickle()
+        self.proc.flush()
+
+    def outputs_flushed(self):
+        """Write the batch of staged outputs at once instead of waiting for the next tick.
+
+        The I/O thread already writes one batch per loop iteration.
+        """
+        if not self._io_thread:
+            self.proc.flush()
+
+    @abc.abstractmethod
+    def process_events(self, events):
+        """Process events from the P-ROC/P3-ROC."""
+        raise NotImplementedError()
+
     def connect(self):
         """Connect to the P-ROC.
 
@@ -332,6 +370,118 @@ class PROCBasePlatform(LightsPlatform, SwitchPlatform, DriverPlatform, metaclass
         return switch
 
 
+class PROCIoThread(object):
+
+    """Runs all I/O of a P-ROC/P3-ROC in a dedicated thread.
+
+    The thread polls events, tickles the watchdog and flushes commands without
+    blocking the loop. Events are passed to the loop in batches. Commands are
+    queued in the loop and handed to the thread as one batch per loop
+    iteration. Commands which return a value are executed immediately after
+    all commands queued before them.
+    """
+
+    SYNC_COMMANDS = ("read_data", "driver_get_state", "switch_get_states")
+
+    def __init__(self, proc, loop: asyncio.AbstractEventLoop, process_events: Callable[[list], None],
+                 interval: float) -> None:
+        """Initialise I/O thread.
+
+        Args:
+            proc: The pinproc.PinPROC device.
+            loop: Loop which will receive events.
+            process_events: Called in the loop with a list of events.
+            interval: Maximum time between two polls.
+        """
+        self.proc = proc
+        self._loop = loop
+        self._process_events = process_events
+        self._interval = interval
+        self._commands = deque()
+        self._batches = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._wakeup_scheduled = False
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="P-ROC I/O", daemon=True)
+        self.log = logging.getLogger('P-ROC I/O')
+
+    def __getattr__(self, item):
+        """Queue commands or run them in the loop if they return a value."""
+        if item in self.SYNC_COMMANDS:
+            return partial(self._run_command, item)
+        return partial(self._queue_command, item)
+
+    def start(self):
+        """Start thread."""
+        self._thread.start()
+
+    def stop(self):
+        """Write all pending commands and stop thread."""
+        self._wake_up()
+        self._stopped.set()
+        self._thread.join()
+
+    def _run_command(self, name, *args, **kwargs):
+        with self._lock:
+            # keep the order of commands queued before
+            if self._write_batches() + self._write_commands(self._commands):
+                self._commands = deque()
+                self.proc.flush()
+            return getattr(self.proc, name)(*args, **kwargs)
+
+    def _queue_command(self, name, *args, **kwargs):
+        self._commands.append((name, args, kwargs))
+        if not self._wakeup_scheduled:
+            self._wakeup_scheduled = True
+            self._loop.call_soon(self._wake_up)
+
+    def _wake_up(self):
+        self._wakeup_scheduled = False
+        if self._commands:
+            self._batches.append(self._commands)
+            self._commands = deque()
+        self._wakeup.set()
+
+    def _write_commands(self, commands) -> int:
+        for name, args, kwargs in commands:
+            getattr(self.proc, name)(*args, **kwargs)
+        return len(commands)
+
+    def _write_batches(self) -> int:
+        count = 0
+        while self._batches:
+            count += self._write_commands(self._batches.popleft())
+        return count
+
+    def _poll(self):
+        with self._lock:
+            self._write_batches()
+            events = self.proc.get_events()
+            self.proc.watchdog_tickle()
+            self.proc.flush()
+        return events
+
+    def _run(self):
+        try:
+            while not self._stopped.is_set():
+                self._wakeup.wait(self._interval)
+                self._wakeup.clear()
+                events = self._poll()
+                if events:
+                    self._loop.call_soon_threadsafe(self._process_events, events)
+
+            # do not lose commands on shutdown
+            self._poll()
+        except Exception as e:     # pragma: no cover
+            self.log.exception("P-ROC I/O failed")
+            self._loop.call_soon_threadsafe(self._raise, e)
+
+    @staticmethod
+    def _raise(exception):     # pragma: no cover
+        raise exception
+
+
 class PDBConfig(object):
 
     """Handles PDB Config of the P/P3-Roc.
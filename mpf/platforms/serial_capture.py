@@ -0,0 +1,134 @@
+"""Record serial traffic of hardware platforms."""
+import asyncio
+import os
+import re
+import struct
+from typing import Callable, Generator, Iterator, Tuple
+
+# magic and version at the start of a capture
+CAPTURE_HEADER = struct.Struct("<4sB")
+# seconds since start of the capture, direction and length of data
+RECORD_HEADER = struct.Struct("<dBI")
+MAGIC = b'MPSC'
+VERSION = 1
+
+RX = 0
+TX = 1
+
+CAPTURE_SUFFIX = ".mpfcap"
+
+
+def get_capture_filename(prefix: str, port: str) -> str:
+    """Return the capture file of a port."""
+    return prefix + re.sub(r'[^A-Za-z0-9]+', '_', str(port)).strip('_') + CAPTURE_SUFFIX
+
+
+def read_capture(filename: str) -> Iterator[Tuple[float, int, bytes]]:
+    """Yield timestamp, direction and data of all records in a capture."""
+    with open(filename, "rb") as f:
+        magic, version = CAPTURE_HEADER.unpack(f.read(CAPTURE_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise AssertionError("{} is not a serial capture".format(filename))
+
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                # end of file or incomplete record of an interrupted capture
+                return
+            timestamp, direction, length = RECORD_HEADER.unpack(header)
+            data = f.read(length)
+            if len(data) < length:
+                return
+            yield timestamp, direction, data
+
+
+class SerialCapture(object):
+
+    """Writes timestamped RX and TX bytes to a capture file."""
+
+    def __init__(self, filename: str, get_time: Callable[[], float]) -> None:
+        """Open capture file."""
+        self.filename = filename
+        self._get_time = get_time
+        self._start = get_time()
+        self._file = open(filename, "wb")
+        self._file.write(CAPTURE_HEADER.pack(MAGIC, VERSION))
+
+    def record(self, direction: int, data: bytes) -> None:
+        """Add a record."""
+        if not data or self._file.closed:
+            return
+        self._file.write(RECORD_HEADER.pack(self._get_time() - self._start, direction, len(data)))
+        self._file.write(data)
+
+    def close(self) -> None:
+        """Write remaining records and close the file."""
+        self._file.close()
+
+
+class CaptureStreamReader(object):
+
+    """Records all data read from a StreamReader."""
+
+    def __init__(self, reader: asyncio.StreamReader, capture: SerialCapture) -> None:
+        """Initialise reader."""
+        self._reader = reader
+        self._capture = capture
+
+    def __getattr__(self, item):
+        """Delegate everything else to the reader."""
+        return getattr(self._reader, item)
+
+    @asyncio.coroutine
+    def read(self, n: int=-1) -> Generator[int, None, bytes]:
+        """Read up to n bytes."""
+        data = yield from self._reader.read(n)
+        self._capture.record(RX, data)
+        return data
+
+    @asyncio.coroutine
+    def readexactly(self, n: int) -> Generator[int, None, bytes]:
+        """Read exactly n bytes."""
+        data = yield from self._reader.readexactly(n)
+        self._capture.record(RX, data)
+        return data
+
+
+class CaptureStreamWriter(object):
+
+    """Records all data written to a StreamWriter."""
+
+    def __init__(self, writer: asyncio.StreamWriter, capture: SerialCapture) -> None:
+        """Initialise writer."""
+        self._writer = writer
+        self._capture = capture
+
+    def __getattr__(self, item):
+        """Delegate everything else to the writer."""
+        return getattr(self._writer, item)
+
+    def write(self, data: bytes) -> None:
+        """Write data."""
+        self._capture.record(TX, data)
+        self._writer.write(data)
+
+    def close(self) -> None:
+        """Close capture and writer."""
+        self._capture.close()
+        self._writer.close()
+
+
+def capture_streams(machine, prefix: str, port: str, reader, writer):
+    """Return reader and writer which record all traffic of a port.
+
+    Args:
+        machine: The machine controller.
+        prefix: Path and file name prefix of the capture. Relative paths are
+            relative to the machine folder.
+        port: Serial port or host. Added to the file name.
+        reader: StreamReader of the connection.
+        writer: StreamWriter of the connection.
+    """
+    filename = get_capture_filename(os.path.join(machine.machine_path, prefix), port)
+    capture = SerialCapture(filename, machine.clock.get_time)
+    return CaptureStreamReader(reader, capture), CaptureStreamWriter(writer, capture)
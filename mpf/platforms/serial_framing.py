@@ -0,0 +1,177 @@
+"""Buffered framing for serial platforms."""
+import asyncio
+from typing import Generator, Optional
+
+DEFAULT_READ_SIZE = 4096
+DEFAULT_BUFFER_SIZE = 4096
+
+
+class FrameBuffer(object):
+
+    """Preallocated receive buffer which splits received bytes into frames.
+
+    Data is appended at the end and frames are consumed from the start by
+    moving a read position. Consumed bytes are only discarded when the buffer
+    is full, so extracting a frame never copies the rest of the buffer.
+    """
+
+    def __init__(self, size: int=DEFAULT_BUFFER_SIZE) -> None:
+        """Initialise buffer."""
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+        # position where the last unsuccessful search stopped
+        self._search_pos = 0
+        self._search_key = None
+
+    def __len__(self) -> int:
+        """Return number of unconsumed bytes."""
+        return self._end - self._start
+
+    def feed(self, data: bytes) -> None:
+        """Append received data."""
+        length = len(data)
+        if self._end + length > len(self._buffer):
+            self._make_room(length)
+
+        self._view[self._end:self._end + length] = data
+        self._end += length
+
+    def _make_room(self, length: int) -> None:
+        """Move unconsumed bytes to the front and grow the buffer if needed."""
+        remaining = self._end - self._start
+        if remaining + length > len(self._buffer):
+            new_buffer = bytearray(max(len(self._buffer) * 2, remaining + length))
+            new_buffer[:remaining] = self._view[self._start:self._end]
+            self._view.release()
+            self._buffer = new_buffer
+            self._view = memoryview(self._buffer)
+        else:
+            # copy first because source and destination may overlap
+            self._view[:remaining] = bytes(self._view[self._start:self._end])
+
+        self._search_pos -= self._start
+        self._start = 0
+        self._end = remaining
+
+    def peek(self, offset: int=0) -> int:
+        """Return the byte at offset without consuming it."""
+        if offset >= self._end - self._start:
+            raise IndexError("Not enough data in buffer")
+        return self._buffer[self._start + offset]
+
+    def skip(self, length: int) -> None:
+        """Discard length bytes."""
+        self._start = min(self._start + length, self._end)
+        if self._start == self._end:
+            self.clear()
+
+    def clear(self) -> None:
+        """Discard all data."""
+        self._start = 0
+        self._end = 0
+        self._search_key = None
+
+    def next_fixed(self, length: int) -> Optional[bytes]:
+        """Return the next frame of length bytes or None if it is incomplete."""
+        if self._end - self._start < length:
+            return None
+
+        frame = bytes(self._view[self._start:self._start + length])
+        self.skip(length)
+        return frame
+
+    def next_delimited(self, separator: bytes, min_chars: int=0) -> Optional[bytes]:
+        """Return the next frame including its separator or None if it is incomplete.
+
+        Args:
+            separator: Frames end with this byte.
+            min_chars: Minimum frame length before the separator. Separators
+                within the first min_chars bytes are part of the frame.
+        """
+        start = self._start + min_chars
+        if self._search_key == (separator, min_chars):
+            start = max(start, self._search_pos)
+
+        pos = self._buffer.find(separator, start, self._end)
+        if pos == -1:
+            # do not search the same bytes again when more data arrives
+            self._search_pos = max(self._end - len(separator) + 1, self._start)
+            self._search_key = (separator, min_chars)
+            return None
+
+        length = pos + len(separator) - self._start
+        frame = bytes(self._view[self._start:self._start + length])
+        self.skip(length)
+        self._search_key = None
+        return frame
+
+    def read_all(self) -> bytes:
+        """Return and consume all data."""
+        data = bytes(self._view[self._start:self._end])
+        self.clear()
+        return data
+
+
+class BufferedSerialReader(object):
+
+    """Reads frames from an asyncio StreamReader.
+
+    Reads up to read_size bytes at once into a FrameBuffer instead of reading
+    one byte per call. Bytes read ahead stay in the buffer for the next call.
+    All reads from the stream have to go through this reader afterwards.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, read_size: int=DEFAULT_READ_SIZE) -> None:
+        """Initialise reader."""
+        self.reader = reader
+        self.read_size = read_size
+        self.buffer = FrameBuffer(max(read_size, DEFAULT_BUFFER_SIZE))
+
+    @asyncio.coroutine
+    def _fill(self) -> Generator[int, None, None]:
+        """Read more data from the stream."""
+        data = yield from self.reader.read(self.read_size)
+        if not data:
+            raise asyncio.IncompleteReadError(self.buffer.read_all(), None)
+        self.buffer.feed(data)
+
+    @asyncio.coroutine
+    def read(self, length: int=-1) -> Generator[int, None, bytes]:
+        """Return buffered data or read up to length bytes from the stream."""
+        if not len(self.buffer):
+            return (yield from self.reader.read(length if length > 0 else self.read_size))
+
+        if length < 0 or length >= len(self.buffer):
+            return self.buffer.read_all()
+        return self.buffer.next_fixed(length)
+
+    @asyncio.coroutine
+    def readexactly(self, length: int) -> Generator[int, None, bytes]:
+        """Read exactly length bytes."""
+        while True:
+            frame = self.buffer.next_fixed(length)
+            if frame is not None:
+                return frame
+            yield from self._fill()
+
+    @asyncio.coroutine
+    def readuntil(self, separator: bytes, min_chars: int=0) -> Generator[int, None, bytes]:
+        """Read until separator.
+
+        Args:
+            separator: Read until this separator byte.
+            min_chars: Minimum message length before separator
+        """
+        while True:
+            frame = self.buffer.next_delimited(separator, min_chars)
+            if frame is not None:
+                return frame
+            yield from self._fill()
+
+    def clear(self) -> None:
+        """Discard all buffered data."""
+        self.buffer.clear()
+        # pylint: disable-msg=protected-access
+        self.reader._buffer.clear()
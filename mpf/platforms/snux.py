@@ -69,12 +69,19 @@ class SnuxHardwarePlatform(DriverPlatform):
     def initialize(self):
         """Automatically called by the Platform class after all the core modules are loaded."""
         # load coil platform
-        self.platform = self.machine.get_platform_sections(
-            "platform", getattr(self.machine.config['snux'], 'platform', None))
+        self.platform = self._get_coil_platform()
 
         # we have to wait for coils to be initialized
         self.machine.events.add_handler("init_phase_1", self._initialize)
 
+    def _get_coil_platform(self):
+        return self.machine.get_platform_sections(
+            "platform", getattr(self.machine.config['snux'], 'platform', None))
+
+    def get_init_dependencies(self):
+        """Initialise the coil platform first."""
+        return [self._get_coil_platform()]
+
     def _initialize(self, **kwargs):
         del kwargs
         self._validate_config()
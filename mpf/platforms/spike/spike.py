@@ -11,9 +11,18 @@ from mpf.platforms.interfaces.driver_platform_interface import DriverPlatformInt
 
 from mpf.platforms.interfaces.switch_platform_interface import SwitchPlatformInterface
 from mpf.platforms.spike.spike_defines import SpikeNodebus
+from mpf.platforms.serial_capture import capture_streams
+from mpf.platforms.serial_framing import BufferedSerialReader
 from mpf.core.platform import SwitchPlatform, DriverPlatform, LightsPlatform, SwitchSettings, DriverSettings, \
     DriverConfig, SwitchConfig
 
+# length of an input state response including checksum
+INPUT_STATE_LENGTH = 10
+# number of attempts to read a valid frame after a desync
+RESYNC_ATTEMPTS = 10
+# time without received data after which the line is considered quiet
+RESYNC_QUIET_TIME = .05
+
 
 class SpikeSwitch(SwitchPlatformInterface):
 
@@ -286,6 +295,8 @@ class SpikePlatform(SwitchPlatform, LightsPlatform, DriverPlatform):
         self._nodes = None
         self._bus_busy = asyncio.Lock(loop=self.machine.clock.loop)
         self._cmd_queue = asyncio.Queue(loop=self.machine.clock.loop)
+        self.poll_stats = {}
+        self.desyncs = 0
 
     @asyncio.coroutine
     def initialize(self):
@@ -318,21 +329,16 @@ class SpikePlatform(SwitchPlatform, LightsPlatform, DriverPlatform):
 
         connector = self.machine.clock.open_serial_connection(
             url=port, baudrate=baud, limit=0)
-        self._reader, self._writer = yield from connector
+        reader, self._writer = yield from connector
+        if self.config['serial_capture']:
+            reader, self._writer = capture_streams(self.machine, self.config['serial_capture'], port,
+                                                   reader, self._writer)
+        self._reader = BufferedSerialReader(reader, self.config['serial_read_size'])
 
         yield from self._initialize()
 
-    @asyncio.coroutine
-    def _update_switches(self, node):
-        if node not in self._nodes:     # pragma: no cover
-            self.log.warning("Cannot read node %s because it is not configured.", node)
-            return False
-
-        new_inputs_str = yield from self._read_inputs(node)
-        if not new_inputs_str:      # pragma: no cover
-            self.log.info("Node: %s did not return any inputs.", node)
-            return True
-
+    def _process_inputs(self, node, new_inputs_str):
+        """Process input state response of a node."""
         new_inputs = self._input_to_int(new_inputs_str)
 
         if self.debug:
@@ -354,16 +360,30 @@ class SpikePlatform(SwitchPlatform, LightsPlatform, DriverPlatform):
 
         self._inputs[node] = new_inputs
 
-        return True
-
     @asyncio.coroutine
     def _sender(self):
+        """Send queued commands.
+
+        Commands without response do not wait for the bus because they do not
+        produce any data which could be confused with a pending response.
+        Commands with a wait time stall the bridge and are sent while holding
+        the bus. All other queued commands are sent at once.
+        """
         while True:
             cmd, wait_ms = yield from self._cmd_queue.get()
-            with (yield from self._bus_busy):
-                yield from self._send_raw(cmd)
+            while True:
                 if wait_ms:
-                    yield from self._send_raw(bytearray([1, wait_ms]))
+                    yield from self._writer.drain()
+                    with (yield from self._bus_busy):
+                        self._write_raw(cmd)
+                        yield from self._send_raw(bytearray([1, wait_ms]))
+                else:
+                    self._write_raw(cmd)
+                if self._cmd_queue.empty():
+                    break
+                cmd, wait_ms = self._cmd_queue.get_nowait()
+
+            yield from self._writer.drain()
 
     @asyncio.coroutine
     def _send_key(self):
@@ -388,51 +408,119 @@ class SpikePlatform(SwitchPlatform, LightsPlatform, DriverPlatform):
     def _poll(self):
         while True:
             with (yield from self._bus_busy):
-                yield from self._send_raw(bytearray([0]))
+                idle = yield from self._poll_ready_nodes()
 
-                try:
-                    result = yield from asyncio.wait_for(self._read_raw(1), 0.5, loop=self.machine.clock.loop)
-                except asyncio.TimeoutError:    # pragma: no cover
-                    self.log.warning("Spike watchdog expired.")
-                    # clear buffer
-                    # pylint: disable-msg=protected-access
-                    self._reader._buffer = bytearray()
-                    continue
+            if idle:
+                # sleep only if spike is idle
+                yield from asyncio.sleep(1 / self.config['poll_hz'], loop=self.machine.clock.loop)
 
-            if not result:
-                self.log.warning("Empty poll result. Spike desynced.")
-                # give it a break of 50ms
-                yield from asyncio.sleep(.05, loop=self.machine.clock.loop)
-                # clear buffer
-                # pylint: disable-msg=protected-access
-                self._reader._buffer = bytearray()
-                continue
+    @asyncio.coroutine
+    def _poll_ready_nodes(self) -> Generator[int, None, bool]:
+        """Read inputs of all ready nodes in one burst.
+
+        The input request for a ready node is sent together with the next
+        poll so every ready node costs one round trip. Returns true if no node
+        was ready.
+        """
+        poll_time = self.machine.clock.get_time()
+        self._write_raw(bytearray([0]))
+        yield from self._writer.drain()
+
+        idle = True
+        while True:
+            try:
+                result = yield from asyncio.wait_for(self._read_raw(1), 0.5, loop=self.machine.clock.loop)
+            except asyncio.TimeoutError:    # pragma: no cover
+                self.log.warning("Spike watchdog expired.")
+                yield from self._resync()
+                return False
 
             ready_node = result[0]
+            if ready_node == 0:
+                return idle
 
-            if 0 < ready_node <= 0x0F or ready_node == 0xF0:
-                # valid node ids
-                if ready_node == 0xF0:
-                    # virtual cpu node returns 0xF0 instead of 0 to make it distinguishable
-                    ready_node = 0
-                result = yield from self._update_switches(ready_node)
-                if not result:
-                    self.log.warning("Spike desynced during input.")
-                    yield from asyncio.sleep(.05, loop=self.machine.clock.loop)
-                    # clear buffer
-                    # pylint: disable-msg=protected-access
-                    self._reader._buffer = bytearray()
-            elif ready_node > 0:    # pragma: no cover
+            if ready_node == 0xF0:
+                # virtual cpu node returns 0xF0 instead of 0 to make it distinguishable
+                ready_node = 0
+            elif ready_node > 0x0F or ready_node not in self._nodes:    # pragma: no cover
                 # invalid node ids
                 self.log.warning("Spike desynced.")
-                # give it a break of 50ms
-                yield from asyncio.sleep(.05, loop=self.machine.clock.loop)
-                # clear buffer
-                # pylint: disable-msg=protected-access
-                self._reader._buffer = bytearray()
-            else:
-                # sleep only if spike is idle
-                yield from asyncio.sleep(1 / self.config['poll_hz'], loop=self.machine.clock.loop)
+                yield from self._resync()
+                return False
+
+            idle = False
+            self._write_raw(self._create_cmd_str(ready_node, SpikeNodebus.GetInputState, bytearray(),
+                                                 INPUT_STATE_LENGTH))
+            self._write_raw(bytearray([0]))
+            next_poll_time = self.machine.clock.get_time()
+            yield from self._writer.drain()
+
+            try:
+                inputs = yield from asyncio.wait_for(self._read_raw(INPUT_STATE_LENGTH), 0.2,
+                                                     loop=self.machine.clock.loop)
+            except asyncio.TimeoutError:    # pragma: no cover
+                inputs = None
+
+            if not inputs or self._checksum(inputs) != 0:   # pragma: no cover
+                self.log.warning("Spike desynced during input.")
+                yield from self._resync()
+                return False
+
+            self._process_inputs(ready_node, inputs)
+            self._add_poll_latency(ready_node, self.machine.clock.get_time() - poll_time)
+            poll_time = next_poll_time
+
+    def _add_poll_latency(self, node, latency):
+        """Record time between poll and processed inputs of a node."""
+        if node not in self.poll_stats:
+            self.poll_stats[node] = {"polls": 0, "latency": 0.0, "max_latency": 0.0}
+        stats = self.poll_stats[node]
+        stats["polls"] += 1
+        stats["latency"] = latency
+        stats["max_latency"] = max(stats["max_latency"], latency)
+
+    @asyncio.coroutine
+    def _resync(self):
+        """Resynchronise with the bridge.
+
+        Waits until late responses to earlier requests have been received and
+        drops all received data. Then requests the inputs of the cpu node and
+        reads exactly one response. Responses with an invalid checksum are
+        rejected and the next attempt starts again.
+        """
+        self.desyncs += 1
+        for _ in range(RESYNC_ATTEMPTS):
+            yield from self._wait_for_quiet_line()
+            self._writer.transport.serial.reset_input_buffer()
+            self._reader.clear()
+
+            self._write_raw(self._create_cmd_str(0, SpikeNodebus.GetInputState, bytearray(), INPUT_STATE_LENGTH))
+            yield from self._writer.drain()
+            try:
+                inputs = yield from asyncio.wait_for(self._read_raw(INPUT_STATE_LENGTH), 0.2,
+                                                     loop=self.machine.clock.loop)
+            except asyncio.TimeoutError:
+                continue
+
+            if self._checksum(inputs) != 0:
+                continue
+
+            self._process_inputs(0, inputs)
+            return
+
+        self.log.warning("Failed to resync with Spike.")
+
+    @asyncio.coroutine
+    def _wait_for_quiet_line(self):
+        """Read until no data has been received for RESYNC_QUIET_TIME."""
+        while True:
+            try:
+                data = yield from asyncio.wait_for(self._reader.read(100), RESYNC_QUIET_TIME,
+                                                   loop=self.machine.clock.loop)
+            except asyncio.TimeoutError:
+                return
+            if not data:
+                return
 
     def stop(self):
         """Stop hardware and close connections."""
@@ -474,38 +562,43 @@ class SpikePlatform(SwitchPlatform, LightsPlatform, DriverPlatform):
         except asyncio.CancelledError:
             pass
 
-    @asyncio.coroutine
-    def _send_raw(self, data):
+    def _write_raw(self, data):
         if self.debug:
             self.log.debug("Sending: %s", "".join("0x%02x " % b for b in data))
         self._writer.write(("".join("%02x " % b for b in data).encode()))
         self._writer.write("\n\r".encode())
+
+    @asyncio.coroutine
+    def _send_raw(self, data):
+        self._write_raw(data)
         yield from self._writer.drain()
 
     @asyncio.coroutine
     def _read_raw(self, msg_len: int) -> Generator[int, None, bytearray]:
+        """Read msg_len bytes.
+
+        Every byte is sent as two hex digits followed by a space. Anything
+        else is skipped until the next byte starts.
+        """
         if not msg_len:
             raise AssertionError("Cannot read 0 length")
 
         if self.debug:
             self.log.debug("Reading %s bytes", msg_len)
 
-        data = yield from self._reader.readexactly(msg_len * 3)
-        # if we got a space
-        if data[0] == ' ':
-            data = data[1:]
-            data += yield from self._reader.readexactly(1)
-
         result = bytearray()
-        if self.debug:
-            self.log.debug("Data: %s", data)
-
-        for i in range(msg_len):
+        while len(result) < msg_len:
+            data = (yield from self._reader.readuntil(b' ')).strip()
+            if len(data) != 2:
+                self.log.warning("Read/encoding error. Skipping %s", data)
+                continue
             try:
-                result.append(int(data[i * 3:(i * 3) + 2], 16))
+                result.append(int(data, 16))
             except ValueError:
-                self.log.warning("Read/encoding error.")
-                return bytearray()
+                self.log.warning("Read/encoding error. Skipping %s", data)
+
+        if self.debug:
+            self.log.debug("Data: %s", result)
 
         return result
 
@@ -519,15 +612,7 @@ class SpikePlatform(SwitchPlatform, LightsPlatform, DriverPlatform):
     @asyncio.coroutine
     def send_cmd_and_wait_for_response(self, node, cmd, data, response_len) -> Generator[int, None, Optional[bytearray]]:
         """Send cmd and wait for response."""
-        if node > 15:
-            raise AssertionError("Node must be 0-15.")
-        cmd_str = bytearray()
-        cmd_str.append((8 << 4) + node)
-        cmd_str.append(len(data) + 2)
-        cmd_str.append(cmd)
-        cmd_str.extend(data)
-        cmd_str.append(self._checksum(cmd_str))
-        cmd_str.append(response_len)
+        cmd_str = self._create_cmd_str(node, cmd, data, response_len)
         with (yield from self._bus_busy):
             yield from self._send_raw(cmd_str)
             if response_len:
@@ -542,15 +627,14 @@ class SpikePlatform(SwitchPlatform, LightsPlatform, DriverPlatform):
                     self.log.warning("Checksum mismatch for response: %s", "".join("%02x " % b for b in response))
                     # we resync by flushing the input
                     self._writer.transport.serial.reset_input_buffer()
-                    # pylint: disable-msg=protected-access
-                    self._reader._buffer = bytearray()
+                    self._reader.clear()
                     return None
 
                 return response
 
             return None
 
-    def _create_cmd_str(self, node, cmd, data):
+    def _create_cmd_str(self, node, cmd, data, response_len=0):
         if node > 15:
             raise AssertionError("Node must be 0-15.")
         cmd_str = bytearray()
@@ -559,7 +643,7 @@ class SpikePlatform(SwitchPlatform, LightsPlatform, DriverPlatform):
         cmd_str.append(cmd)
         cmd_str.extend(data)
         cmd_str.append(self._checksum(cmd_str))
-        cmd_str.append(0)
+        cmd_str.append(response_len)
         return cmd_str
 
     @asyncio.coroutine
@@ -599,8 +683,7 @@ class SpikePlatform(SwitchPlatform, LightsPlatform, DriverPlatform):
         self._writer.write(b'\x03reset\n')
         # flush input
         self._writer.transport.serial.reset_input_buffer()
-        # pylint: disable-msg=protected-access
-        self._reader._buffer = bytearray()
+        self._reader.clear()
         # start mpf-spike-bridge
         self._writer.write("/bin/bridge\r\n".encode())
         welcome_str = b'MPF Spike Bridge!\r\n'
@@ -2,7 +2,9 @@
 
 import logging
 from typing import Any
+from typing import Dict
 from typing import Set
+from typing import Tuple
 from typing import TYPE_CHECKING
 
 from mpf.core.switch_controller import MonitoredSwitchChange
@@ -35,6 +37,11 @@ class Auditor(object):
         self.switchnames_to_audit = set()       # type: Set[str]
         self.config = None                      # type: Any
         self.current_audits = None              # type: Any
+        self.counters = dict()                  # type: Dict[Tuple[str, str], int]
+        """Live audit counts by (audit_class, event). Changes are copied to
+        current_audits and to machine vars in batches."""
+        self._dirty_counters = set()            # type: Set[Tuple[str, str]]
+        self._flush_handle = None
 
         self.enabled = False
         """Attribute that's viewed by other core components to let them know
@@ -109,6 +116,8 @@ class Auditor(object):
                 continue
             for name, value in audits.items():
                 self.machine.set_machine_var("audits_{}_{}".format(category, name), value)
+                if isinstance(value, int):
+                    self.counters[(category, name)] = value
 
     def audit(self, audit_class, event, **kwargs):
         """Called to log an auditable event.
@@ -122,14 +131,37 @@ class Auditor(object):
         """
         del kwargs
 
-        if audit_class not in self.current_audits:
-            self.current_audits[audit_class] = dict()
+        key = (audit_class, event)
+        self.counters[key] = self.counters.get(key, 0) + 1
+        self._dirty_counters.add(key)
 
-        if event not in self.current_audits[audit_class]:
-            self.current_audits[audit_class][event] = 0
+        if not self._flush_handle:
+            self._flush_handle = self.machine.clock.schedule_once(self._flush_counters,
+                                                                  self.config['flush_interval'])
 
-        self.current_audits[audit_class][event] += 1
-        self.machine.set_machine_var("audits_{}_{}".format(audit_class, event), self.current_audits[audit_class][event])
+    def get_audit_count(self, audit_class, event) -> int:
+        """Return the live count of an audit.
+
+        Counts in current_audits and in machine vars may lag behind by up to
+        flush_interval.
+        """
+        return self.counters.get((audit_class, event), 0)
+
+    def _flush_counters(self):
+        """Copy changed counters to current_audits and machine vars."""
+        if self._flush_handle:
+            self.machine.clock.unschedule(self._flush_handle)
+            self._flush_handle = None
+
+        for audit_class, event in self._dirty_counters:
+            if audit_class not in self.current_audits:
+                self.current_audits[audit_class] = dict()
+
+            value = self.counters[(audit_class, event)]
+            self.current_audits[audit_class][event] = value
+            self.machine.set_machine_var("audits_{}_{}".format(audit_class, event), value)
+
+        self._dirty_counters = set()
 
     def audit_switch(self, change: MonitoredSwitchChange):
         """Record switch change."""
@@ -152,7 +184,9 @@ class Auditor(object):
         """
         del kwargs
 
+        # events are not copied to machine vars so they skip the counter batching
         self.current_audits['events'][eventname] += 1
+        self.counters[('events', eventname)] = self.current_audits['events'][eventname]
 
     def audit_player(self, **kwargs):
         """Called to write player data to the audit log.
@@ -218,6 +252,7 @@ class Auditor(object):
                 # Make sure we have an entry in our audit file for this event
                 if event not in self.current_audits['events']:
                     self.current_audits['events'][event] = 0
+                    self.counters[('events', event)] = 0
 
         for event in self.config['save_events']:
             self.machine.events.add_handler(event, self._save_audits,
@@ -225,6 +260,7 @@ class Auditor(object):
 
     def _save_audits(self, delay_secs=3, **kwargs):
         del kwargs
+        self._flush_counters()
         self.data_manager.save_all(data=self.current_audits,
                                    delay_secs=delay_secs)
 
@@ -233,6 +269,7 @@ class Auditor(object):
         del kwargs
         self.log.debug("Disabling the Auditor")
         self.enabled = False
+        self._flush_counters()
 
         # remove switch and event handlers
         self.machine.events.remove_handler(self.audit_event)
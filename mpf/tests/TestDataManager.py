@@ -14,6 +14,9 @@ class TestDataManager(DataManager):
 
     def __init__(self, data):
         self.data = data
+        self.filename = False
+        self._journal = None
+        self._dirty_keys = set()
 
     def save_all(self, data=None, delay_secs=0):
         pass
@@ -10,6 +10,7 @@ from asyncio.selector_events import _SelectorSocketTransport
 import asyncio
 
 from mpf.core.clock import ClockBase
+from mpf.platforms.serial_capture import read_capture, RX
 from serial_asyncio import SerialTransport
 
 
@@ -186,6 +187,68 @@ class MockSerial(MockFd):
         raise AssertionError("Not implemented")
 
 
+class ReplaySerial(MockSerial):
+
+    """Feeds received bytes of a serial capture back to a platform.
+
+    Data is replayed with the timing of the capture divided by speed. With a
+    speed of 0 all data is available at once. Written data is collected in
+    written and can be compared to the sent data of the capture.
+    """
+
+    def __init__(self, filename, loop, speed=1.0):
+        super().__init__()
+        self.loop = loop
+        self.speed = speed
+        self.records = collections.deque()
+        self.expected_writes = []
+        for timestamp, direction, data in read_capture(filename):
+            if direction == RX:
+                self.records.append((timestamp, data))
+            else:
+                self.expected_writes.append(data)
+        self.written = []
+        self._start = None
+
+    def _due(self, timestamp):
+        if self._start is None:
+            self._start = self.loop.time()
+            self._wake_up()
+        if not self.speed:
+            return True
+        return self._start + timestamp / self.speed <= self.loop.time()
+
+    def _wake_up(self):
+        """Wake up the loop when the next data is due."""
+        if self.records and self.speed:
+            self.loop.call_at(self._start + self.records[0][0] / self.speed, lambda: None)
+
+    def read_ready(self):
+        return bool(self.records) and self._due(self.records[0][0])
+
+    def write_ready(self):
+        return True
+
+    def read(self, length):
+        timestamp, data = self.records.popleft()
+        if len(data) > length:
+            self.records.appendleft((timestamp, data[length:]))
+            data = data[:length]
+        else:
+            self._wake_up()
+        return data
+
+    def write(self, msg):
+        self._due(0)
+        self.written.append(msg)
+        return len(msg)
+
+    @property
+    def done(self):
+        """Return true if all data has been replayed."""
+        return not self.records
+
+
 class TestSelector(selectors.BaseSelector):
     def __init__(self):
         self.keys = {}
@@ -86,3 +86,44 @@ class TestAuditor(MpfTestCase):
         self.advance_time_and_run(1)
 
         self.assertEqual(2, auditor.current_audits['switches']['s_test'])
+
+    def test_batched_counters(self):
+        auditor = self.machine.plugins[0]
+        auditor.enable()
+        self.mock_event("machine_var_audits_switches_s_test")
+
+        for _ in range(3):
+            self.machine.switch_controller.process_switch("s_test", 1)
+            self.advance_time_and_run(.1)
+            self.machine.switch_controller.process_switch("s_test", 0)
+            self.advance_time_and_run(.1)
+
+        # live count is available right away. machine var is updated later
+        self.assertEqual(3, auditor.get_audit_count('switches', 's_test'))
+        self.assertEventNotCalled("machine_var_audits_switches_s_test")
+
+        self.advance_time_and_run(1)
+        self.assertEventCalled("machine_var_audits_switches_s_test", times=1)
+        self.assertMachineVarEqual(3, "audits_switches_s_test")
+        self.assertEqual(3, auditor.current_audits['switches']['s_test'])
+
+        # disable copies pending counters right away
+        self.machine.switch_controller.process_switch("s_test", 1)
+        self.advance_time_and_run(.1)
+        auditor.disable()
+        self.assertEqual(4, auditor.current_audits['switches']['s_test'])
+        self.assertMachineVarEqual(4, "audits_switches_s_test")
+
+    def test_audit_events(self):
+        auditor = self.machine.plugins[0]
+        auditor.enable()
+        self.mock_event("machine_var_audits_events_game_started")
+        count = auditor.current_audits['events']['game_started']
+
+        self.machine.events.post("game_started")
+        self.advance_time_and_run(2)
+
+        # events are counted without machine var updates
+        self.assertEqual(count + 1, auditor.current_audits['events']['game_started'])
+        self.assertEqual(count + 1, auditor.get_audit_count('events', 'game_started'))
+        self.assertEventNotCalled("machine_var_audits_events_game_started")
@@ -1,6 +1,7 @@
 """Test the bcp interface."""
 from unittest import mock
 
+from mpf.core.bcp.bcp_client import DEVICE_CHANGES_LIST
 from mpf.core.events import RegisteredHandler
 from mpf.tests.MpfBcpTestCase import MpfBcpTestCase
 
@@ -73,6 +74,48 @@ class TestBcpInterface(MpfBcpTestCase):
         self.machine.events.post("test1")
         self.assertFalse(self._bcp_client.send_queue)
 
+    def test_monitor_events_filter(self):
+        self.machine.events.add_handler("ball_started", self._cb)
+        self._bcp_client.send_queue.clear()
+        self._bcp_client.receive_queue.put_nowait(('monitor_start', {'category': 'events',
+                                                                     'include': 'ball_*, mode_*',
+                                                                     'exclude': 'mode_*_stopping',
+                                                                     'handlers': False}))
+        self.advance_time_and_run()
+        self._bcp_client.send_queue.clear()
+
+        self.machine.events.post("ball_started", ball=1)
+        self.machine.events.post("mode_test_stopping")
+        self.machine.events.post("mode_test_started")
+        self.machine.events.post("timer_tick")
+        self.assertEqual([
+            ('monitored_event', dict(event_name='ball_started', event_type=None, event_callback=None,
+                                     event_kwargs={"ball": 1})),
+            ('monitored_event', dict(event_name='mode_test_started', event_type=None, event_callback=None,
+                                     event_kwargs={})),
+        ], self._bcp_client.send_queue)
+
+        # events nobody watches keep the fast path
+        self.assertFalse(self.machine.events.is_event_monitored("timer_tick"))
+        self.assertTrue(self.machine.events.is_event_monitored("ball_ending"))
+
+        self._bcp_client.receive_queue.put_nowait(('monitor_stop', {'category': 'events'}))
+        self.advance_time_and_run()
+        self.assertFalse(self.machine.events.monitor_events)
+        self.assertFalse(self.machine.events.is_event_monitored("ball_ending"))
+
+    def test_monitor_events_disconnect(self):
+        self._bcp_client.receive_queue.put_nowait(('monitor_start', {'category': 'events', 'include': 'ball_*'}))
+        self.advance_time_and_run()
+        self.assertTrue(self.machine.events.is_event_monitored("ball_ending"))
+
+        # clients which disconnect without monitor_stop do not keep the monitor enabled
+        self._bcp_client.exit_on_close = False
+        self.machine.bcp.transport.unregister_transport(self._bcp_client)
+        self.assertFalse(self.machine.events.monitor_events)
+        self.assertFalse(self.machine.events.is_event_monitored("ball_ending"))
+        self.assertFalse(self.machine.bcp.interface._event_monitor_filters)
+
     def test_device_monitor(self):
         self.hit_switch_and_run("s_test", .1)
         self.release_switch_and_run("s_test2", .1)
@@ -137,6 +180,53 @@ class TestBcpInterface(MpfBcpTestCase):
         self.hit_switch_and_run("s_test", .1)
         self.assertFalse(self._bcp_client.send_queue)
 
+    def test_device_monitor_batching(self):
+        self._bcp_client.receive_queue.put_nowait(('monitor_start', {'category': 'devices'}))
+        self.advance_time_and_run()
+        self._bcp_client.send_queue.clear()
+
+        # multiple changes in one loop iteration result in one message
+        switch = self.machine.switches.s_test
+        self.machine.device_manager.notify_device_changes(switch, "state", 0, 1)
+        self.machine.device_manager.notify_device_changes(switch, "recycle_jitter_count", 0, 1)
+        self.machine.device_manager.notify_device_changes(switch, "state", 1, 0)
+        self.machine.device_manager.notify_device_changes(switch, "recycle_jitter_count", 1, 2)
+        self.assertFalse(self._bcp_client.send_queue)
+        self.advance_time_and_run()
+        self.assertEqual([
+            ("device", {"type": "switch",
+                        "name": "s_test",
+                        "state": {'state': 0, 'recycle_jitter_count': 0},
+                        "changes": ('recycle_jitter_count', 0, 2)})], self._bcp_client.send_queue)
+        self._bcp_client.send_queue.clear()
+
+        self.machine.device_manager.notify_device_changes(switch, "state", 0, 1)
+        self.machine.device_manager.notify_device_changes(switch, "recycle_jitter_count", 0, 1)
+        self.advance_time_and_run()
+        self.assertEqual([
+            ("device", {"type": "switch",
+                        "name": "s_test",
+                        "state": {'state': 0, 'recycle_jitter_count': 0},
+                        "changes": ('state', 0, 1)}),
+            ("device", {"type": "switch",
+                        "name": "s_test",
+                        "state": {'state': 0, 'recycle_jitter_count': 0},
+                        "changes": ('recycle_jitter_count', 0, 1)})],
+            self._bcp_client.send_queue)
+        self._bcp_client.send_queue.clear()
+
+        # clients which negotiated the feature in hello get all changes in one message
+        self._bcp_client.features.add(DEVICE_CHANGES_LIST)
+        self.machine.device_manager.notify_device_changes(switch, "state", 1, 0)
+        self.machine.device_manager.notify_device_changes(switch, "recycle_jitter_count", 1, 2)
+        self.advance_time_and_run()
+        self.assertEqual([
+            ("device", {"type": "switch",
+                        "name": "s_test",
+                        "state": {'state': 0, 'recycle_jitter_count': 0},
+                        "changes": [('state', 1, 0), ('recycle_jitter_count', 1, 2)]})],
+            self._bcp_client.send_queue)
+
     def test_switch_monitor(self):
         self._bcp_client.send_queue.clear()
 
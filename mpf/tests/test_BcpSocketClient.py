@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import MagicMock
 
-from mpf.core.bcp.bcp_socket_client import decode_command_string, encode_command_string
+from mpf.core.bcp.bcp_client import DEVICE_CHANGES_LIST
+from mpf.core.bcp.bcp_socket_client import decode_command_string, encode_command_string, encode_command_json, \
+    decode_command_json
 from mpf.tests.MpfTestCase import MpfTestCase
 from mpf.tests.loop import MockQueueSocket
 
@@ -97,6 +99,19 @@ class TestBcpSocketClientEncoding(unittest.TestCase):
         self.assertEqual(decoded_dict['dict2'][1],
                          dict(key3='value5', key4='value6'))
 
+    def test_json_lines_codec(self):
+        kwargs = dict(some_int=7, some_float=2.0, some_none=None, some_true=True, some_string="a&b=c\n",
+                      some_list=[1, "2"], some_dict=dict(key1=dict(key2=3)), some_object=object)
+
+        encoded_string = encode_command_json("Play", **kwargs)
+        self.assertNotIn("\n", encoded_string)
+        self.assertTrue(encoded_string.startswith('["play",'))
+
+        decoded_command, decoded_dict = decode_command_json(encoded_string)
+        self.assertEqual("play", decoded_command)
+        kwargs['some_object'] = str(object)
+        self.assertEqual(kwargs, decoded_dict)
+
 
 class MockBcpQueueSocket(MockQueueSocket):
 
@@ -163,6 +178,27 @@ class TestBcpSocketClient(MpfTestCase):
         self.client_socket.recv_queue.append(b'invalid_method?param1=1&param2=2\n')
         self.advance_time_and_run()
 
+    def testReceiveMalformedJson(self):
+        receiver = MagicMock()
+        self.machine.bcp.interface.register_command_callback("receive_msg", receiver)
+
+        # malformed lines are skipped and do not stop the receive loop
+        self.client_socket.recv_queue.append(b'["receive_msg"]\n')
+        self.client_socket.recv_queue.append(b'["receive_msg", [1]]\n')
+        self.client_socket.recv_queue.append(b'[1, {}]\n')
+        self.client_socket.recv_queue.append(b'[not json\n')
+        self.client_socket.recv_queue.append(b'["receive_msg", {"param1": 1}]\n')
+        self.advance_time_and_run()
+        receiver.assert_called_once_with(param1=1, client=self._bcp_client)
+
+    def testNegotiateFeatures(self):
+        # features are off unless the other side announces them in hello
+        self.assertEqual(set(), self._bcp_client.features)
+
+        self.client_socket.recv_queue.append(b'hello?version=1.1&features=device_changes_list,unknown_feature\n')
+        self.advance_time_and_run()
+        self.assertEqual({DEVICE_CHANGES_LIST}, self._bcp_client.features)
+
 
 class TestBcpSocketMultipleClients(MpfTestCase):
 
@@ -206,3 +242,132 @@ class TestBcpSocketMultipleClients(MpfTestCase):
         self.client_socket_2.recv_queue.append(b'receive_msg?param1=1&param2=2\n')
         self.advance_time_and_run()
         receiver.assert_called_once_with(param1="1", param2="2", client=self._bcp_client_2)
+
+    def testEncodeOnce(self):
+        for socket in (self.client_socket_1, self.client_socket_2):
+            socket.recv_queue.append(b'register_trigger?event=test_trigger\n')
+            # skip hello
+            socket.send_queue.get_nowait()
+        self.advance_time_and_run()
+
+        # both clients use the same codec
+        encoder = MagicMock(wraps=encode_command_string)
+        self._bcp_client_1._encode = encoder
+        self._bcp_client_2._encode = encoder
+
+        self.post_event_with_params("test_trigger", value=1)
+        self.advance_time_and_run()
+
+        encoder.assert_called_once_with("trigger", name="test_trigger", value=1)
+        data = self.client_socket_1.send_queue.get_nowait()
+        self.assertEqual(data, self.client_socket_2.send_queue.get_nowait())
+        self.assertEqual(("trigger", dict(name="test_trigger", value=1)), decode_command_string(data[0:-1].decode()))
+
+
+class MockStallingBcpSocket(MockBcpQueueSocket):
+
+    """Mock Socket which stops accepting data while stalled."""
+
+    def __init__(self, loop):
+        super().__init__(loop)
+        self.stalled = False
+
+    def write_ready(self):
+        return not self.stalled
+
+    def send(self, data):
+        if self.stalled:
+            raise BlockingIOError()
+        return super().send(data)
+
+
+class TestBcpSocketBackpressure(MpfTestCase):
+
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+
+        self.machine_config_patches['bcp'] = {}
+        self.machine_config_patches['bcp']['servers'] = []
+        self.machine_config_patches['bcp']['send_high_watermark'] = 100
+        self.machine_config_patches['bcp']['send_low_watermark'] = 10
+        self.machine_config_patches['bcp']['send_max_messages'] = 5
+
+    def get_use_bcp(self):
+        return True
+
+    def setUp(self):
+        super().setUp()
+        self._bcp_client = self.machine.bcp.transport.get_named_client("local_display")
+
+    def _mock_loop(self):
+        self.client_socket = MockStallingBcpSocket(self.loop)
+        self.clock.mock_socket("localhost", 5050, self.client_socket)
+
+    def _get_sent_messages(self):
+        data = b''
+        while not self.client_socket.send_queue.empty():
+            data += self.client_socket.send_queue.get_nowait()
+        return [decode_command_string(line.decode()) for line in data.split(b'\n')[:-1]]
+
+    def testQueueAndCoalesce(self):
+        self._get_sent_messages()
+        self.client_socket.stalled = True
+
+        # fills the transport buffer above the high watermark
+        self._bcp_client.send("trigger", {"name": "a" * 200})
+        self.assertEqual(0, self._bcp_client.queue_depth)
+
+        # only the latest state of a device is sent
+        self._bcp_client.send("device", {"type": "switch", "name": "s1", "state": 1})
+        self._bcp_client.send("device", {"type": "switch", "name": "s1", "state": 2})
+        self.assertEqual(1, self._bcp_client.queue_depth)
+        self.assertEqual(1, self._bcp_client.coalesced_messages)
+
+        # monitored events are dropped when the queue is full. triggers are not
+        for i in range(5):
+            self._bcp_client.send("monitored_event", {"event_name": "event{}".format(i)})
+        for i in range(3):
+            self._bcp_client.send("trigger", {"name": "trigger{}".format(i)})
+
+        self.assertEqual(5, self._bcp_client.queue_depth)
+        self.assertEqual(4, self._bcp_client.dropped_messages)
+        self.assertEqual({self._bcp_client: 5}, self.machine.bcp.transport.get_queue_depths())
+        self.advance_time_and_run()
+        self.assertEqual([], self._get_sent_messages())
+
+        self.client_socket.stalled = False
+        self.advance_time_and_run()
+        self.assertEqual(0, self._bcp_client.queue_depth)
+        self.assertEqual([
+            ("trigger", {"name": "a" * 200}),
+            ("device", {"type": "switch", "name": "s1", "state": 2}),
+            ("monitored_event", {"event_name": "event4"}),
+            ("trigger", {"name": "trigger0"}),
+            ("trigger", {"name": "trigger1"}),
+            ("trigger", {"name": "trigger2"}),
+        ], self._get_sent_messages())
+
+        # no backpressure. messages are written directly
+        self._bcp_client.send("trigger", {"name": "b"})
+        self.assertEqual(0, self._bcp_client.queue_depth)
+        self.assertEqual([("trigger", {"name": "b"})], self._get_sent_messages())
+
+    def testCoalesceKeepsOrder(self):
+        self._get_sent_messages()
+        self.client_socket.stalled = True
+        self._bcp_client.send("trigger", {"name": "a" * 200})
+
+        # the latest state is sent after messages queued before it
+        self._bcp_client.send("device", {"type": "switch", "name": "s1", "state": 1})
+        self._bcp_client.send("trigger", {"name": "t1"})
+        self._bcp_client.send("device", {"type": "switch", "name": "s1", "state": 2})
+        self.assertEqual(2, self._bcp_client.queue_depth)
+        self.assertEqual(1, self._bcp_client.coalesced_messages)
+
+        self.client_socket.stalled = False
+        self.advance_time_and_run()
+        self.assertEqual([
+            ("trigger", {"name": "a" * 200}),
+            ("trigger", {"name": "t1"}),
+            ("device", {"type": "switch", "name": "s1", "state": 2}),
+        ], self._get_sent_messages())
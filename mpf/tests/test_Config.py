@@ -464,3 +464,12 @@ class TestConfig(MpfTestCase):
         b3 = {"test": {"_delete": True}}
         c = Util.dict_merge(a, b3)
         self.assertEqual({'test2': 2}, c)
+
+        # inputs are not modified and unchanged values are shared
+        self.assertEqual({"test": {"a": [1], "b": [2, 3]}, "test2": 2}, a)
+        self.assertEqual({"test": {"_overwrite": True, "a": [3], "c": 7}}, b2)
+        c = Util.dict_merge(a, {"test2": 3})
+        self.assertIs(a["test"], c["test"])
+        c = Util.dict_merge(a, b)
+        self.assertIs(a["test"]["b"], c["test"]["b"])
+        self.assertIsNot(a["test"]["a"], c["test"]["a"])
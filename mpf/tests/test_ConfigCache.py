@@ -0,0 +1,103 @@
+"""Test the config cache."""
+import os
+import tempfile
+import unittest
+
+from mpf.core.config_cache import ConfigCache
+from mpf.file_interfaces.yaml_interface import YamlInterface
+from mpf.tests.MpfTestCase import MpfTestCase
+
+
+class TestConfigCache(unittest.TestCase):
+
+    def setUp(self):
+        YamlInterface.cache = False
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmp_dir.name, "cache")
+        self.config_file = os.path.join(self.tmp_dir.name, "config.yaml")
+        self._write_config("switches:\n  s_test:\n    number: 1\n")
+
+    def tearDown(self):
+        YamlInterface.cache = True
+        self.tmp_dir.cleanup()
+
+    def _write_config(self, content, mtime_ns=None):
+        with open(self.config_file, "w") as f:
+            f.write(content)
+        if mtime_ns:
+            os.utime(self.config_file, ns=(mtime_ns, mtime_ns))
+
+    def _load(self):
+        cache = ConfigCache(self.cache_file)
+        config = cache.load_file(self.config_file)
+        cache.write()
+        return cache, config
+
+    def test_manifest(self):
+        cache, config = self._load()
+        self.assertEqual(1, config['switches']['s_test']['number'])
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertIn(self.config_file, cache.manifest)
+        size, _, _ = cache.manifest[self.config_file]
+        self.assertEqual(os.stat(self.config_file).st_size, size)
+
+        # second run uses the cache
+        cache, config = self._load()
+        self.assertEqual(1, config['switches']['s_test']['number'])
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(0, cache.misses)
+
+        # returned data can be changed without changing the cache
+        config['switches']['s_test']['number'] = 7
+        self.assertEqual(1, cache.load_file(self.config_file)['switches']['s_test']['number'])
+
+    def test_touched_file(self):
+        self._load()
+
+        # same content with a new mtime
+        self._write_config("switches:\n  s_test:\n    number: 1\n", mtime_ns=10 ** 18)
+        cache, _ = self._load()
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(10 ** 18, cache.manifest[self.config_file][1])
+
+        # mtime has been updated in the cache file
+        cache, _ = self._load()
+        self.assertEqual(1, cache.hits)
+
+    def test_changed_file(self):
+        self._load()
+
+        # same size and a new mtime but different content
+        self._write_config("switches:\n  s_test:\n    number: 2\n", mtime_ns=10 ** 18)
+        cache, config = self._load()
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(2, config['switches']['s_test']['number'])
+
+    def test_no_load(self):
+        self._load()
+        cache = ConfigCache(self.cache_file, load=False)
+        cache.load_file(self.config_file)
+        self.assertEqual(1, cache.misses)
+
+
+class TestConfigCacheMachine(MpfTestCase):
+
+    def getConfigFile(self):
+        return 'test_shows.yaml'
+
+    def getMachinePath(self):
+        return 'tests/machine_files/shows/'
+
+    def test_files_in_manifest(self):
+        self.machine.shows['test_show1'].load(callback=None)
+        self.advance_time_and_run()
+
+        manifest = self.machine.config_cache.manifest
+        self.assertIn(os.path.abspath(self.machine.options['mpfconfigfile']), manifest)
+        self.assertIn(os.path.abspath(os.path.join(self.getAbsoluteMachinePath(), "config", "test_shows.yaml")),
+                      manifest)
+        self.assertIn(os.path.abspath(os.path.join(self.getAbsoluteMachinePath(), "modes", "mode1", "config",
+                                                   "mode1.yaml")), manifest)
+        self.assertIn(os.path.abspath(os.path.join(self.getAbsoluteMachinePath(), "shows", "test_show1.yaml")),
+                      manifest)
@@ -1,9 +1,11 @@
 """Test the bonus mode."""
 import os
+import tempfile
 import time
 from unittest.mock import mock_open, patch
 
 from mpf.file_interfaces.yaml_interface import YamlInterface
+from mpf.core.data_journal import DataJournal
 from mpf.core.data_manager import DataManager
 from mpf.tests.MpfTestCase import MpfTestCase
 
@@ -24,6 +26,14 @@ class TestDataManager(MpfTestCase):
         YamlInterface.cache = True
         super().tearDown()
 
+    def _wait_for_writer(self, condition, msg):
+        """Wait up to 5s for the writer thread."""
+        deadline = time.time() + 5
+        while not condition():
+            if time.time() > deadline:
+                self.fail(msg)
+            time.sleep(.001)
+
     def test_save_and_load(self):
         open_mock = mock_open(read_data="")
         with patch('mpf.file_interfaces.yaml_interface.open', open_mock, create=True):
@@ -39,6 +49,9 @@ class TestDataManager(MpfTestCase):
         with patch('mpf.file_interfaces.yaml_interface.open', open_mock, create=True):
             with patch('mpf.core.data_manager.os.replace') as move_mock:
                 manager.save_key("hallo", "world")
+                # writes are coalesced for one second
+                self.assertFalse(manager._dirty.is_set())
+                self.advance_time_and_run(1)
                 while not move_mock.called:
                     time.sleep(.00001)
                 open_mock().write.assert_called_once_with('hallo: world\n')
@@ -103,3 +116,95 @@ class TestDataManager(MpfTestCase):
 
         self.assertEqual({}, manager.get_data("hallo"))
         self.assertEqual({}, manager.get_data("invalid"))
+
+    def test_journal(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        filename = os.path.join(tmp_dir.name, "journal.yaml")
+
+        journal = DataJournal(filename, compact_size=1000)
+        self.assertEqual({}, journal.load())
+        journal.add_record("set", "hallo", "world")
+        journal.add_record("set", "count", 1)
+        value = {"test": [1, 2]}
+        journal.add_record("set", "value", value)
+        # records are serialised when they are added
+        value["test"].append(3)
+        self.assertLess(0, journal.write())
+        self.assertFalse(os.path.isfile(journal.snapshot_filename))
+
+        self.assertEqual({"hallo": "world", "count": 1, "value": {"test": [1, 2]}},
+                         DataJournal(filename).load())
+
+        # a torn record at the end is dropped
+        with open(journal.log_filename, "ab") as f:
+            f.write(b"\x00\x00\x01\x00abc")
+        self.assertEqual({"hallo": "world", "count": 1, "value": {"test": [1, 2]}},
+                         DataJournal(filename).load())
+
+        # compact when the log grows too large
+        journal.add_record("del", "hallo")
+        for i in range(30):
+            journal.add_record("set", "count", i)
+        journal.write()
+        self.assertTrue(os.path.isfile(journal.snapshot_filename))
+        self.assertEqual(0, os.path.getsize(journal.log_filename))
+        self.assertEqual({"count": 29, "value": {"test": [1, 2]}}, DataJournal(filename).load())
+
+        # YAML export for humans
+        self.assertEqual({"count": 29, "value": {"test": [1, 2]}}, YamlInterface().load(filename, False))
+
+    def test_journal_backend(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        filename = os.path.join(tmp_dir.name, "data", "journal.yaml")
+        self.machine.config['mpf']['paths']['journal_test'] = {"file": filename, "backend": "journal"}
+
+        manager = DataManager(self.machine, "journal_test")
+        self.assertEqual({}, manager.get_data())
+        manager.save_key("hallo", "world")
+        manager.save_key("count", 1)
+        manager.remove_key("hallo")
+        self.advance_time_and_run(1)
+
+        # state of the journal is updated after records have been written
+        self._wait_for_writer(lambda: manager._journal._state == {"count": 1}, "Journal records were not written")
+
+        manager2 = DataManager(self.machine, "journal_test")
+        self.assertEqual({"count": 1}, manager2.get_data())
+
+        self.machine.config['mpf']['paths']['journal_test'] = {"file": filename, "backend": "invalid"}
+        with self.assertRaises(AssertionError):
+            DataManager(self.machine, "journal_test")
+
+    def test_coalesced_snapshots(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        filename = os.path.join(tmp_dir.name, "data.yaml")
+        self.machine.config['mpf']['paths']['snapshot_test'] = {"file": filename, "write_window": "2s"}
+
+        self.mock_event("data_manager_written")
+        manager = DataManager(self.machine, "snapshot_test")
+        value = {"test": 1}
+        manager.save_key("a", value)
+        manager.save_key("b", {"test": 2})
+        self.advance_time_and_run(1)
+        self.assertIsNone(manager._snapshot)
+        self.advance_time_and_run(1)
+        snapshot = manager._snapshot
+        self.assertEqual({"a": {"test": 1}, "b": {"test": 2}}, snapshot)
+
+        # changes after the snapshot do not change it
+        value["test"] = 3
+        manager.save_key("a", value)
+        self.advance_time_and_run(2)
+        self.assertEqual({"a": {"test": 1}, "b": {"test": 2}}, snapshot)
+        self.assertEqual({"a": {"test": 3}, "b": {"test": 2}}, manager._snapshot)
+        # unchanged keys are shared with the previous snapshot
+        self.assertIs(snapshot["b"], manager._snapshot["b"])
+
+        self._wait_for_writer(lambda: manager.stats["writes"] >= 1, "Snapshot was not written")
+
+        self.advance_time_and_run()
+        self.assertEventCalled("data_manager_written")
+        self.assertLess(0, manager.stats["bytes"])
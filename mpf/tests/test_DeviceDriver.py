@@ -66,3 +66,53 @@ class TestDeviceDriver(MpfTestCase):
         self.advance_time_and_run(.5)
 
         self.machine.coils.coil_03.hw_driver.disable.assert_called_with()
+
+
+class TestDeviceDriverCoalescing(MpfTestCase):
+
+    def getConfigFile(self):
+        return 'config.yaml'
+
+    def getMachinePath(self):
+        return 'tests/machine_files/device/'
+
+    def get_platform(self):
+        return 'smart_virtual'
+
+    def setUp(self):
+        self.machine_config_patches['mpf']['coalesce_outputs'] = True
+        super().setUp()
+
+    def test_coalescing(self):
+        coil = self.machine.coils.coil_01
+        coil.hw_driver.disable = MagicMock()
+        coil.hw_driver.enable = MagicMock()
+        coil.hw_driver.pulse = MagicMock()
+
+        # only the last state within one loop iteration is sent
+        coil.enable()
+        coil.disable()
+        coil.enable()
+        coil.hw_driver.enable.assert_not_called()
+        self.advance_time_and_run(.01)
+        coil.hw_driver.enable.assert_called_once_with(PulseSettings(power=1.0, duration=30), HoldSettings(power=1.0))
+        coil.hw_driver.disable.assert_not_called()
+        self.assertEqual(2, coil.platform.output_stage.stats["coalesced"])
+
+        # pulses are sent immediately after the pending state
+        coil.disable()
+        coil.pulse(20)
+        coil.hw_driver.disable.assert_called_once_with()
+        coil.hw_driver.pulse.assert_called_once_with(PulseSettings(power=1.0, duration=20))
+        self.advance_time_and_run(.01)
+        coil.hw_driver.disable.assert_called_once_with()
+
+    def test_flush_on_stop(self):
+        coil = self.machine.coils.coil_01
+        coil.hw_driver.disable = MagicMock()
+
+        # outputs staged in the last loop iteration are sent before the platform stops
+        coil.disable()
+        coil.hw_driver.disable.assert_not_called()
+        self.machine._platform_stop()
+        coil.hw_driver.disable.assert_called_once_with()
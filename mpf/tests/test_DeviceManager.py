@@ -1,6 +1,9 @@
 import inspect
 
+from mpf.config_players.trigger_player import TriggerPlayer
+from mpf.core.lazy_config_player import LazyConfigPlayer
 from mpf.core.utility_functions import Util
+from mpf.devices.stepper import Stepper
 from mpf.tests.MpfTestCase import MpfTestCase
 
 
@@ -33,3 +36,43 @@ class TestDeviceManager(MpfTestCase):
                 self.assertEqual(sig.parameters['kwargs'].kind, inspect._VAR_KEYWORD,
                     "Method {}.{} kwargs param is missing '**'".format(
                     device_type, method_name))
+
+    def test_device_module_index(self):
+        index = self.machine.config['mpf']['device_module_index']
+        for device_type in self.machine.config['mpf']['device_modules']:
+            entry = index.get(device_type.lower())
+            if not entry:
+                continue
+
+            device_cls = Util.string_to_class(device_type)
+            self.assertEqual(list(device_cls.get_config_info()), Util.string_to_list(entry),
+                             "Index entry for {} is outdated".format(device_type))
+            self.assertFalse(device_cls.get_config_spec())
+
+        index = self.machine.config['mpf']['config_player_index']
+        for name, module_class in self.machine.config['mpf']['config_players'].items():
+            entry = index.get(name)
+            if not entry:
+                continue
+
+            player_cls = Util.string_to_class(module_class)
+            self.assertEqual([player_cls.config_file_section, player_cls.show_section], Util.string_to_list(entry),
+                             "Index entry for {} is outdated".format(name))
+
+    def test_lazy_loading(self):
+        # the null config does not use steppers
+        self.assertNotIn("steppers", self.machine.device_manager.device_classes)
+        self.assertIn("playfields", self.machine.device_manager.device_classes)
+        self.assertEqual(0, len(self.machine.steppers))
+        self.assertEqual("steppers", self.machine.device_manager.collections["steppers"].config_section)
+
+        # the class is loaded when a device is added
+        self.assertEqual(Stepper, self.machine.device_manager.get_device_class("steppers"))
+        self.assertIn("steppers", self.machine.device_manager.device_classes)
+
+        # unused config players are loaded on first use
+        player = self.machine.show_controller.show_players['triggers']
+        self.assertIsInstance(player, LazyConfigPlayer)
+        self.assertIsInstance(player.player, TriggerPlayer)
+        self.assertIsInstance(self.machine.show_controller.show_players['triggers'], TriggerPlayer)
+        self.assertIsInstance(self.machine.trigger_player, TriggerPlayer)
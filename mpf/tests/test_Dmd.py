@@ -1,3 +1,6 @@
+import os
+
+from mpf.core.shared_frame_buffer import SharedFrameBuffer
 from mpf.tests.MpfBcpTestCase import MpfBcpTestCase
 
 
@@ -26,3 +29,46 @@ class TestDmd(MpfBcpTestCase):
         self.machine_run()
 
         self.assertEqual(b'1337', self.machine.rgb_dmds.test_dmd.hw_device.data)
+
+    def testDmdSharedMemory(self):
+        frame_buffer = SharedFrameBuffer("mpf_test_dmd_{}".format(os.getpid()), slot_count=4, slot_size=16)
+        self.addCleanup(frame_buffer.unlink)
+
+        frame_buffer.write_frame(b'1337')
+        self._bcp_client.receive_queue.put_nowait(("dmd_frame", {"name": "test_dmd",
+                                                                 "shm_name": frame_buffer.name}))
+        self.advance_time_and_run()
+        self.assertEqual(b'1337', self.machine.dmds.test_dmd.hw_device.data)
+
+        # the DMD only shows the latest frame
+        for frame in (b'1', b'22', b'333'):
+            frame_buffer.write_frame(frame)
+            self.machine.dmds.test_dmd.update_from_shared_memory(frame_buffer.name)
+        self.advance_time_and_run()
+        self.assertEqual(b'333', self.machine.dmds.test_dmd.hw_device.data)
+        self.assertEqual(2, self.machine.dmds.test_dmd.frame_reader.dropped_frames)
+
+        # the buffer is unmapped on shutdown
+        frame_reader = self.machine.dmds.test_dmd.frame_reader
+        self.machine.dmds.test_dmd._close_frame_reader()
+        self.assertIsNone(self.machine.dmds.test_dmd.frame_reader)
+        self.assertIsNone(frame_reader._buffer)
+
+    def testDmdFrameWithoutData(self):
+        dmd = self.machine.dmds.test_dmd
+        dmd.hw_device.data = b'1337'
+        with self.assertRaises(TypeError):
+            dmd._bcp_receive_dmd_frame(self._bcp_client, "test_dmd")
+        with self.assertRaises(TypeError):
+            self.machine.rgb_dmds.test_dmd._bcp_receive_dmd_frame(self._bcp_client, "test_dmd")
+        self.assertEqual(b'1337', dmd.hw_device.data)
+
+    def testRgbDmdSharedMemory(self):
+        frame_buffer = SharedFrameBuffer("mpf_test_rgb_dmd_{}".format(os.getpid()), slot_count=4, slot_size=16)
+        self.addCleanup(frame_buffer.unlink)
+
+        frame_buffer.write_frame(b'1337')
+        self._bcp_client.receive_queue.put_nowait(("rgb_dmd_frame", {"name": "test_dmd",
+                                                                     "shm_name": frame_buffer.name}))
+        self.advance_time_and_run()
+        self.assertEqual(b'1337', self.machine.rgb_dmds.test_dmd.hw_device.data)
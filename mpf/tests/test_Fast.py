@@ -15,12 +15,14 @@ class BaseMockFast(MockSerial):
         self.queue = []
         self.expected_commands = {}
         self.ignore_commands = {}
+        self.writes = 0
+        self.written = []
 
     def read(self, length):
         del length
         if not self.queue:
             return
-        msg = (self.queue.pop() + '\r').encode()
+        msg = (self.queue.pop(0) + '\r').encode()
         return msg
 
     def read_ready(self):
@@ -34,30 +36,34 @@ class BaseMockFast(MockSerial):
 
     def write(self, msg):
         msg_len = len(msg)
-        cmd = msg.decode()
-        # strip newline
-        cmd = cmd[:-1]
-
+        self.writes += 1
+        # multiple commands may be written at once
+        cmds = msg.decode().split("\r")[:-1]
+        self.written.append(cmds)
+        for cmd in cmds:
+            self._process_command(cmd)
+        return msg_len
+
+    def _process_command(self, cmd):
         # ignore init garbage
         if cmd == (' ' * 256 * 4):
-            return msg_len
+            return
 
         if cmd[:3] == "WD:":
             self.queue.append("WD:P")
-            return msg_len
+            return
 
         if cmd in self.ignore_commands:
             self.queue.append(cmd[:3] + "P")
-            return msg_len
+            return
 
         if self._parse(cmd):
-            return msg_len
+            return
 
         if cmd in self.expected_commands:
             if self.expected_commands[cmd]:
                 self.queue.append(self.expected_commands[cmd])
             del self.expected_commands[cmd]
-            return msg_len
         else:
             raise Exception(self.type + ": " + str(cmd))
 
@@ -120,7 +126,7 @@ class MockFastNet(BaseMockFast):
         self.type = "NET"
 
 
-class TestFast(MpfTestCase):
+class TestFastBase(MpfTestCase):
     def getConfigFile(self):
         return 'config.yaml'
 
@@ -214,6 +220,9 @@ class TestFast(MpfTestCase):
         self.assertEqual("00.90", self.machine.get_machine_var("fast_net_firmware"))
         self.assertEqual("FP-CPU-002-1", self.machine.get_machine_var("fast_net_model"))
 
+
+class TestFast(TestFastBase):
+
     def test_coils(self):
         self._test_pulse()
         self._test_long_pulse()
@@ -599,6 +608,45 @@ class TestFast(MpfTestCase):
 
         self.assertFalse(self.dmd_cpu.expected_commands)
 
+    def test_send_window(self):
+        connection = self.machine.default_platform.net_connection
+        writes = self.net_cpu.writes
+
+        # queued commands are written at once and light commands to the same
+        # address replace each other
+        self.net_cpu.expected_commands = {
+            "L1:23,FF": "L1:P",
+            "GI:2A,80": "GI:P",
+        }
+        connection.send("L1:23,80")
+        connection.send("GI:2A,80")
+        connection.send("L1:23,FF")
+        self.advance_time_and_run(.1)
+        self.assertFalse(self.net_cpu.expected_commands)
+        self.assertEqual(writes + 1, self.net_cpu.writes)
+        self.assertEqual(1, connection.superseded_messages)
+        self.assertEqual(0, connection.messages_in_flight)
+
+        # only one command in flight
+        connection.max_messages_in_flight = 1
+        self.net_cpu.expected_commands = {
+            "L1:23,00": "L1:P",
+            "GI:2A,00": "GI:P",
+        }
+        connection.send("L1:23,00")
+        connection.send("GI:2A,00")
+        self.advance_time_and_run(.1)
+        self.assertFalse(self.net_cpu.expected_commands)
+        self.assertEqual(writes + 3, self.net_cpu.writes)
+        self.assertEqual(0, connection.messages_in_flight)
+
+    def test_hardware_inventory(self):
+        # boards found on the NET port are stored for the next boot
+        inventory = self.machine.get_hardware_inventory().get_data("fast")["com4"]
+        self.assertTrue(inventory["id"].startswith("ID:NET FP-CPU-002-1 00.90"))
+        self.assertEqual(4, len(inventory["io_boards"]))
+        self.assertTrue(inventory["io_boards"][2].startswith("NN:02,FP-I/O-1616-2"))
+
     def test_lights_and_leds(self):
         self._test_matrix_light()
         self._test_pdb_gi_light()
@@ -748,3 +796,35 @@ class TestFast(MpfTestCase):
         device.color(RGBColor((2, 23, 42)))
         self.advance_time_and_run(1)
         self.assertEqual("02172a", self.rgb_cpu.leds['97'])
+
+
+class TestFastInventory(TestFastBase):
+
+    BOARDS = ['NN:00,FP-I/O-3208-2   ,01.00,08,20,04,06,00,00,00,00\r',
+              'NN:01,FP-I/O-0804-1   ,01.00,04,08,04,06,00,00,00,00\r',
+              'NN:02,FP-I/O-1616-2   ,01.00,10,10,04,06,00,00,00,00\r',
+              'NN:03,FP-I/O-1616-2   ,01.00,10,10,04,06,00,00,00,00\r']
+
+    CACHED_BOARDS = {
+        "test_cached_boards": BOARDS,
+        # board 2 has been replaced and board 3 is new
+        "test_changed_boards": BOARDS[:2] + ['NN:02,FP-I/O-0804-1   ,01.00,04,08,04,06,00,00,00,00\r'],
+    }
+
+    def _get_mock_data(self):
+        return {"hardware_inventory": {"fast": {"com4": {
+            "id": "ID:NET FP-CPU-002-1 00.90\r",
+            "io_boards": list(self.CACHED_BOARDS[self._testMethodName])}}}}
+
+    def _board_queries(self):
+        return [cmds for cmds in self.net_cpu.written if cmds and cmds[0].startswith("NN:")]
+
+    def test_cached_boards(self):
+        # all cached boards and the first missing board are queried at once
+        self.assertEqual([["NN:0", "NN:1", "NN:2", "NN:3", "NN:4"]], self._board_queries())
+
+    def test_changed_boards(self):
+        # the query continues board by board after a mismatch
+        self.assertEqual([["NN:0", "NN:1", "NN:2", "NN:3"], ["NN:4"]], self._board_queries())
+        inventory = self.machine.get_hardware_inventory().get_data("fast")["com4"]
+        self.assertEqual(self.BOARDS, inventory["io_boards"])
@@ -253,4 +253,19 @@ class TestLisy(MpfTestCase):
         }
         self.post_event("test_stop")
         self._wait_for_processing()
-        self.assertFalse(self.serialMock.expected_commands)
\ No newline at end of file
+        self.assertFalse(self.serialMock.expected_commands)
+
+    def test_poll_rate(self):
+        # idle machine backs off to max_poll_latency
+        self.advance_time_and_run(2)
+        self.assertEqual(100, self.machine.default_platform.poll_stats['poll_hz'])
+        self.assertLess(self.machine.default_platform.poll_stats['achieved_poll_hz'], 150)
+
+        # first change returns to full rate
+        self.serialMock.expected_commands = {
+            b'\x29': b'\x25'        # 37 turned inactive
+        }
+        self.advance_time_and_run(.02)
+        self.assertFalse(self.serialMock.expected_commands)
+        self.assertSwitchState("s_test37", False)
+        self.assertEqual(1, self.machine.default_platform.poll_stats['changes'])
@@ -55,3 +55,100 @@ class TestMalformedMachineVariables(MpfTestCase):
         self.assertEqual(118208660, self.machine.get_machine_var("player2_score"))
         self.assertFalse(self.machine.is_machine_var("player5_score"))
         self.assertEqual(None, self.machine.get_machine_var("player5_score"))
+
+
+class TestMachineVariableStore(MpfTestCase):
+
+    def _get_mock_data(self):
+        return {"machine_vars": {"credits": {"value": 3, "expire": 10 ** 12},
+                                 "old_credits": {"value": 5, "expire": 1}}}
+
+    def test_load_expire(self):
+        # expired while MPF was not running
+        self.assertMachineVarEqual(0, "old_credits")
+        # expires in the far future
+        self.assertMachineVarEqual(3, "credits")
+
+    def test_batched_persistence(self):
+        self.machine.configure_machine_var("test1", persist=True)
+        self.machine.configure_machine_var("test2", persist=True)
+        self.machine.set_machine_var("test1", 1)
+        self.machine.set_machine_var("test1", 2)
+        self.machine.set_machine_var("test2", 3)
+
+        # written together in the next loop iteration
+        data = self.machine.machine_var_data_manager.get_data()
+        self.assertNotIn("test1", data)
+        self.advance_time_and_run()
+        self.assertEqual(2, data["test1"]["value"])
+        self.assertEqual(3, data["test2"]["value"])
+
+        self.machine.remove_machine_var("test1")
+        self.assertNotIn("test1", data)
+
+    def test_runtime_expire(self):
+        self.machine.configure_machine_var("test1", persist=True, expire_secs=10)
+        self.machine.configure_machine_var("test2", persist=True, expire_secs=5)
+        self.machine.set_machine_var("test1", 7)
+        self.machine.set_machine_var("test2", 8)
+        self.advance_time_and_run(4)
+        self.assertEqual(7, self.machine.machine_var_data_manager.get_data()["test1"]["value"])
+        self.assertIn("expire", self.machine.machine_var_data_manager.get_data()["test1"])
+
+        # setting test2 again extends the expiration
+        self.machine.set_machine_var("test2", 9)
+        self.advance_time_and_run(2)
+        self.assertMachineVarEqual(7, "test1")
+        self.assertMachineVarEqual(9, "test2")
+
+        self.advance_time_and_run(3.5)
+        self.assertMachineVarEqual(7, "test1")
+        self.assertMachineVarEqual(0, "test2")
+
+        self.advance_time_and_run(1)
+        self.assertMachineVarEqual(0, "test1")
+        self.assertEqual(0, self.machine.machine_var_data_manager.get_data()["test1"]["value"])
+
+        # removed vars do not expire
+        self.machine.set_machine_var("test2", 1)
+        self.machine.remove_machine_var("test2")
+        self.advance_time_and_run(10)
+        self.assertFalse(self.machine.is_machine_var("test2"))
+
+    def test_expire_frequent_updates(self):
+        self.machine.configure_machine_var("test1", persist=False, expire_secs=100)
+        for i in range(50):
+            self.machine.set_machine_var("test1", i + 1)
+            self.advance_time_and_run(1)
+
+        # the var is queued once and its expiration follows the last update
+        self.assertEqual(1, len(self.machine.variables._expire_heap))
+        self.advance_time_and_run(98)
+        self.assertMachineVarEqual(50, "test1")
+        self.advance_time_and_run(2)
+        self.assertMachineVarEqual(0, "test1")
+        self.assertEqual(1, len(self.machine.variables._expire_heap))
+
+    def test_subscriptions(self):
+        changes = []
+
+        def _changed(**kwargs):
+            changes.append(kwargs)
+
+        self.machine.subscribe_machine_var("test1", _changed)
+        self.machine.set_machine_var("test1", 5)
+        self.machine.set_machine_var("test2", 5)
+        self.machine.set_machine_var("test1", 5)
+        self.machine.set_machine_var("test1", 7)
+        self.assertEqual([dict(name="test1", value=5, prev_value=None, change=True),
+                          dict(name="test1", value=7, prev_value=5, change=2)], changes)
+
+        self.machine.unsubscribe_machine_var("test1", _changed)
+        self.machine.set_machine_var("test1", 8)
+        self.assertEqual(2, len(changes))
+
+        # the event is still posted to handlers
+        self.mock_event("machine_var_test1")
+        self.machine.set_machine_var("test1", ["a"])
+        self.advance_time_and_run()
+        self.assertEventCalledWith("machine_var_test1", value=["a"], prev_value=8, change=True)
@@ -195,7 +195,7 @@ class TestOPPFirmware2(OPPCommon, MpfTestCase):
         self.assertFalse(self.serialMock.expected_commands)
 
 
-class TestOPP(OPPCommon, MpfTestCase):
+class TestOPPBase(OPPCommon, MpfTestCase):
 
     def setUp(self):
         self.expected_duration = 1.5
@@ -227,6 +227,80 @@ class TestOPP(OPPCommon, MpfTestCase):
 
         self.assertFalse(self.serialMock.expected_commands)
 
+
+class TestOPPPollRate(TestOPPBase):
+
+    def setUp(self):
+        self.machine_config_patches['opp'] = {'min_poll_hz': 20}
+        super().setUp()
+
+    def test_poll_rate(self):
+        stats = self.machine.default_platform.poll_stats["com1"]
+        self.advance_time_and_run(1)
+        self.assertGreater(stats["polls"], 20)
+        self.assertEqual(0, stats["timeouts"])
+        self.assertEqual(0, stats["bad_crc"])
+        # inputs are idle. back off to the min rate
+        self.assertAlmostEqual(20, stats["poll_hz"])
+
+        # poll at full rate while inputs change
+        inputs_message = b"\x20\x08\x00\x00\x01\x08"
+        self.serialMock.permanent_commands[
+            self._crc_message(b'\x20\x08\x00\x00\x00\x00', False) + self._crc_message(b'\x21\x08\x00\x00\x00\x00')] = \
+            self._crc_message(inputs_message, False) + self._crc_message(b"\x21\x08\x00\x00\x00\x00")
+        self.advance_time_and_run(.1)
+        self.assertEqual(1, stats["changes"])
+        self.assertGreater(stats["poll_hz"], 20)
+        self.assertEqual(0, stats["timeouts"])
+
+
+class TestOPPInventory(TestOPPBase):
+
+    CACHED_CARDS = {
+        "test_cached_cards": "2021",
+        # card 22 has been removed
+        "test_changed_cards": "202122",
+    }
+
+    def _get_mock_data(self):
+        return {"hardware_inventory": {"opp": {"com1": {"cards": self.CACHED_CARDS[self._testMethodName]}}}}
+
+    def _mock_loop(self):
+        commands = self.serialMock.expected_commands
+        cfg_cmd = self._crc_message(b'\x20\x0d\x00\x00\x00\x00', False) + \
+            self._crc_message(b'\x21\x0d\x00\x00\x00\x00')
+        vers_cmd = self._crc_message(b'\x20\x02\x00\x00\x00\x00', False) + \
+            self._crc_message(b'\x21\x02\x00\x00\x00\x00')
+        if self._testMethodName == "test_cached_cards":
+            # inventory, config and versions of the cached cards are queried in one round trip
+            commands[b'\xf0\xff' + cfg_cmd + vers_cmd] = \
+                commands.pop(b'\xf0\xff') + commands.pop(cfg_cmd) + commands.pop(vers_cmd)
+        else:
+            # responses for the cached cards are dropped and all cards are queried again
+            cached_cfg_cmd = self._crc_message(b'\x20\x0d\x00\x00\x00\x00', False) + \
+                self._crc_message(b'\x21\x0d\x00\x00\x00\x00', False) + \
+                self._crc_message(b'\x22\x0d\x00\x00\x00\x00')
+            cached_vers_cmd = self._crc_message(b'\x20\x02\x00\x00\x00\x00', False) + \
+                self._crc_message(b'\x21\x02\x00\x00\x00\x00', False) + \
+                self._crc_message(b'\x22\x02\x00\x00\x00\x00')
+            commands[b'\xf0\xff' + cached_cfg_cmd + cached_vers_cmd] = \
+                commands.pop(b'\xf0\xff') + self._crc_message(b'\x20\x0d\x03\x03\x03\x03') + \
+                self._crc_message(b'\x20\x02\x00\x00\x00\x00')
+        super()._mock_loop()
+
+    def test_cached_cards(self):
+        self.assertEqual([0x20, 0x21], self.machine.default_platform.gen2AddrArr["com1"])
+        self.assertEqual(0x00010100, self.machine.default_platform.minVersion)
+        self.assertEqual({"cards": "2021"}, self.machine.get_hardware_inventory().get_data("opp")["com1"])
+
+    def test_changed_cards(self):
+        self.assertEqual([0x20, 0x21], self.machine.default_platform.gen2AddrArr["com1"])
+        self.assertEqual(0x00010100, self.machine.default_platform.minVersion)
+        self.assertEqual({"cards": "2021"}, self.machine.get_hardware_inventory().get_data("opp")["com1"])
+
+
+class TestOPP(TestOPPBase):
+
     def test_opp(self):
         self._test_coils()
         self._test_leds()
@@ -1,3 +1,6 @@
+import asyncio
+import unittest
+
 from mpf.tests.MpfTestCase import MpfTestCase
 from unittest.mock import MagicMock, call
 from mpf.platforms import p_roc_common, p_roc
@@ -124,6 +127,18 @@ class TestPRoc(MpfTestCase):
         self.machine.coils.c_test.hw_driver.proc.driver_schedule.assert_called_with(
             number=number, cycle_seconds=0, now=True, schedule=0xffffffff)
 
+    def test_coalesced_outputs(self):
+        self.machine.config['mpf']['coalesce_outputs'] = True
+        self.pinproc.reset_mock()
+        self.machine.coils.c_test_allow_enable.enable()
+        self.pinproc.driver_schedule.assert_not_called()
+
+        # the staged batch is flushed to the P-ROC right away
+        self.machine.default_platform.output_stage.flush()
+        number = self.machine.coils.c_test_allow_enable.hw_driver.number
+        self.assertEqual([call.driver_schedule(number=number, cycle_seconds=0, now=True, schedule=0xffffffff),
+                          call.flush()], self.pinproc.mock_calls)
+
     def test_hw_rule_pulse(self):
         self.machine.autofires.ac_slingshot_test.enable()
         self.machine.coils.c_slingshot_test.platform.proc.switch_update_rule.assert_any_call(
@@ -336,3 +351,68 @@ class TestPRoc(MpfTestCase):
             number=9925, cycle_seconds=0, now=True, schedule=0xffffffff)
         self.machine.coils.c_diag_led_driver.hw_driver.proc.driver_pulse.assert_called_with(
             9902, 50)
+
+
+class TestPROCIoThread(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.events = [[{'type': 1, 'value': 23}, {'type': 2, 'value': 24}]]
+        self.proc = MagicMock()
+        self.proc.get_events = MagicMock(side_effect=lambda: self.events.pop() if self.events else [])
+        self.proc.read_data = MagicMock(return_value=42)
+        self.received = []
+        self.io_thread = p_roc_common.PROCIoThread(self.proc, self.loop, self.received.append, .001)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def _written(self):
+        return [c for c in self.proc.mock_calls if c[0] not in ("get_events", "watchdog_tickle", "flush")]
+
+    def test_batches(self):
+        # commands are handed to the thread after the loop iteration
+        self.io_thread.driver_pulse(8, 10)
+        self.io_thread.driver_disable(9)
+        self.assertEqual([{'type': 1, 'value': 23}, {'type': 2, 'value': 24}], self.io_thread._poll())
+        self.assertEqual([], self._written())
+        self.assertTrue(self.proc.watchdog_tickle.called)
+
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+        self.io_thread.driver_pulse(10, 10)
+        self.io_thread._poll()
+        # only the batch of the previous iteration is written
+        self.assertEqual([call.driver_pulse(8, 10), call.driver_disable(9)], self._written())
+
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+        self.io_thread._poll()
+        self.assertEqual([call.driver_pulse(8, 10), call.driver_disable(9), call.driver_pulse(10, 10)],
+                         self._written())
+
+    def test_sync_commands(self):
+        # commands with a result run immediately after all queued commands
+        self.io_thread.write_data(7, 0x8000, 1)
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+        self.io_thread.write_data(7, 0x8001, 2)
+        self.assertEqual(42, self.io_thread.read_data(7, 0x8001))
+        self.assertEqual([call.write_data(7, 0x8000, 1), call.write_data(7, 0x8001, 2), call.read_data(7, 0x8001)],
+                         self._written())
+
+        # nothing is written twice
+        self.loop.run_until_complete(asyncio.sleep(0, loop=self.loop))
+        self.io_thread._poll()
+        self.assertEqual(3, len(self._written()))
+
+    def test_thread(self):
+        received = asyncio.Future(loop=self.loop)
+        self.io_thread._process_events = received.set_result
+        self.io_thread.start()
+
+        # events are delivered in one batch
+        self.assertEqual([{'type': 1, 'value': 23}, {'type': 2, 'value': 24}],
+                         self.loop.run_until_complete(asyncio.wait_for(received, 5, loop=self.loop)))
+
+        # stop writes all pending commands
+        self.io_thread.driver_pulse(8, 10)
+        self.io_thread.stop()
+        self.assertEqual([call.driver_pulse(8, 10)], self._written())
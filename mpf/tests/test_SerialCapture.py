@@ -0,0 +1,71 @@
+"""Test recording and replay of serial traffic."""
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from mpf.platforms.serial_capture import SerialCapture, read_capture, capture_streams, get_capture_filename, RX, \
+    TX
+from mpf.tests.loop import TimeTravelLoop, TestClock, ReplaySerial
+
+
+class TestSerialCapture(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = TimeTravelLoop()
+        self.clock = TestClock(self.loop)
+        self.path = tempfile.mkdtemp()
+        self.filename = get_capture_filename(os.path.join(self.path, "capture_"), "/dev/ttyACM0")
+
+    def tearDown(self):
+        for filename in os.listdir(self.path):
+            os.unlink(os.path.join(self.path, filename))
+        os.rmdir(self.path)
+        self.loop.close()
+
+    def test_capture_streams(self):
+        machine = MagicMock()
+        machine.machine_path = self.path
+        machine.clock = self.clock
+        stream_reader = asyncio.StreamReader(loop=self.loop)
+        stream_writer = MagicMock()
+
+        reader, writer = capture_streams(machine, "capture_", "/dev/ttyACM0", stream_reader, stream_writer)
+        writer.write(b'ID:\r')
+        stream_writer.write.assert_called_once_with(b'ID:\r')
+        stream_reader.feed_data(b'ID:NET FP-CPU-002-1 00.90\r')
+        self.loop.run_until_complete(asyncio.sleep(.5, loop=self.loop))
+        self.assertEqual(b'ID:NET', self.loop.run_until_complete(reader.readexactly(6)))
+        self.assertEqual(b' FP-CPU-002-1 00.90\r', self.loop.run_until_complete(reader.read(100)))
+        writer.close()
+        stream_writer.close.assert_called_once_with()
+
+        records = list(read_capture(self.filename))
+        self.assertEqual([TX, RX, RX], [record[1] for record in records])
+        self.assertEqual(b'ID:\r', records[0][2])
+        self.assertEqual(b' FP-CPU-002-1 00.90\r', records[2][2])
+        self.assertAlmostEqual(0, records[0][0])
+        self.assertAlmostEqual(.5, records[1][0])
+
+    def test_replay(self):
+        capture = SerialCapture(self.filename, self.clock.get_time)
+        capture.record(TX, b'\xf0')
+        capture.record(RX, b'\x20\x08')
+        self.loop.run_until_complete(asyncio.sleep(1, loop=self.loop))
+        capture.record(RX, b'\x00\x00\x00\x00\x00')
+        capture.close()
+
+        serial = ReplaySerial(self.filename, self.loop, speed=2)
+        self.assertEqual([b'\xf0'], serial.expected_writes)
+        self.clock.mock_serial("com1", serial)
+        reader, writer = self.loop.run_until_complete(self.clock.open_serial_connection(url="com1", baudrate=115200))
+        writer.write(b'\xf0')
+
+        self.assertEqual(b'\x20\x08', self.loop.run_until_complete(reader.read(100)))
+        start = self.loop.time()
+        # the second record is replayed after .5s at double speed
+        self.assertEqual(b'\x00\x00\x00\x00\x00', self.loop.run_until_complete(reader.read(100)))
+        self.assertAlmostEqual(.5, self.loop.time() - start, delta=.01)
+        self.assertTrue(serial.done)
+        self.assertEqual([b'\xf0'], serial.written)
@@ -0,0 +1,78 @@
+"""Test framing of serial data."""
+import asyncio
+import unittest
+
+from mpf.platforms.serial_framing import FrameBuffer, BufferedSerialReader
+
+
+class TestFrameBuffer(unittest.TestCase):
+
+    def test_delimited(self):
+        buffer = FrameBuffer(8)
+        buffer.feed(b'ab\rc')
+        self.assertEqual(b'ab\r', buffer.next_delimited(b'\r'))
+        self.assertIsNone(buffer.next_delimited(b'\r'))
+        self.assertEqual(1, len(buffer))
+
+        # partial frames are kept when the buffer compacts and grows
+        buffer.feed(b'defghijklmn')
+        self.assertIsNone(buffer.next_delimited(b'\r'))
+        buffer.feed(b'\r\r')
+        self.assertEqual(b'cdefghijklmn\r', buffer.next_delimited(b'\r'))
+        self.assertEqual(b'\r', buffer.next_delimited(b'\r'))
+        self.assertEqual(0, len(buffer))
+
+    def test_delimited_min_chars(self):
+        buffer = FrameBuffer()
+        buffer.feed(b'\x20\xff\x01\xff\xff')
+        self.assertEqual(b'\x20\xff\x01\xff', buffer.next_delimited(b'\xff', 3))
+        self.assertIsNone(buffer.next_delimited(b'\xff', 3))
+        self.assertEqual(b'\xff', buffer.next_delimited(b'\xff'))
+
+    def test_fixed(self):
+        buffer = FrameBuffer(4)
+        buffer.feed(b'\x20\x08')
+        self.assertIsNone(buffer.next_fixed(3))
+        self.assertEqual(0x20, buffer.peek())
+        self.assertEqual(0x08, buffer.peek(1))
+        with self.assertRaises(IndexError):
+            buffer.peek(2)
+
+        buffer.feed(b'\x01\x02\x03')
+        self.assertEqual(b'\x20\x08\x01', buffer.next_fixed(3))
+        buffer.skip(1)
+        self.assertEqual(b'\x03', buffer.read_all())
+        self.assertEqual(0, len(buffer))
+
+
+class TestBufferedSerialReader(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.stream = asyncio.StreamReader(loop=self.loop)
+        self.reader = BufferedSerialReader(self.stream, read_size=16)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_read_ahead(self):
+        self.stream.feed_data(b'ID:NET\rSA:0\r\x00\x01')
+        self.assertEqual(b'ID:NET\r', self.loop.run_until_complete(self.reader.readuntil(b'\r')))
+        # the rest has been read ahead and is returned from the buffer
+        self.assertEqual(0, len(self.stream._buffer))
+        self.assertEqual(b'SA:0\r', self.loop.run_until_complete(self.reader.readuntil(b'\r')))
+        self.assertEqual(b'\x00', self.loop.run_until_complete(self.reader.readexactly(1)))
+        self.assertEqual(b'\x01', self.loop.run_until_complete(self.reader.read(100)))
+
+        self.stream.feed_data(b'1')
+        self.stream.feed_eof()
+        with self.assertRaises(asyncio.IncompleteReadError):
+            self.loop.run_until_complete(self.reader.readexactly(2))
+
+    def test_clear(self):
+        self.stream.feed_data(b'garbage')
+        self.assertEqual(b'g', self.loop.run_until_complete(self.reader.readexactly(1)))
+        self.stream.feed_data(b'more garbage')
+        self.reader.clear()
+        self.stream.feed_data(b'\xf0')
+        self.assertEqual(b'\xf0', self.loop.run_until_complete(self.reader.readexactly(1)))
@@ -0,0 +1,80 @@
+"""Test the shared frame buffer."""
+import os
+import unittest
+from unittest.mock import MagicMock
+
+from mpf.core.shared_frame_buffer import SharedFrameBuffer, SLOT_HEADER, get_shared_memory_path, \
+    SharedFrameReader
+
+
+class TestSharedFrameBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.writer = SharedFrameBuffer("mpf_test_frames_{}".format(os.getpid()), slot_count=2, slot_size=8)
+        self.reader = SharedFrameBuffer(self.writer.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.unlink()
+
+    def test_read_latest(self):
+        self.assertEqual(2, self.reader.slot_count)
+        self.assertEqual(8, self.reader.slot_size)
+        self.assertIsNone(self.reader.read_latest())
+
+        self.assertEqual(1, self.writer.write_frame(b'frame1'))
+        self.assertEqual(b'frame1', self.reader.read_latest())
+        # frames are only returned once
+        self.assertIsNone(self.reader.read_latest())
+
+        # the ring wraps around and older frames are skipped
+        for i in range(5):
+            self.writer.write_frame(b'frame' + str(i).encode())
+        self.assertEqual(b'frame4', self.reader.read_latest())
+
+        with self.assertRaises(AssertionError):
+            self.writer.write_frame(b'123456789')
+
+    def test_frame_in_progress(self):
+        seq = self.writer.write_frame(b'frame1')
+        # writer cleared the slot to overwrite it
+        SLOT_HEADER.pack_into(self.writer._map, self.writer._slot_offset(seq), 0, 0)
+        self.assertIsNone(self.reader.read_latest())
+
+    def test_invalid(self):
+        with self.assertRaises(AssertionError):
+            get_shared_memory_path("../etc/passwd")
+
+        with open(get_shared_memory_path(self.writer.name + "_invalid"), "wb") as f:
+            f.write(b'\0' * 64)
+        self.addCleanup(os.unlink, get_shared_memory_path(self.writer.name + "_invalid"))
+        with self.assertRaises(AssertionError):
+            SharedFrameBuffer(self.writer.name + "_invalid")
+
+
+class TestSharedFrameReader(unittest.TestCase):
+
+    def setUp(self):
+        self.name = "mpf_test_reader_{}".format(os.getpid())
+        self.writer = SharedFrameBuffer(self.name, slot_count=2, slot_size=8)
+        self.loop = MagicMock()
+        self.loop.call_soon = lambda callback: callback()
+        self.frames = []
+        self.reader = SharedFrameReader(self.loop, self.frames.append)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.unlink()
+
+    def test_producer_restart(self):
+        for i in range(3):
+            self.writer.write_frame(b'frame' + str(i).encode())
+        self.reader.notify(self.name)
+        self.assertEqual([b'frame2'], self.frames)
+
+        # producer restarts and recreates the buffer under the same name
+        self.writer.close()
+        self.writer = SharedFrameBuffer(self.name, slot_count=2, slot_size=8)
+        self.writer.write_frame(b'restart')
+        self.reader.notify(self.name)
+        self.assertEqual([b'frame2', b'restart'], self.frames)
@@ -126,3 +126,9 @@ class TestSnux(MpfTestCase):
         # disable driver on a side.
         self.machine.coils.c_side_a2.disable()
         self.advance_time_and_run(0.2)
+
+    def test_init_dependencies(self):
+        # snux is initialised after the platform of its coils
+        self.assertEqual([self.machine.hardware_platforms['virtual']],
+                         self._get_snux_platform().get_init_dependencies())
+        self.assertEqual([], self.machine.hardware_platforms['virtual'].get_init_dependencies())
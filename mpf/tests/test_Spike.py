@@ -16,7 +16,7 @@ class MockSpikeSocket(MockSerial):
         del length
         if not self.queue:
             return b''
-        msg = self.queue.pop()
+        msg = self.queue.pop(0)
 
         return msg
 
@@ -352,6 +352,8 @@ class SpikePlatformTest(MpfTestCase):
         self.assertFalse(self.serialMock.expected_commands)
 
         self.assertSwitchState("s_start", True)
+        self.assertEqual(1, self.machine.default_platform.poll_stats[1]["polls"])
+        self.assertEqual(0, self.machine.default_platform.desyncs)
 
     def _testLeds(self):
         self.serialMock.expected_commands = {
@@ -0,0 +1,70 @@
+"""Test the startup profiler."""
+import json
+import os
+import tempfile
+
+from mpf.core.startup_profiler import StartupProfiler
+from mpf.tests.MpfTestCase import MpfTestCase
+
+
+class TestStartupProfiler(MpfTestCase):
+
+    def getOptions(self):
+        options = super().getOptions()
+        self.profile_file = os.path.join(tempfile.mkdtemp(), "startup_profile.json")
+        options['profile_startup'] = self.profile_file
+        return options
+
+    def test_report(self):
+        self.assertFalse(self.machine.startup_profiler.enabled)
+
+        with open(self.profile_file, encoding='utf8') as f:
+            report = json.load(f)
+
+        self.assertGreater(report['total'], 0)
+        phases = {phase['name']: phase for phase in report['phases']}
+        for name in ("load_config", "load_core_modules", "initialize_platforms", "init_phase_1",
+                     "init_phase_5", "wait_for_boot_holds", "init_done"):
+            self.assertIn(name, phases)
+            self.assertIsNotNone(phases[name]['duration'])
+
+        self.assertIn("virtual", [child['name'] for child in phases['initialize_platforms']['children']])
+        self.assertIn("device_manager", [child['name'] for child in phases['load_core_modules']['children']])
+
+        handlers = {child['name']: child for child in phases['init_phase_1']['children']}
+        self.assertIn("DeviceManager._load_device_modules", handlers)
+        steps = [child['name'] for child in handlers["DeviceManager._load_device_modules"]['children']]
+        self.assertEqual(["create_devices", "load_devices_config", "initialize_devices"], steps)
+
+    def test_disabled_profiler(self):
+        profiler = StartupProfiler(False)
+        with profiler.section("test"):
+            pass
+        self.assertEqual([], profiler.get_report()['phases'])
+
+    def test_nested_sections(self):
+        profiler = StartupProfiler(True)
+        with profiler.section("outer"):
+            with profiler.section("inner"):
+                pass
+        profiler.finish()
+        with profiler.section("ignored"):
+            pass
+
+        report = profiler.get_report()
+        self.assertEqual(1, len(report['phases']))
+        self.assertEqual("outer", report['phases'][0]['name'])
+        self.assertEqual("inner", report['phases'][0]['children'][0]['name'])
+        self.assertLessEqual(report['phases'][0]['children'][0]['duration'], report['phases'][0]['duration'])
+
+    def test_concurrent_sections(self):
+        profiler = StartupProfiler(True)
+        with profiler.section("initialize_platforms"):
+            profiler.add_section("fast", profiler._start_time + 1, 2)
+            profiler.add_section("opp", profiler._start_time + 1.5, 1)
+
+        report = profiler.get_report()
+        children = report['phases'][0]['children']
+        self.assertEqual(["fast", "opp"], [child['name'] for child in children])
+        self.assertAlmostEqual(1.5, children[1]['start'])
+        self.assertEqual(1, children[1]['duration'])
@@ -91,12 +91,7 @@ class TestVirtualPinball(MpfTestCase):
         self.assertEqual("0-1", args['number'])
 
         self.machine.flippers.f_test_single.enable()
-        cmd, args = self.loop.run_until_complete(self._get_and_decode(client))
-        self.assertEqual("device", cmd)
-        self.assertEqual("f_test_single", args['name'])
-        self.assertEqual("flipper", args['type'])
-        self.assertEqual({"enabled": True}, args['state'])
-
+        # device changes are sent at the end of the loop iteration
         cmd, args = self.loop.run_until_complete(self._get_and_decode(client))
         self.assertEqual("driver_event", cmd)
         self.assertEqual({'enable_switch_invert': False,
@@ -111,6 +106,12 @@ class TestVirtualPinball(MpfTestCase):
                           'coil_recycle': False,
                           'enable_switch_debounce': False}, args)
 
+        cmd, args = self.loop.run_until_complete(self._get_and_decode(client))
+        self.assertEqual("device", cmd)
+        self.assertEqual("f_test_single", args['name'])
+        self.assertEqual("flipper", args['type'])
+        self.assertEqual({"enabled": True}, args['state'])
+
         self.machine.flippers.f_test_single.disable()
         cmd, args = self.loop.run_until_complete(self._get_and_decode(client))
         self.assertEqual("driver_event", cmd)
@@ -1,8 +1,14 @@
+import os
 import unittest
 import ruamel.yaml as yaml
+from mpf.core.utility_functions import Util
 from mpf.file_interfaces.yaml_roundtrip import YamlRoundtrip
 
-from mpf.file_interfaces.yaml_interface import MpfLoader
+from mpf.file_interfaces.yaml_interface import MpfLoader, MpfLowerCaseLoader, YamlInterface
+try:
+    from mpf.file_interfaces.yaml_interface import MpfCLoader
+except ImportError:
+    MpfCLoader = None
 
 
 class TestYamlInterface(unittest.TestCase):
@@ -118,3 +124,54 @@ float_1: 1.0
             if not type(v) is eval(k.split('_')[0]):
                 raise AssertionError('YAML value "{}" is {}, not {}'.format(v,
                     type(v), eval(k.split('_')[0])))
+
+    def _assert_same_as_mpf_loader(self, yaml_str, loader):
+        try:
+            expected = Util.keys_to_lower(yaml.load(yaml_str, Loader=MpfLoader))
+        except Exception as e:
+            with self.assertRaises(type(e)):
+                yaml.load(yaml_str, Loader=loader)
+            return
+
+        self.assertEqual(expected, YamlInterface._process_root(yaml.load(yaml_str, Loader=loader)))
+
+    def test_fast_loader(self):
+        loaders = [MpfLowerCaseLoader]
+        if MpfCLoader:
+            loaders.append(MpfCLoader)
+
+        # only keys reachable through dicts (or lists at the root) are lowercased
+        yaml_str = '''
+Foo:
+    Bar:
+      - Baz: 1
+    1: 2
+    Str: 032
+    Bool: yes
+    Version: 0.50.1
+'''
+        self.assertEqual({'foo': {'bar': [{'Baz': 1}], '1': 2, 'str': '032', 'bool': True, 'version': '0.50.1'}},
+                         YamlInterface.process(yaml_str))
+
+        for loader in loaders:
+            self._assert_same_as_mpf_loader(yaml_str, loader)
+            self._assert_same_as_mpf_loader("- {A: 1}\n- 0\n- [{B: 1}, []]", loader)
+            self._assert_same_as_mpf_loader("", loader)
+
+    def test_fast_loader_conformance(self):
+        loaders = [MpfLowerCaseLoader]
+        if MpfCLoader:
+            loaders.append(MpfCLoader)
+
+        machine_files = os.path.join(os.path.dirname(__file__), "machine_files")
+        for root, _, files in os.walk(machine_files):
+            for file_name in files:
+                if os.path.splitext(file_name)[1] not in YamlInterface.file_types:
+                    continue
+
+                with open(os.path.join(root, file_name), encoding='utf8') as f:
+                    yaml_str = f.read()
+
+                for loader in loaders:
+                    with self.subTest(file=os.path.join(root, file_name), loader=loader.__name__):
+                        self._assert_same_as_mpf_loader(yaml_str, loader)